@@ -55,6 +55,7 @@ setup(
         "rcsb.utils.multiproc",
         "wwpdb.utils.ws_utils",
         "distro",
+        "numpy",
     ],
     packages=find_packages(exclude=["wwpdb.apps.tests-chem_ref_data", "mock-data"]),
     # Enables Manifest to be used
@@ -0,0 +1,411 @@
+##
+# File:  ChemCompIndexColumnStore.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  open stores held in memory buffers (e.g. shared memory segments)
+#   18-Oct-2026  version 2 - per column string tables so that each column is read independently
+##
+"""
+Compact memory-mapped columnar format for the chemical component search index.
+
+The file holds the index content as integer arrays and string tables so that it can be
+opened without deserialization and its pages shared by all processes mapping the same file.
+Each column has its own string table so that the pages of a column are only read (and become
+resident) when that column is accessed - a process serving only formula searches touches the
+component identifiers and the typeCounts and formulaWeight columns.
+
+Layout  (native byte order, recorded in the header):
+
+    magic (8 bytes) | version (uint32) | header length (uint32) | JSON header | padding | data sections
+
+Data sections (8 byte aligned, offsets relative to the start of the data):
+
+    strOffsets   uint64[nStr + 1]   offsets of each string in strBlob
+    strBlob      utf-8 bytes
+    listOffsets  uint32[nList + 1]  offsets of each string list in listElems
+    listElems    int32[]            string table indices
+    keyRefs      int32[nRows]       string index of the component identifier of each row
+    keyOrder     int32[nRows]       rows ordered by component identifier
+    col:<column> int32[nRows]       per column value reference (-2 missing, -1 None)
+    col:<column>:strOffsets, col:<column>:strBlob, col:<column>:listOffsets, col:<column>:listElems
+                                    string table of the column
+
+The unprefixed string table holds the component identifiers.  In version 1 stores it is shared
+by all columns.  Column kinds:  'str' (string index),  'strlist' (list index) and 'json' (string
+index of JSON text).
+
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CCIDXCOL"
+VERSION = 2
+REF_MISSING = -2
+REF_NONE = -1
+
+
+def getColumnStorePath(indexPath):
+    """Return the path of the column store file accompanying the input index pickle file."""
+    return os.path.splitext(indexPath)[0] + ".col"
+
+
+class ChemCompIndexColumnWriter(object):
+    """Write a chemical component index dictionary (ccId -> {key: value}) in column store format."""
+
+    def __init__(self, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def write(self, ccIndx, outPath):
+        """Write the input index to outPath.  Return True for success or False otherwise."""
+        try:
+            buf = self.toBytes(ccIndx)
+            with open(outPath, "wb") as ofh:
+                ofh.write(buf)
+            logger.info("Wrote column store %r length %d", outPath, len(buf))
+            return True
+        except Exception as e:
+            logger.exception("Failing writing column store %r %r", outPath, str(e))
+        return False
+
+    def toBytes(self, ccIndx):
+        """Return the column store serialization of the input index."""
+        keyL = list(ccIndx.keys())
+        colNameL = []
+        for d in ccIndx.values():
+            for ky in d:
+                if ky not in colNameL:
+                    colNameL.append(ky)
+        #
+        keyTable = _StringTableWriter()
+        keyRefs = array("i", [keyTable.addStr(ccId) for ccId in keyL])
+        keyOrder = array("i", sorted(range(len(keyL)), key=lambda iRow: keyL[iRow]))
+        sectionL = keyTable.getSections("")
+        sectionL.append(("keyRefs", keyRefs.tobytes()))
+        sectionL.append(("keyOrder", keyOrder.tobytes()))
+        #
+        colL = []
+        nStr = len(keyTable)
+        for ky in colNameL:
+            kind = self.__getKind(ky, ccIndx)
+            table = _StringTableWriter()
+            refs = array("i")
+            for ccId in keyL:
+                d = ccIndx[ccId]
+                if ky not in d:
+                    refs.append(REF_MISSING)
+                    continue
+                v = d[ky]
+                if v is None:
+                    refs.append(REF_NONE)
+                elif kind == "str":
+                    refs.append(table.addStr(v))
+                elif kind == "strlist":
+                    refs.append(table.addList(v))
+                else:
+                    refs.append(table.addStr(json.dumps(v, sort_keys=True)))
+            colL.append((ky, kind))
+            sectionL.append(("col:" + ky, refs.tobytes()))
+            sectionL.extend(table.getSections("col:" + ky + ":"))
+            nStr += len(table)
+        #
+        sectionD = {}
+        offset = 0
+        for name, buf in sectionL:
+            sectionD[name] = [offset, len(buf)]
+            offset += _padLength(len(buf))
+        header = {
+            "version": VERSION,
+            "byteorder": sys.byteorder,
+            "nRows": len(keyL),
+            "nStr": nStr,
+            "columns": [[ky, kind] for ky, kind in colL],
+            "sections": sectionD,
+        }
+        hBuf = json.dumps(header).encode("utf-8")
+        preamble = MAGIC + struct.pack("=II", VERSION, len(hBuf)) + hBuf
+        oBuf = bytearray(preamble)
+        oBuf.extend(b"\0" * (_padLength(len(preamble)) - len(preamble)))
+        for _, buf in sectionL:
+            oBuf.extend(buf)
+            oBuf.extend(b"\0" * (_padLength(len(buf)) - len(buf)))
+        logger.debug("Column store rows %d columns %d strings %d", len(keyL), len(colL), nStr)
+        return bytes(oBuf)
+
+    @staticmethod
+    def __getKind(ky, ccIndx):
+        kind = None
+        for d in ccIndx.values():
+            v = d.get(ky)
+            if v is None:
+                continue
+            if isinstance(v, str):
+                tKind = "str"
+            elif isinstance(v, (list, tuple)) and all(isinstance(t, str) for t in v):
+                tKind = "strlist"
+            else:
+                return "json"
+            if kind is not None and kind != tKind:
+                return "json"
+            kind = tKind
+        return kind or "str"
+
+
+def _padLength(n):
+    return (n + 7) & ~7
+
+
+class _StringTableWriter(object):
+    """String and string list table under construction."""
+
+    def __init__(self):
+        self.__strD = {}
+        self.__strL = []
+        self.__listD = {}
+        self.__listOffsets = array("I", [0])
+        self.__listElems = array("i")
+
+    def __len__(self):
+        return len(self.__strL)
+
+    def addStr(self, s):
+        iStr = self.__strD.get(s)
+        if iStr is None:
+            iStr = self.__strD[s] = len(self.__strL)
+            self.__strL.append(s)
+        return iStr
+
+    def addList(self, vL):
+        tL = tuple(self.addStr(v) for v in vL)
+        iList = self.__listD.get(tL)
+        if iList is None:
+            iList = self.__listD[tL] = len(self.__listOffsets) - 1
+            self.__listElems.extend(tL)
+            self.__listOffsets.append(len(self.__listElems))
+        return iList
+
+    def getSections(self, prefix):
+        """Return the list of (section name, bytes) for the table with section names prefixed by prefix."""
+        strBlob = bytearray()
+        strOffsets = array("Q", [0])
+        for s in self.__strL:
+            strBlob.extend(s.encode("utf-8"))
+            strOffsets.append(len(strBlob))
+        return [
+            (prefix + "strOffsets", strOffsets.tobytes()),
+            (prefix + "strBlob", bytes(strBlob)),
+            (prefix + "listOffsets", self.__listOffsets.tobytes()),
+            (prefix + "listElems", self.__listElems.tobytes()),
+        ]
+
+
+class ChemCompIndexColumnStore(Mapping):
+    """Read-only memory-mapped view of a column store file as a mapping ccId -> row mapping {key: value}.
+
+    Opening the store reads only the header.  Values are decoded from the mapped pages on access.
+    """
+
+    def __init__(self, storePath=None, buffer=None, resource=None):
+        """Open the column store file storePath or, alternatively, a store held in the input buffer.
+        The optional resource (e.g. the shared memory segment providing buffer) is kept alive with the store.
+        """
+        self.__storePath = storePath
+        self.__resource = resource
+        if buffer is None:
+            with open(storePath, "rb") as ifh:
+                buffer = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__mm = buffer
+        if isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_RANDOM"):
+            # Avoid read ahead into the pages of columns that are not accessed
+            buffer.madvise(mmap.MADV_RANDOM)
+        if bytes(self.__mm[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a chemical component column store %r" % storePath)
+        version, hLen = struct.unpack_from("=II", self.__mm, len(MAGIC))
+        hOffset = len(MAGIC) + struct.calcsize("=II")
+        header = json.loads(bytes(self.__mm[hOffset : hOffset + hLen]).decode("utf-8"))
+        if version not in [1, VERSION] or header["byteorder"] != sys.byteorder:
+            raise ValueError("Unsupported column store version or byte order %r %r" % (version, header["byteorder"]))
+        #
+        self.__dataOffset = (hOffset + hLen + 7) & ~7
+        self.__viewL = []
+        self.__mv = memoryview(self.__mm)
+        self.__sectionD = header["sections"]
+        self.__nRows = header["nRows"]
+        self.__keyTable = self.__getStringTable("")
+        self.__keyRefs = self.__getSection("keyRefs", "i")
+        self.__keyOrder = self.__getSection("keyOrder", "i")
+        self.__colD = {}
+        for ky, kind in header["columns"]:
+            table = self.__keyTable if version == 1 else self.__getStringTable("col:" + ky + ":")
+            self.__colD[ky] = (kind, self.__getSection("col:" + ky, "i"), table)
+        self.__sortedKeys = _SortedKeySequence(weakref.proxy(self))
+
+    def __getSection(self, name, typeCode):
+        offset, length = self.__sectionD[name]
+        mv = self.__mv[self.__dataOffset + offset : self.__dataOffset + offset + length]
+        self.__viewL.append(mv)
+        if typeCode:
+            mv = mv.cast(typeCode)
+            self.__viewL.append(mv)
+        return mv
+
+    def __getStringTable(self, prefix):
+        return _StringTable(
+            self.__getSection(prefix + "strOffsets", "Q"),
+            self.__getSection(prefix + "strBlob", None),
+            self.__getSection(prefix + "listOffsets", "I"),
+            self.__getSection(prefix + "listElems", "i"),
+        )
+
+    def close(self):
+        """Release the views of the store buffer and close the buffer or its owning resource."""
+        self.__keyTable = None
+        self.__colD = {}
+        for mv in reversed(getattr(self, "_ChemCompIndexColumnStore__viewL", [])):
+            mv.release()
+        self.__viewL = []
+        if getattr(self, "_ChemCompIndexColumnStore__mv", None) is not None:
+            self.__mv.release()
+            self.__mv = None
+        resource = getattr(self, "_ChemCompIndexColumnStore__resource", None)
+        if resource is not None:
+            resource.close()
+            self.__resource = None
+        elif isinstance(getattr(self, "_ChemCompIndexColumnStore__mm", None), mmap.mmap):
+            self.__mm.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    def getStorePath(self):
+        return self.__storePath
+
+    def getColumnNames(self):
+        return list(self.__colD.keys())
+
+    def getColumnSize(self, ky):
+        """Return the length in bytes of the data sections of column ky."""
+        pfx = "col:" + ky
+        return sum(length for name, (_, length) in self.__sectionD.items() if name == pfx or name.startswith(pfx + ":"))
+
+    def getRowKey(self, iRow):
+        return self.__keyTable.getString(self.__keyRefs[iRow])
+
+    def getSortedRow(self, ii):
+        return self.__keyOrder[ii]
+
+    def getRowIndex(self, ccId):
+        """Return the row index of the input component identifier or None."""
+        ii = bisect.bisect_left(self.__sortedKeys, ccId)
+        if ii < self.__nRows and self.__sortedKeys[ii] == ccId:
+            return self.__keyOrder[ii]
+        return None
+
+    def hasValue(self, iRow, ky):
+        col = self.__colD.get(ky)
+        return col is not None and col[1][iRow] != REF_MISSING
+
+    def getValue(self, iRow, ky):
+        """Return the value of ky for row iRow.  Raises KeyError if the row has no value for ky."""
+        col = self.__colD.get(ky)
+        if col is None:
+            raise KeyError(ky)
+        kind, refs, table = col
+        ref = refs[iRow]
+        if ref == REF_MISSING:
+            raise KeyError(ky)
+        if ref == REF_NONE:
+            return None
+        if kind == "str":
+            return table.getString(ref)
+        if kind == "strlist":
+            return table.getList(ref)
+        return json.loads(table.getString(ref))
+
+    def getRowKeys(self, iRow):
+        return [ky for ky, (_, refs, _) in self.__colD.items() if refs[iRow] != REF_MISSING]
+
+    def __getitem__(self, ccId):
+        iRow = self.getRowIndex(ccId)
+        if iRow is None:
+            raise KeyError(ccId)
+        return ChemCompIndexRow(self, iRow)
+
+    def __iter__(self):
+        for iRow in range(self.__nRows):
+            yield self.getRowKey(iRow)
+
+    def __len__(self):
+        return self.__nRows
+
+    def items(self):
+        for iRow in range(self.__nRows):
+            yield self.getRowKey(iRow), ChemCompIndexRow(self, iRow)
+
+    def values(self):
+        for iRow in range(self.__nRows):
+            yield ChemCompIndexRow(self, iRow)
+
+
+class _StringTable(object):
+    """String and string list table views of a column store."""
+
+    def __init__(self, strOffsets, strBlob, listOffsets, listElems):
+        self.__strOffsets = strOffsets
+        self.__strBlob = strBlob
+        self.__listOffsets = listOffsets
+        self.__listElems = listElems
+
+    def getString(self, iStr):
+        return bytes(self.__strBlob[self.__strOffsets[iStr] : self.__strOffsets[iStr + 1]]).decode("utf-8")
+
+    def getList(self, iList):
+        return [self.getString(iStr) for iStr in self.__listElems[self.__listOffsets[iList] : self.__listOffsets[iList + 1]]]
+
+
+class ChemCompIndexRow(Mapping):
+    """Lazily decoded row of a column store."""
+
+    def __init__(self, store, iRow):
+        self.__store = store
+        self.__iRow = iRow
+
+    def __getitem__(self, ky):
+        return self.__store.getValue(self.__iRow, ky)
+
+    def __contains__(self, ky):
+        return self.__store.hasValue(self.__iRow, ky)
+
+    def __iter__(self):
+        return iter(self.__store.getRowKeys(self.__iRow))
+
+    def __len__(self):
+        return len(self.__store.getRowKeys(self.__iRow))
+
+
+class _SortedKeySequence(object):
+    """Component identifiers in sorted order as a sequence for bisection."""
+
+    def __init__(self, store):
+        self.__store = store
+
+    def __getitem__(self, ii):
+        return self.__store.getRowKey(self.__store.getSortedRow(ii))
+
+    def __len__(self):
+        return len(self.__store)
@@ -0,0 +1,134 @@
+##
+# File:  ChemCompFormulaIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  add candidate count estimate
+##
+"""
+Element count matrix for vectorized formula searches over the chemical component index.
+
+The typeCounts of each component are stored as a dense matrix (components x element types)
+with a precomputed heavy-atom (non H/D/T) column view.  Formula comparisons are evaluated
+as boolean masks over the component rows.
+
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompFormulaIndex(object):
+    """Dense element count matrix derived from the typeCounts of a chemical component index."""
+
+    hydrogenTypes = frozenset(["H", "D", "T"])
+
+    def __init__(self, ccIndx):
+        self.__idList = []
+        typeD = {}
+        tcL = []
+        for ccId, d in ccIndx.items():
+            refC = d.get("typeCounts") or {}
+            self.__idList.append(ccId)
+            tcL.append(refC)
+            for etype in refC:
+                if etype.upper() not in typeD:
+                    typeD[etype.upper()] = len(typeD)
+        #
+        self.__typeD = typeD
+        self.__countM = np.zeros((len(self.__idList), len(typeD)), dtype=np.int32)
+        for iRow, refC in enumerate(tcL):
+            for etype, cnt in refC.items():
+                self.__countM[iRow, typeD[etype.upper()]] = cnt
+        #
+        presentM = self.__countM > 0
+        self.__heavyCols = np.array([iCol for etype, iCol in typeD.items() if etype not in self.hydrogenTypes], dtype=np.intp)
+        self.__heavyM = self.__countM[:, self.__heavyCols]
+        self.__nTypes = presentM.sum(axis=1)
+        self.__presentCounts = presentM.sum(axis=0)
+        self.__nHeavyTypes = (self.__heavyM > 0).sum(axis=1)
+        logger.debug("Element count matrix shape %r heavy types %d", self.__countM.shape, len(self.__heavyCols))
+
+    def getElementTypes(self):
+        return sorted(self.__typeD, key=self.__typeD.get)
+
+    def estimate(self, elementCounts, excludeH=False):
+        """Return an upper bound on the number of components containing all of the input element types."""
+        nEst = int(np.count_nonzero(self.__nTypes))
+        for etype in self.__normalize(elementCounts):
+            if excludeH and etype in self.hydrogenTypes:
+                continue
+            iCol = self.__typeD.get(etype)
+            if iCol is None:
+                return 0
+            nEst = min(nEst, int(self.__presentCounts[iCol]))
+        return nEst
+
+    def searchBounded(self, elementCounts, upperOffset=2, lowerOffset=2, excludeH=False):
+        """Return component identifiers containing each input element with a count within
+        the bounds  cnt - upperOffset <= ref <= cnt + lowerOffset.
+        """
+        mask = self.__nTypes > 0
+        for etype, cnt in self.__normalize(elementCounts).items():
+            if excludeH and etype in self.hydrogenTypes:
+                continue
+            col = self.__getColumn(etype)
+            if col is None:
+                return []
+            mask &= (col > 0) & (col >= cnt - upperOffset) & (col <= cnt + lowerOffset)
+        return self.__getIdList(mask)
+
+    def searchSubset(self, elementCounts, excludeH=False):
+        """Return component identifiers containing each input element with an equal count."""
+        mask = self.__nTypes > 0
+        for etype, cnt in self.__normalize(elementCounts).items():
+            if excludeH and etype in self.hydrogenTypes:
+                continue
+            col = self.__getColumn(etype)
+            if col is None:
+                return []
+            mask &= (col > 0) & (col == cnt)
+        return self.__getIdList(mask)
+
+    def searchExact(self, elementCounts, excludeH=False):
+        """Return component identifiers with an element composition identical to the input.
+        With excludeH hydrogen isotopes are ignored except for components composed only of a
+        single hydrogen type, which must match that count exactly.
+        """
+        eD = self.__normalize(elementCounts)
+        if not excludeH:
+            return self.__getIdList(self.__matchAll(eD, self.__nTypes == len(eD)))
+        #
+        heavyD = {etype: cnt for etype, cnt in eD.items() if etype not in self.hydrogenTypes}
+        mask = self.__matchAll(heavyD, (self.__nHeavyTypes > 0) & (self.__nHeavyTypes == len(heavyD)))
+        if not heavyD:
+            # Components with no heavy atoms -
+            lightMask = (self.__nTypes > 0) & (self.__nHeavyTypes == 0)
+            singleMask = lightMask & (self.__nTypes == 1)
+            mask |= lightMask & ~singleMask
+            for etype, cnt in eD.items():
+                col = self.__getColumn(etype)
+                if col is not None:
+                    mask |= singleMask & (col > 0) & (col == cnt)
+        return self.__getIdList(mask)
+
+    def __matchAll(self, eD, mask):
+        for etype, cnt in eD.items():
+            col = self.__getColumn(etype)
+            if col is None:
+                return np.zeros(len(self.__idList), dtype=bool)
+            mask &= (col > 0) & (col == cnt)
+        return mask
+
+    def __getColumn(self, etype):
+        iCol = self.__typeD.get(etype)
+        return self.__countM[:, iCol] if iCol is not None else None
+
+    def __getIdList(self, mask):
+        return [self.__idList[i] for i in np.flatnonzero(mask)]
+
+    def __normalize(self, elementCounts):
+        return {etype.upper(): int(cnt) for etype, cnt in elementCounts.items()}
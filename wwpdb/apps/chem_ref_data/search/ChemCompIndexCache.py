@@ -0,0 +1,199 @@
+##
+# File:  ChemCompIndexCache.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  prefer the memory-mapped column store when it is current
+#   18-Oct-2026  optionally attach an index published in shared memory
+#   18-Oct-2026  add hasDerived()
+#   18-Oct-2026  rate limit re-reads of unreadable index files and bound the time a previous entry is retained
+##
+"""
+Process-wide cache of chemical component search index data.
+
+The index file is read once per process and is reloaded only when the
+file identity (inode, size or modification time) changes.  When a column
+store file (see ChemCompIndexColumnStore) at least as recent as the index
+pickle file is present it is memory mapped in place of reading the pickle.  Search structures
+derived from the index content are attached to the cache entry so that
+they are discarded together with the index data on reload.
+
+An index file version that reads empty (e.g. while it is being rewritten) is
+read again at most every _retryInterval seconds, and the previous entry is
+served in its place for at most _maxStaleTime seconds.
+
+"""
+
+import os
+import sys
+import threading
+import time
+
+import logging
+
+from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
+from wwpdb.apps.chem_ref_data.io.ChemCompIndexColumnStore import ChemCompIndexColumnStore, getColumnStorePath
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexSharedMemory import ChemCompIndexSharedMemory
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompIndexEntry(object):
+    """Index content and derived search structures for one version of an index file."""
+
+    def __init__(self, indexPath, signature, generation, ccIndx):
+        self.__indexPath = indexPath
+        self.__signature = signature
+        self.__generation = generation
+        self.__ccIndx = ccIndx
+        self.__derivedD = {}
+        self.__lock = threading.RLock()
+
+    def getIndexPath(self):
+        return self.__indexPath
+
+    def getSignature(self):
+        return self.__signature
+
+    def getGeneration(self):
+        return self.__generation
+
+    def getIndex(self):
+        return self.__ccIndx
+
+    def hasDerived(self, name):
+        return name in self.__derivedD
+
+    def getDerived(self, name, builder):
+        """Return the derived search structure 'name' creating it with builder(ccIndx) on first use."""
+        try:
+            return self.__derivedD[name]
+        except KeyError:
+            pass
+        with self.__lock:
+            if name not in self.__derivedD:
+                startTime = time.time()
+                self.__derivedD[name] = builder(self.__ccIndx)
+                logger.debug("Built derived index %r for %r in (%.4f seconds)", name, self.__indexPath, time.time() - startTime)
+            return self.__derivedD[name]
+
+
+class ChemCompIndexCache(object):
+    """Thread-safe holder of chemical component search index entries keyed by index file path.
+
+    A new entry is created and swapped in (as a single reference assignment) when the index
+    file changes on disk.  Readers holding a previous entry continue to use it unchanged.
+    """
+
+    __lock = threading.Lock()
+    __entryD = {}
+    __sharedD = {}
+    # indexPath -> (signature, time of the first failed read, time of the next read) of an unreadable index file version
+    __failedD = {}
+    __generation = 0
+    _retryInterval = 5.0
+    _maxStaleTime = 120.0
+
+    @classmethod
+    def getEntry(cls, indexPath, verbose=False, log=sys.stderr, useSharedMemory=False):
+        """Return the current cache entry for the input index file, (re)loading the file if required.
+        With useSharedMemory a published shared memory copy of the index is preferred when available.
+        """
+        if useSharedMemory and ChemCompIndexSharedMemory.isSupported():
+            entry = cls.__getSharedEntry(indexPath)
+            if entry is not None:
+                return entry
+        signature = cls.__getSignature(indexPath)
+        entry = cls.__entryD.get(indexPath)
+        if entry is not None and (entry.getSignature() == signature or cls.__isRetryPending(indexPath, signature)):
+            return entry
+        #
+        with cls.__lock:
+            entry = cls.__entryD.get(indexPath)
+            signature = cls.__getSignature(indexPath)
+            if entry is not None and (entry.getSignature() == signature or cls.__isRetryPending(indexPath, signature)):
+                return entry
+            startTime = time.time()
+            ccIndx = cls.__readIndex(indexPath, signature, verbose, log)
+            if not ccIndx and entry is not None and entry.getIndex():
+                # Likely a partially written file - keep the current entry for a limited time and retry later
+                fT = cls.__failedD.get(indexPath)
+                firstTime = fT[1] if fT is not None and fT[0] == signature else startTime
+                if startTime - firstTime < cls._maxStaleTime:
+                    cls.__failedD[indexPath] = (signature, firstTime, startTime + cls._retryInterval)
+                    logger.warning("Index %r unreadable (signature %r) - retaining generation %d", indexPath, signature, entry.getGeneration())
+                    return entry
+                logger.error("Index %r unreadable for %.1f seconds (signature %r) - discarding generation %d", indexPath, startTime - firstTime, signature, entry.getGeneration())
+            cls.__failedD.pop(indexPath, None)
+            cls.__generation += 1
+            entry = ChemCompIndexEntry(indexPath, signature, cls.__generation, ccIndx)
+            cls.__entryD[indexPath] = entry
+            logger.info("Loaded index %r generation %d length %d in (%.4f seconds)", indexPath, cls.__generation, len(ccIndx), time.time() - startTime)
+        return entry
+
+    @classmethod
+    def __getSharedEntry(cls, indexPath):
+        shared = cls.__sharedD.get(indexPath)
+        if shared is None:
+            shared = cls.__sharedD.setdefault(indexPath, ChemCompIndexSharedMemory(indexPath))
+        gT = shared.getGeneration()
+        if gT is None:
+            return None
+        signature = ("shm",) + gT
+        entry = cls.__entryD.get(indexPath)
+        if entry is not None and entry.getSignature() == signature:
+            return entry
+        with cls.__lock:
+            entry = cls.__entryD.get(indexPath)
+            if entry is not None and entry.getSignature() == signature:
+                return entry
+            startTime = time.time()
+            aT = shared.attach()
+            if aT is None:
+                return None
+            cls.__generation += 1
+            entry = ChemCompIndexEntry(indexPath, ("shm",) + aT[:2], cls.__generation, aT[2])
+            cls.__entryD[indexPath] = entry
+            logger.info("Attached shared index %r published generation %d length %d in (%.4f seconds)", indexPath, aT[0], len(aT[2]), time.time() - startTime)
+        return entry
+
+    @classmethod
+    def clear(cls):
+        """Discard all cached entries, shared memory attachments and failed read records."""
+        with cls.__lock:
+            cls.__entryD = {}
+            cls.__sharedD = {}
+            cls.__failedD = {}
+
+    @classmethod
+    def __isRetryPending(cls, indexPath, signature):
+        """Return True if the index file version signature read empty and is not yet due to be read again."""
+        fT = cls.__failedD.get(indexPath)
+        return fT is not None and fT[0] == signature and time.time() < fT[2]
+
+    @staticmethod
+    def __readIndex(indexPath, signature, verbose, log):
+        if signature is not None and signature[0] != indexPath:
+            try:
+                return ChemCompIndexColumnStore(signature[0])
+            except Exception as e:
+                logger.exception("Failing to open column store %r - reading %r %r", signature[0], indexPath, str(e))
+        dIndx = PdbxChemCompDictIndex(verbose=verbose, log=log)
+        return dIndx.readIndex(indexPath=indexPath)
+
+    @staticmethod
+    def __getSignature(indexPath):
+        """Return the identity (path, device, inode, size, mtime) of the file from which the index is read."""
+        sigL = []
+        for pth in [getColumnStorePath(indexPath), indexPath]:
+            try:
+                st = os.stat(pth)
+                sigL.append((pth, st.st_dev, st.st_ino, st.st_size, st.st_mtime))
+            except OSError:
+                pass
+        if not sigL:
+            return None
+        if len(sigL) > 1 and sigL[0][4] < sigL[1][4]:
+            # Column store is older than the index pickle file
+            return sigL[1]
+        return sigL[0]
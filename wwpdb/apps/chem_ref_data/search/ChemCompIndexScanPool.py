@@ -0,0 +1,202 @@
+##
+# File:  ChemCompIndexScanPool.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  add PREFIX scan predicates
+##
+"""
+Persistent worker process pool for full scans of the chemical component search index.
+
+Scans that no derived index structure can answer (e.g. arbitrary callables) divide the
+index rows into contiguous shards that are tested concurrently by worker processes.
+The workers are forked once, after the index is loaded, so that they share the index
+content with the parent process and stay running for the lifetime of the pool.  The
+pool is released when it is garbage collected, closed or at interpreter exit.
+
+Forking copies only the calling thread - locks held by other threads at the time of the
+fork stay locked in the workers.  Pools should be created before a process starts other
+threads.  Without the fork start method scans run in the calling process.  Scans from
+concurrent threads are serialized.
+
+Scan predicates are either callables  predicate(ccId, d) -> bool  or tuples (mode, key, target)
+with mode one of EXACT, RANGE ('lower upper' target), PREFIX, SUBSTRING or SIMILAR.
+
+"""
+
+import logging
+import queue
+import sys
+import threading
+import time
+import weakref
+
+import multiprocess as multiprocessing
+from multiprocess.reduction import ForkingPickler
+
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcWorker
+from wwpdb.apps.chem_ref_data.search.ChemCompNameSimilarityIndex import ChemCompNameSimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+
+def matchRow(predicate, ccId, d):
+    """Return True if the index row d of component ccId satisfies the scan predicate."""
+    if callable(predicate):
+        return bool(predicate(ccId, d))
+    mode, key, target = predicate
+    refV = d.get(key)
+    vL = refV if isinstance(refV, (list, tuple, set)) else [refV]
+    if mode == "EXACT":
+        return target in vL
+    elif mode == "RANGE":
+        bL = target.split()
+        try:
+            return float(bL[0]) <= float(str(refV)) < float(bL[1])
+        except (TypeError, ValueError):
+            return False
+    elif mode == "PREFIX":
+        return any(isinstance(v, str) and v.startswith(target) for v in vL)
+    elif mode == "SUBSTRING":
+        return any(isinstance(v, str) and target in v for v in vL)
+    elif mode == "SIMILAR":
+        return any(isinstance(v, str) and ChemCompNameSimilarityIndex.score(target, v, "JARO_WINKLER") > 0.75 for v in vL)
+    raise ValueError("Unsupported scan predicate mode %r" % mode)
+
+
+class ChemCompIndexScanPool(object):
+    """Sharded scans of an index over numProc persistent worker processes."""
+
+    def __init__(self, ccIndx, numProc=4, shardsPerProc=4, minShardRows=500, timeOut=300, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__idList = list(ccIndx.keys())
+        self.__worker = ChemCompIndexScanWorker(ccIndx, self.__idList)
+        self.__numProc = numProc
+        self.__timeOut = timeOut
+        self.__lock = threading.Lock()
+        self.__scanId = 0
+        #
+        nShards = max(1, min(numProc * shardsPerProc, len(self.__idList) // max(1, minShardRows)))
+        step = -(-len(self.__idList) // nShards) if self.__idList else 1
+        self.__shardL = [(iStart, min(iStart + step, len(self.__idList))) for iStart in range(0, len(self.__idList), step)]
+        #
+        self.__taskQueue = None
+        self.__workerL = []
+        self.__finalizer = None
+        if numProc > 1 and len(self.__shardL) > 1:
+            self.__start()
+
+    def isParallel(self):
+        return bool(self.__workerL)
+
+    def getShardCount(self):
+        return len(self.__shardL)
+
+    def scan(self, predicate):
+        """Return the list of component identifiers (in index order) satisfying the scan predicate."""
+        startTime = time.time()
+        rowL = None
+        if self.__workerL:
+            with self.__lock:
+                rowL = self.__scanParallel(predicate)
+        if rowL is None:
+            rowL = self.__worker.scanRows(predicate, 0, len(self.__idList))
+        logger.debug("Scan %r match length %d parallel %r in (%.4f seconds)", predicate, len(rowL), self.isParallel(), time.time() - startTime)
+        return [self.__idList[iRow] for iRow in rowL]
+
+    def close(self):
+        """Stop the worker processes.  Subsequent scans run in the calling process."""
+        if self.__finalizer is not None:
+            self.__finalizer()
+        self.__workerL = []
+
+    def __start(self):
+        try:
+            if multiprocessing.get_start_method() != "fork":
+                logger.info("Scan pool requires the fork start method - scanning in process")
+                return
+            self.__taskQueue = multiprocessing.Queue()
+            self.__successQueue = multiprocessing.Queue()
+            self.__resultQueue = multiprocessing.Queue()
+            self.__diagQueue = multiprocessing.Queue()
+            for _ in range(self.__numProc):
+                worker = MultiProcWorker(self.__taskQueue, self.__successQueue, [self.__resultQueue], self.__diagQueue, self.__worker.scanShardMulti, verbose=self.__verbose)
+                worker.daemon = True
+                worker.start()
+                self.__workerL.append(worker)
+            self.__finalizer = weakref.finalize(self, self.__stop, self.__taskQueue, list(self.__workerL))
+            logger.info("Started scan pool processes %d shards %d rows %d", self.__numProc, len(self.__shardL), len(self.__idList))
+        except Exception as e:
+            logger.exception("Failing to start scan pool %r", str(e))
+            self.__stop(self.__taskQueue, self.__workerL)
+            self.__workerL = []
+
+    @staticmethod
+    def __stop(taskQueue, workerL):
+        try:
+            for _ in workerL:
+                taskQueue.put(None)
+            for worker in workerL:
+                worker.join(5)
+                if worker.is_alive():
+                    worker.terminate()
+        except Exception as e:
+            logger.warning("Failing stopping scan pool %r", str(e))
+
+    def __scanParallel(self, predicate):
+        """Return matching rows or None if the scan could not be completed by the workers."""
+        try:
+            ForkingPickler.dumps(predicate)
+        except Exception as e:
+            logger.info("Scan predicate cannot be sent to the workers - scanning in process %r", str(e))
+            return None
+        self.__scanId += 1
+        scanId = self.__scanId
+        for iShard, (iStart, iEnd) in enumerate(self.__shardL):
+            self.__taskQueue.put([(scanId, iShard, iStart, iEnd, predicate)])
+        shardRowD = {}
+        try:
+            for _ in self.__shardL:
+                self.__successQueue.get(timeout=self.__timeOut)
+                for tScanId, iShard, rowL in self.__resultQueue.get(timeout=self.__timeOut):
+                    if tScanId == scanId:
+                        shardRowD[iShard] = rowL
+                for diag in self.__diagQueue.get(timeout=self.__timeOut):
+                    logger.warning("Scan worker %s", diag)
+        except queue.Empty:
+            logger.error("Scan workers unresponsive after %d seconds - stopping the scan pool", self.__timeOut)
+            self.close()
+            return None
+        #
+        rowL = []
+        for iShard, (iStart, iEnd) in enumerate(self.__shardL):
+            tRowL = shardRowD.get(iShard)
+            rowL.extend(tRowL if tRowL is not None else self.__worker.scanRows(predicate, iStart, iEnd))
+        return rowL
+
+
+class ChemCompIndexScanWorker(object):
+    """Scan of index row ranges - the worker method is inherited by the forked pool processes."""
+
+    def __init__(self, ccIndx, idList):
+        self.__ccIndx = ccIndx
+        self.__idList = idList
+
+    def scanRows(self, predicate, iStart, iEnd):
+        ccIndx = self.__ccIndx
+        return [iRow for iRow in range(iStart, iEnd) if matchRow(predicate, self.__idList[iRow], ccIndx[self.__idList[iRow]])]
+
+    def scanShardMulti(self, dataList, procName, optionsD, workingDir):  # pylint: disable=unused-argument
+        """Worker method (MultiProcUtil prototype) scanning the shards in dataList."""
+        successList = []
+        resultList = []
+        diagList = []
+        for scanId, iShard, iStart, iEnd, predicate in dataList:
+            try:
+                resultList.append((scanId, iShard, self.scanRows(predicate, iStart, iEnd)))
+                successList.append((scanId, iShard))
+            except Exception as e:
+                resultList.append((scanId, iShard, None))
+                diagList.append("%s shard %d failing %r" % (procName, iShard, str(e)))
+        return successList, resultList, diagList
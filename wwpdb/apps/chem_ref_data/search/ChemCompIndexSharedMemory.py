@@ -0,0 +1,191 @@
+##
+# File:  ChemCompIndexSharedMemory.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Publish the chemical component search index in shared memory for attachment by worker processes.
+
+A loader process copies the index, in column store format, into a new shared memory segment and
+then advances the generation counter held in a small control segment.  Worker processes attach the
+data segment read-only and reattach when the generation changes.  Segments outlive the publishing
+process and the previous data segment is unlinked after each publication (processes still attached
+to it keep their mapping).  A single publisher per host is assumed.
+
+Control segment layout:  magic (8s) | sequence (uint64, odd while updating) | generation (uint64) | data segment name (64s)
+
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import sys
+import time
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
+from wwpdb.apps.chem_ref_data.io.ChemCompIndexColumnStore import ChemCompIndexColumnStore, ChemCompIndexColumnWriter, getColumnStorePath
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompIndexSharedMemory(object):
+    """Shared memory publisher and attacher for the index file indexPath."""
+
+    __magic = b"CCIDXSHM"
+    __ctlFormat = "=8sQQ64s"
+
+    def __init__(self, indexPath, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__indexPath = indexPath
+        self.__ctlName = "ccidx_" + hashlib.md5(os.path.abspath(indexPath).encode("utf-8")).hexdigest()[:16]
+        self.__ctl = None
+
+    @staticmethod
+    def isSupported():
+        return shared_memory is not None
+
+    def getControlName(self):
+        return self.__ctlName
+
+    def getGeneration(self):
+        """Return the published (generation, data segment name) or None if nothing is published."""
+        ctl = self.__getControl(create=False)
+        if ctl is None:
+            return None
+        for _ in range(1000):
+            seq1 = struct.unpack_from("=Q", ctl.buf, 8)[0]
+            magic, _, generation, name = struct.unpack_from(self.__ctlFormat, ctl.buf, 0)
+            seq2 = struct.unpack_from("=Q", ctl.buf, 8)[0]
+            if seq1 == seq2 and not seq1 % 2:
+                if magic != self.__magic or generation == 0:
+                    # Withdrawn - reopen the control segment on the next request
+                    self.__closeControl()
+                    return None
+                return generation, name.rstrip(b"\0").decode("ascii")
+            time.sleep(0.001)
+        return None
+
+    def attach(self):
+        """Return (generation, data segment name, ChemCompIndexColumnStore) for the published index or None."""
+        try:
+            for _ in range(3):
+                gT = self.getGeneration()
+                if gT is None:
+                    return None
+                try:
+                    shm = self.__open(gT[1])
+                except FileNotFoundError:
+                    # Superseded by a concurrent publication
+                    continue
+                return gT[0], gT[1], ChemCompIndexColumnStore(buffer=shm.buf, resource=shm)
+        except Exception as e:
+            logger.exception("Failing to attach shared index %r %r", self.__indexPath, str(e))
+        return None
+
+    def publish(self, ccIndx=None):
+        """Copy the input index (or the current index file content) into a new shared memory segment
+        and advance the published generation.  Return the new generation or None on failure.
+        """
+        try:
+            startTime = time.time()
+            buf = self.__getStoreBytes(ccIndx)
+            ctl = self.__getControl(create=True)
+            seq, generation, oldName = struct.unpack_from(self.__ctlFormat, ctl.buf, 0)[1:]
+            newGeneration = generation + 1
+            name = "%s_%d" % (self.__ctlName, newGeneration)
+            shm = self.__open(name, size=len(buf))
+            shm.buf[: len(buf)] = buf
+            #
+            struct.pack_into("=Q", ctl.buf, 8, seq + 1)
+            struct.pack_into("=8s", ctl.buf, 0, self.__magic)
+            struct.pack_into("=Q64s", ctl.buf, 16, newGeneration, name.encode("ascii"))
+            struct.pack_into("=Q", ctl.buf, 8, seq + 2)
+            shm.close()
+            #
+            oldName = oldName.rstrip(b"\0").decode("ascii")
+            if oldName:
+                self.__unlink(oldName)
+            logger.info("Published index %r generation %d segment %r length %d in (%.4f seconds)", self.__indexPath, newGeneration, name, len(buf), time.time() - startTime)
+            return newGeneration
+        except Exception as e:
+            logger.exception("Failing to publish shared index %r %r", self.__indexPath, str(e))
+        return None
+
+    def unpublish(self):
+        """Withdraw the published index and remove the data and control segments."""
+        gT = self.getGeneration()
+        if gT is not None:
+            ctl = self.__getControl()
+            seq = struct.unpack_from("=Q", ctl.buf, 8)[0]
+            struct.pack_into("=Q", ctl.buf, 8, seq + 1)
+            struct.pack_into("=Q64s", ctl.buf, 16, 0, b"")
+            struct.pack_into("=Q", ctl.buf, 8, seq + 2)
+            self.__unlink(gT[1])
+        self.__closeControl()
+        self.__unlink(self.__ctlName)
+
+    def __closeControl(self):
+        if self.__ctl is not None:
+            self.__ctl.close()
+            self.__ctl = None
+
+    def __getStoreBytes(self, ccIndx):
+        if ccIndx is None:
+            colPath = getColumnStorePath(self.__indexPath)
+            if os.access(colPath, os.R_OK) and (not os.access(self.__indexPath, os.R_OK) or os.stat(colPath).st_mtime >= os.stat(self.__indexPath).st_mtime):
+                with open(colPath, "rb") as ifh:
+                    return ifh.read()
+            ccIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh).readIndex(indexPath=self.__indexPath)
+        if not ccIndx:
+            raise ValueError("Empty index %r" % self.__indexPath)
+        return ChemCompIndexColumnWriter(verbose=self.__verbose, log=self.__lfh).toBytes(ccIndx)
+
+    def __getControl(self, create=False):
+        if self.__ctl is None:
+            try:
+                self.__ctl = self.__open(self.__ctlName)
+            except FileNotFoundError:
+                if not create:
+                    return None
+                try:
+                    self.__ctl = self.__open(self.__ctlName, size=struct.calcsize(self.__ctlFormat))
+                except FileExistsError:
+                    self.__ctl = self.__open(self.__ctlName)
+        return self.__ctl
+
+    @staticmethod
+    def __open(name, size=0):
+        """Open (size=0) or create a segment which is not removed when this process exits."""
+        create = size > 0
+        try:
+            return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+        except TypeError:
+            # Python < 3.13 - detach the segment from the resource tracker of this process
+            from multiprocessing import resource_tracker  # pylint: disable=import-outside-toplevel
+
+            shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+            resource_tracker.unregister(shm._name, "shared_memory")  # pylint: disable=protected-access
+            return shm
+
+    def __unlink(self, name):
+        try:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Python < 3.13 - unlink() unregisters the segment from the resource tracker
+                shm = shared_memory.SharedMemory(name=name)
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Failing to unlink shared memory segment %r %r", name, str(e))
@@ -0,0 +1,135 @@
+##
+# File:  ChemCompIndexStats.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Column statistics of the chemical component search index.
+
+For each index key the statistics report the number of rows having a value, the number of distinct
+values (list elements for list-valued keys), the distribution of list lengths, an equal width histogram
+of numeric values and the approximate size in bytes of the decoded values (and of the column in the
+column store when available).  Statistics are written alongside the index file at build time and are
+recomputed from the index content when that file is missing or older than the index.
+
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+from wwpdb.apps.chem_ref_data.io.ChemCompIndexColumnStore import ChemCompIndexColumnStore
+
+logger = logging.getLogger(__name__)
+
+
+def getStatsPath(indexPath):
+    """Return the path of the statistics file accompanying the input index pickle file."""
+    return os.path.splitext(indexPath)[0] + "-stats.json"
+
+
+class ChemCompIndexStats(object):
+    """Build, read and write index column statistics."""
+
+    def __init__(self, numBins=10, verbose=False, log=sys.stderr):
+        self.__numBins = numBins
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def build(self, ccIndx):
+        """Return the statistics dictionary for the input index (dictionary or column store)."""
+        startTime = time.time()
+        colD = {}
+        for d in ccIndx.values():
+            for ky in d:
+                if ky not in colD:
+                    colD[ky] = {"rows": 0, "distinct": set(), "listLengths": {}, "numbers": [], "nonNumeric": 0, "bytes": 0}
+                cD = colD[ky]
+                v = d[ky]
+                if v is None or v in ["?", "."]:
+                    continue
+                cD["rows"] += 1
+                cD["bytes"] += self.__getSize(v)
+                if isinstance(v, (list, tuple, set)):
+                    lS = str(len(v))
+                    cD["listLengths"][lS] = cD["listLengths"].get(lS, 0) + 1
+                    cD["distinct"].update(t for t in v if isinstance(t, str))
+                    cD["nonNumeric"] += 1
+                    continue
+                cD["distinct"].add(v if isinstance(v, str) else json.dumps(v, sort_keys=True))
+                try:
+                    cD["numbers"].append(float(v))
+                except (TypeError, ValueError):
+                    cD["nonNumeric"] += 1
+        #
+        nRows = len(ccIndx)
+        columns = {}
+        for ky, cD in colD.items():
+            sD = {"rows": cD["rows"], "missing": nRows - cD["rows"], "distinct": len(cD["distinct"]), "bytes": cD["bytes"]}
+            if cD["listLengths"]:
+                sD["listLengths"] = cD["listLengths"]
+            if cD["numbers"] and not cD["nonNumeric"]:
+                sD["histogram"] = self.__getHistogram(cD["numbers"])
+            if isinstance(ccIndx, ChemCompIndexColumnStore):
+                sD["storeBytes"] = ccIndx.getColumnSize(ky)
+            columns[ky] = sD
+        rD = {"rows": nRows, "bytes": sum(sD["bytes"] for sD in columns.values()), "columns": columns}
+        logger.debug("Index statistics rows %d columns %d in (%.4f seconds)", nRows, len(columns), time.time() - startTime)
+        return rD
+
+    def write(self, statsD, outPath):
+        try:
+            with open(outPath, "w") as ofh:
+                json.dump(statsD, ofh, indent=1, sort_keys=True)
+            return True
+        except Exception as e:
+            logger.exception("Failing writing index statistics %r %r", outPath, str(e))
+        return False
+
+    def read(self, indexPath):
+        """Return the statistics written for the index file indexPath or None if missing or older than the index."""
+        statsPath = getStatsPath(indexPath)
+        try:
+            if os.stat(statsPath).st_mtime < os.stat(indexPath).st_mtime:
+                return None
+            with open(statsPath, "r") as ifh:
+                return json.load(ifh)
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def estimateRange(histD, lowerBound, upperBound):
+        """Return the estimated number of values in lowerBound <= v < upperBound assuming values are uniform within each bin."""
+        nEst = 0.0
+        edgeL = histD["edges"]
+        for ii, cnt in enumerate(histD["counts"]):
+            bLow, bHigh = edgeL[ii], edgeL[ii + 1]
+            if bHigh <= bLow:
+                nEst += cnt if lowerBound <= bLow < upperBound else 0
+                continue
+            overlap = min(bHigh, upperBound) - max(bLow, lowerBound)
+            if overlap > 0:
+                nEst += cnt * overlap / (bHigh - bLow)
+        return int(nEst + 0.999)
+
+    def __getHistogram(self, numL):
+        vMin, vMax = min(numL), max(numL)
+        nBins = self.__numBins if vMax > vMin else 1
+        width = (vMax - vMin) / nBins if vMax > vMin else 0.0
+        countL = [0] * nBins
+        for v in numL:
+            countL[min(nBins - 1, int((v - vMin) / width)) if width else 0] += 1
+        return {"min": vMin, "max": vMax, "edges": [vMin + ii * width for ii in range(nBins)] + [vMax], "counts": countL}
+
+    @staticmethod
+    def __getSize(v):
+        if isinstance(v, dict):
+            return sys.getsizeof(v) + sum(sys.getsizeof(k) + sys.getsizeof(t) for k, t in v.items())
+        if isinstance(v, (list, tuple, set)):
+            return sys.getsizeof(v) + sum(sys.getsizeof(t) for t in v)
+        return sys.getsizeof(v)
@@ -0,0 +1,199 @@
+##
+# File:  ChemCompMassIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Sorted mass column for nearest-mass and mass tolerance searches over the chemical component index.
+
+Masses are either the monoisotopic masses computed from the element typeCounts of each component
+(key 'monoisotopicMass') or the numeric values of an index key (e.g. 'formulaWeight').  Monoisotopic
+masses are those of the neutral formula using the most abundant isotope of each element (electron
+masses are ignored for charged components).  Components with element types lacking a mass are skipped.
+
+"""
+
+import bisect
+import logging
+import math
+
+from operator import itemgetter
+
+logger = logging.getLogger(__name__)
+
+# Mass of the most abundant isotope (or longest lived for elements without stable isotopes)
+monoisotopicMassD = {
+    "H": 1.00782503207,
+    "D": 2.0141017778,
+    "T": 3.0160492777,
+    "HE": 4.00260325415,
+    "LI": 7.016004548,
+    "BE": 9.012182201,
+    "B": 11.009305406,
+    "C": 12.0,
+    "N": 14.00307400478,
+    "O": 15.99491461956,
+    "F": 18.998403224,
+    "NE": 19.99244017542,
+    "NA": 22.98976928087,
+    "MG": 23.985041699,
+    "AL": 26.981538627,
+    "SI": 27.97692653246,
+    "P": 30.973761629,
+    "S": 31.972070999,
+    "CL": 34.968852682,
+    "AR": 39.96238312251,
+    "K": 38.963706679,
+    "CA": 39.962590983,
+    "SC": 44.955911909,
+    "TI": 47.947946281,
+    "V": 50.943959507,
+    "CR": 51.940507472,
+    "MN": 54.938045141,
+    "FE": 55.934937475,
+    "CO": 58.933195048,
+    "NI": 57.935342907,
+    "CU": 62.929597474,
+    "ZN": 63.929142222,
+    "GA": 68.925573587,
+    "GE": 73.921177767,
+    "AS": 74.921596478,
+    "SE": 79.916521271,
+    "BR": 78.918337087,
+    "KR": 83.911507,
+    "RB": 84.911789738,
+    "SR": 87.905612124,
+    "Y": 88.905848295,
+    "ZR": 89.904704416,
+    "NB": 92.906378058,
+    "MO": 97.905408169,
+    "TC": 97.907216,
+    "RU": 101.904349312,
+    "RH": 102.905504292,
+    "PD": 105.903485715,
+    "AG": 106.90509682,
+    "CD": 113.90335854,
+    "IN": 114.903878484,
+    "SN": 119.902194676,
+    "SB": 120.903815686,
+    "TE": 129.906224399,
+    "I": 126.904472681,
+    "XE": 131.9041535,
+    "CS": 132.905451933,
+    "BA": 137.905247237,
+    "LA": 138.906353267,
+    "CE": 139.905438706,
+    "PR": 140.907652769,
+    "ND": 141.907723297,
+    "PM": 144.912749,
+    "SM": 151.919732425,
+    "EU": 152.921230339,
+    "GD": 157.924103912,
+    "TB": 158.925346757,
+    "DY": 163.929174751,
+    "HO": 164.93032207,
+    "ER": 165.930293061,
+    "TM": 168.93421325,
+    "YB": 173.938862089,
+    "LU": 174.940771819,
+    "HF": 179.946549953,
+    "TA": 180.947995763,
+    "W": 183.950931188,
+    "RE": 186.955753109,
+    "OS": 191.96148069,
+    "IR": 192.96292643,
+    "PT": 194.964791134,
+    "AU": 196.966568662,
+    "HG": 201.970643011,
+    "TL": 204.974427541,
+    "PB": 207.976652071,
+    "BI": 208.980398734,
+    "PO": 208.9824304,
+    "AT": 209.987148,
+    "RN": 222.0175777,
+    "FR": 223.0197359,
+    "RA": 226.0254098,
+    "AC": 227.0277521,
+    "TH": 232.038055325,
+    "PA": 231.03588399,
+    "U": 238.050788247,
+}
+
+
+def getMonoisotopicMass(typeCounts):
+    """Return the monoisotopic mass for the element counts in typeCounts or None if an element mass is unknown."""
+    if not typeCounts:
+        return None
+    mass = 0.0
+    for etype, cnt in typeCounts.items():
+        eMass = monoisotopicMassD.get(str(etype).upper())
+        if eMass is None:
+            return None
+        mass += eMass * int(cnt)
+    return mass
+
+
+class ChemCompMassIndex(object):
+    """Component masses sorted by value for the index key 'monoisotopicMass' (computed) or a numeric index key."""
+
+    def __init__(self, ccIndx, key="monoisotopicMass"):
+        self.__key = key
+        tL = []
+        for ccId, d in ccIndx.items():
+            if key == "monoisotopicMass":
+                mass = getMonoisotopicMass(d.get("typeCounts"))
+            else:
+                try:
+                    mass = float(str(d.get(key)))
+                except (TypeError, ValueError):
+                    mass = None
+            if mass is None or math.isnan(mass):
+                logger.debug("No mass for %r %r", key, ccId)
+                continue
+            tL.append((mass, ccId))
+        tL.sort(key=itemgetter(0))
+        self.__massL = [t[0] for t in tL]
+        self.__idL = [t[1] for t in tL]
+        self.__massD = {ccId: mass for mass, ccId in tL}
+        logger.debug("Mass index for key %r length %d", key, len(self.__massL))
+
+    def getKey(self):
+        return self.__key
+
+    def getMass(self, ccId):
+        return self.__massD.get(ccId)
+
+    def estimatePpm(self, mass, ppm):
+        """Return the number of components with mass within ppm parts per million of mass."""
+        iBeg, iEnd = self.__getToleranceRange(mass, ppm)
+        return iEnd - iBeg
+
+    def searchNearest(self, mass, numResults=10):
+        """Return the list of (ccId, mass) for the numResults components closest in mass ordered by increasing mass difference."""
+        rL = []
+        iHi = bisect.bisect_left(self.__massL, mass)
+        iLo = iHi - 1
+        nMass = len(self.__massL)
+        while len(rL) < numResults and (iLo >= 0 or iHi < nMass):
+            if iHi >= nMass or (iLo >= 0 and mass - self.__massL[iLo] <= self.__massL[iHi] - mass):
+                rL.append((self.__idL[iLo], self.__massL[iLo]))
+                iLo -= 1
+            else:
+                rL.append((self.__idL[iHi], self.__massL[iHi]))
+                iHi += 1
+        return rL
+
+    def searchPpm(self, mass, ppm=10.0):
+        """Return the list of (ccId, mass) for components with mass within ppm parts per million of mass
+        ordered by increasing mass difference.
+        """
+        iBeg, iEnd = self.__getToleranceRange(mass, ppm)
+        rL = [(self.__idL[ii], self.__massL[ii]) for ii in range(iBeg, iEnd)]
+        rL.sort(key=lambda t: abs(t[1] - mass))
+        return rL
+
+    def __getToleranceRange(self, mass, ppm):
+        tol = abs(mass) * float(ppm) * 1.0e-6
+        return bisect.bisect_left(self.__massL, mass - tol), bisect.bisect_right(self.__massL, mass + tol)
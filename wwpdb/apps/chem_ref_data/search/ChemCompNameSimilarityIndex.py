@@ -0,0 +1,253 @@
+##
+# File:  ChemCompNameSimilarityIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  add score() for candidate filtering
+#   18-Oct-2026  filter JARO / JARO_WINKLER candidates by shared character counts and common prefix
+##
+"""
+Approximate string (name) similarity search over a chemical component index field.
+
+Candidates are filtered before scoring:
+
+  - JARO / JARO_WINKLER  -  the number of Jaro matching characters is at most the size of the
+                            intersection of the character multisets of the two strings, which bounds
+                            the Jaro similarity (m/l1 + m/l2 + 1) / 3.  The Winkler prefix adjustment
+                            only applies to Jaro similarities > 0.7 (as in jellyfish) and is bounded
+                            by the common prefix (at most 4 characters).  Shared character counts and
+                            prefixes of all names are evaluated as arrays and only names whose bound
+                            exceeds the cutoff are scored.
+  - LEV                  -  names are held in one BK-tree (Damerau-Levenshtein metric) per length
+                            and each tree is searched with the largest distance that can still
+                            satisfy the normalized cutoff for that length.
+
+In top-K mode candidates (or buckets) are visited in order of decreasing achievable score and the
+search stops once no remaining candidate can improve on the current K-th best result.
+
+"""
+
+import heapq
+import logging
+import threading
+from collections import Counter
+
+import jellyfish
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompNameSimilarityIndex(object):
+    """Character count, prefix and BK-tree candidate filters over the string values of one index key."""
+
+    prefixLength = 4
+
+    def __init__(self, ccIndx, key):
+        self.__key = key
+        self.__idList = []
+        self.__nameL = []
+        self.__nameRowL = []
+        self.__lenD = {}
+        self.__bkTreeD = None
+        self.__charT = None
+        self.__lock = threading.Lock()
+        #
+        nameD = {}
+        for ccId, d in ccIndx.items():
+            refV = d.get(key)
+            vL = refV if isinstance(refV, (list, tuple, set)) else [refV]
+            iRow = len(self.__idList)
+            self.__idList.append(ccId)
+            for v in vL:
+                if not isinstance(v, str) or not v:
+                    continue
+                iName = nameD.get(v)
+                if iName is None:
+                    iName = nameD[v] = len(self.__nameL)
+                    self.__nameL.append(v)
+                    self.__nameRowL.append([])
+                    self.__lenD.setdefault(len(v), []).append(iName)
+                if not self.__nameRowL[iName] or self.__nameRowL[iName][-1] != iRow:
+                    self.__nameRowL[iName].append(iRow)
+        logger.debug("Name similarity index for key %r rows %d names %d", key, len(self.__idList), len(self.__nameL))
+
+    def getKey(self):
+        return self.__key
+
+    @staticmethod
+    def score(s1, s2, method="JARO_WINKLER"):
+        """Return the similarity of s1 and s2 for method JARO, JARO_WINKLER or LEV (normalized Damerau-Levenshtein)."""
+        if not s1 or not s2:
+            return 0.0
+        if method == "JARO":
+            return jellyfish.jaro_similarity(s1, s2)
+        elif method == "JARO_WINKLER":
+            return jellyfish.jaro_winkler_similarity(s1, s2)
+        elif method == "LEV":
+            maxLen = max(len(s1), len(s2))
+            return float(maxLen - jellyfish.damerau_levenshtein_distance(s1, s2)) / float(maxLen)
+        return 0.0
+
+    def search(self, target, method="JARO_WINKLER", cutOff=0.75, topK=None):
+        """Return component identifiers with a name similarity to target greater than cutOff,
+        ordered by decreasing similarity.  The score of a component is the best score over its names.
+        With topK only the best topK components are returned.
+        """
+        if not target:
+            return []
+        if method in ["JARO", "JARO_WINKLER"]:
+            return self.__searchJaro(target, method, cutOff, topK)
+        elif method != "LEV":
+            return []
+        #
+        l1 = len(target)
+        lenL = sorted(((self.__levBound(l1, l2), l2) for l2 in self.__lenD), reverse=True)
+        scoreD = {}
+        kthScore = None
+        for bound, l2 in lenL:
+            if bound <= cutOff or (kthScore is not None and bound < kthScore):
+                break
+            # Largest distance for which (maxLen - dist) / maxLen can still reach the threshold
+            maxLen = max(l1, l2)
+            thr = kthScore if kthScore is not None else cutOff
+            radius = int(maxLen * (1.0 - thr) + 1.0e-9)
+            for iName, dist in self.__getBkTree(l2).search(target, radius):
+                score = float(maxLen - dist) / float(maxLen)
+                if score > cutOff:
+                    self.__addScore(scoreD, iName, score)
+            if topK and len(scoreD) >= topK:
+                kthScore = heapq.nlargest(topK, scoreD.values())[-1]
+        return self.__getResultList(scoreD, topK)
+
+    def getNameCount(self):
+        return len(self.__nameL)
+
+    def getCandidateCount(self, target, method="JARO_WINKLER", cutOff=0.75):
+        """Return the number of names scored by a JARO or JARO_WINKLER search for target (without topK)."""
+        return len(self.__getJaroCandidates(target, method, cutOff)[0])
+
+    def __searchJaro(self, target, method, cutOff, topK):
+        scoreFunc = jellyfish.jaro_similarity if method == "JARO" else jellyfish.jaro_winkler_similarity
+        candA, boundA = self.__getJaroCandidates(target, method, cutOff)
+        scoreD = {}
+        kthScore = None
+        nScored = 0
+        for iName, bound in zip(candA.tolist(), boundA.tolist()):
+            if kthScore is not None and bound < kthScore:
+                break
+            score = scoreFunc(target, self.__nameL[iName])
+            nScored += 1
+            if score > cutOff:
+                self.__addScore(scoreD, iName, score)
+            if topK and len(scoreD) >= topK and nScored % 64 == 0:
+                kthScore = heapq.nlargest(topK, scoreD.values())[-1]
+        logger.debug("Similarity %s target %r names %d scored %d", method, target, len(self.__nameL), nScored)
+        return self.__getResultList(scoreD, topK)
+
+    def __getJaroCandidates(self, target, method, cutOff):
+        """Return the arrays of name indices with an achievable similarity > cutOff and their bounds in decreasing order."""
+        charColD, countM, lenA, prefixM = self.__getCharArrays()
+        l1 = len(target)
+        mA = np.zeros(len(self.__nameL), dtype=np.int32)
+        for ch, cnt in Counter(target).items():
+            iCol = charColD.get(ch)
+            if iCol is not None:
+                mA += np.minimum(countM[:, iCol], cnt)
+        boundA = np.where(mA > 0, (mA / float(l1) + mA / np.maximum(lenA, 1) + 1.0) / 3.0, 0.0)
+        if method == "JARO_WINKLER":
+            nP = min(self.prefixLength, l1)
+            tCodeA = np.array([ord(ch) for ch in target[:nP]], dtype=np.int32)
+            prefixA = np.cumprod(prefixM[:, :nP] == tCodeA, axis=1).sum(axis=1)
+            boundA = np.where(boundA > 0.7, boundA + 0.1 * prefixA * (1.0 - boundA), boundA)
+        boundA = boundA + 1.0e-9
+        candA = np.flatnonzero(boundA > cutOff)
+        candA = candA[np.argsort(-boundA[candA], kind="stable")]
+        return candA, boundA[candA]
+
+    def __getCharArrays(self):
+        """Return the character -> column map, name x character count matrix, name lengths and name prefix codes."""
+        if self.__charT is None:
+            with self.__lock:
+                if self.__charT is None:
+                    charColD = {}
+                    for name in self.__nameL:
+                        for ch in name:
+                            charColD.setdefault(ch, len(charColD))
+                    countM = np.zeros((len(self.__nameL), max(1, len(charColD))), dtype=np.int32)
+                    prefixM = np.full((len(self.__nameL), self.prefixLength), -1, dtype=np.int32)
+                    for iName, name in enumerate(self.__nameL):
+                        for ch, cnt in Counter(name).items():
+                            countM[iName, charColD[ch]] = cnt
+                        prefixM[iName, : min(len(name), self.prefixLength)] = [ord(ch) for ch in name[: self.prefixLength]]
+                    lenA = np.array([len(name) for name in self.__nameL], dtype=np.int32)
+                    self.__charT = (charColD, countM, lenA, prefixM)
+        return self.__charT
+
+    def __addScore(self, scoreD, iName, score):
+        for iRow in self.__nameRowL[iName]:
+            if score > scoreD.get(iRow, -1.0):
+                scoreD[iRow] = score
+
+    def __getResultList(self, scoreD, topK):
+        rL = sorted(scoreD.items(), key=lambda t: (-t[1], t[0]))
+        if topK:
+            rL = rL[:topK]
+        return [(self.__idList[iRow], score) for iRow, score in rL]
+
+    def __getBkTree(self, length):
+        if self.__bkTreeD is None:
+            with self.__lock:
+                if self.__bkTreeD is None:
+                    bkTreeD = {}
+                    for l2, nameIdxL in self.__lenD.items():
+                        bkTreeD[l2] = BkTree(self.__nameL, nameIdxL, jellyfish.damerau_levenshtein_distance)
+                    self.__bkTreeD = bkTreeD
+        return self.__bkTreeD[length]
+
+    @staticmethod
+    def __levBound(l1, l2):
+        # Edit distance is at least the length difference
+        maxLen = max(l1, l2)
+        return float(maxLen - abs(l1 - l2)) / float(maxLen) + 1.0e-9
+
+
+class BkTree(object):
+    """Burkhard-Keller tree over a subset of a list of strings with an integer metric distFunc."""
+
+    def __init__(self, strL, idxL, distFunc):
+        self.__strL = strL
+        self.__distFunc = distFunc
+        self.__root = None
+        for idx in idxL:
+            self.__add(idx)
+
+    def __add(self, idx):
+        if self.__root is None:
+            self.__root = (idx, {})
+            return
+        s = self.__strL[idx]
+        node = self.__root
+        while True:
+            dist = self.__distFunc(s, self.__strL[node[0]])
+            child = node[1].get(dist)
+            if child is None:
+                node[1][dist] = (idx, {})
+                return
+            node = child
+
+    def search(self, target, radius):
+        """Return the list of (string index, distance) within distance radius of target."""
+        idxL = []
+        if self.__root is None or radius < 0:
+            return idxL
+        stack = [self.__root]
+        while stack:
+            idx, childD = stack.pop()
+            dist = self.__distFunc(target, self.__strL[idx])
+            if dist <= radius:
+                idxL.append((idx, dist))
+            for cDist, child in childD.items():
+                if dist - radius <= cDist <= dist + radius:
+                    stack.append(child)
+        return idxL
@@ -6,20 +6,47 @@
 #   20-Apr-2017  overhaul
 #    1-May-2017  add search over lists and add range search method
 #   27-May-2017  add more performant approximate string comparison
+#   18-Oct-2026  read the index through the process-wide ChemCompIndexCache
+#   18-Oct-2026  exact match searches use inverted value -> ccId maps
+#   18-Oct-2026  range searches use sorted numeric columns and bisection
+#   18-Oct-2026  formula searches use the vectorized ChemCompFormulaIndex
+#   18-Oct-2026  substring searches use trigram posting lists
+#   18-Oct-2026  edit distance searches use ChemCompNameSimilarityIndex candidate filtering
+#   18-Oct-2026  add searchIndexGroups() and linear time searchIndexAll()
+#   18-Oct-2026  optionally attach the index published in shared memory (SITE_CC_INDEX_SHARED_MEMORY)
+#   18-Oct-2026  add searchIndexMany() batch search
+#   18-Oct-2026  add searchComposite() multi-criteria search
+#   18-Oct-2026  add searchIndexScan() sharded scans over a persistent process pool (SITE_CC_INDEX_SCAN_PROCESSES)
+#   18-Oct-2026  add getAttributeValuePage() paged and sorted result projection
+#   18-Oct-2026  add subcomponent containment and subset searches over ChemCompSubcomponentIndex bitsets
+#   18-Oct-2026  add prefix searches over sorted string columns and InChIKey block family searches
+#   18-Oct-2026  add nearest mass and mass tolerance (ppm) searches over ChemCompMassIndex
+#   18-Oct-2026  add stats() column statistics used by the composite search planner
 ##
 """
 Search index of chemical components definitions by component features.
 
 """
 
+import bisect
+import heapq
+import math
+import os
 import sys
 import time
 
-import jellyfish
 from operator import itemgetter
 
-from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexCache import ChemCompIndexCache
+from wwpdb.apps.chem_ref_data.search.ChemCompFormulaIndex import ChemCompFormulaIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompTrigramIndex import ChemCompTrigramIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompNameSimilarityIndex import ChemCompNameSimilarityIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompSubcomponentIndex import ChemCompSubcomponentIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompMassIndex import ChemCompMassIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexStats import ChemCompIndexStats, getStatsPath
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexScanPool import ChemCompIndexScanPool, matchRow
 
 import logging
 
@@ -36,8 +63,43 @@ class ChemCompSearchIndexUtils(object):
         self.__pathCCIndex = self.__cIAppCc.get_cc_index()
         logger.debug("ChemCompSearchIndexUtils index path %r", self.__pathCCIndex)
         #
-        dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
-        self.__ccIndx = dIndx.readIndex(indexPath=self.__pathCCIndex)
+        cI = ConfigInfo(self.__siteId)
+        useShm = str(cI.get("SITE_CC_INDEX_SHARED_MEMORY", "")).lower() in ["1", "y", "yes", "true"]
+        try:
+            self.__scanProcs = int(cI.get("SITE_CC_INDEX_SCAN_PROCESSES", 0) or 0)
+        except (TypeError, ValueError):
+            self.__scanProcs = 0
+        self.__entry = ChemCompIndexCache.getEntry(self.__pathCCIndex, verbose=self.__verbose, log=self.__lfh, useSharedMemory=useShm)
+        self.__ccIndx = self.__entry.getIndex()
+
+    def getGeneration(self):
+        """Return the load generation of the index content used by this instance."""
+        return self.__entry.getGeneration()
+
+    def stats(self):
+        """Return the index statistics -
+
+        {'rows': <number of components>, 'bytes': <approximate size of the decoded values>, 'generation': <load generation>,
+         'columns': {key: {'rows', 'missing', 'distinct', 'bytes', ['storeBytes'], ['listLengths'], ['histogram']}, ...}}
+
+        'listLengths' maps list length to row count for list-valued keys and 'histogram' ({'min', 'max', 'edges',
+        'counts'}) is provided for numeric keys.  Statistics written alongside the index file are used when current.
+        """
+        statsD = dict(self.__entry.getDerived("stats", self.__buildStats))
+        statsD["generation"] = self.__entry.getGeneration()
+        return statsD
+
+    def __buildStats(self, ccIndx):
+        statsD = ChemCompIndexStats(verbose=self.__verbose, log=self.__lfh).read(self.__pathCCIndex)
+        if statsD is None or statsD.get("rows") != len(ccIndx):
+            statsD = ChemCompIndexStats(verbose=self.__verbose, log=self.__lfh).build(ccIndx)
+        return statsD
+
+    def __getColumnStats(self, key):
+        """Return the statistics for key when available without a scan of the index or None."""
+        if not self.__entry.hasDerived("stats") and not os.path.exists(getStatsPath(self.__pathCCIndex)):
+            return None
+        return self.stats()["columns"].get(key, {"rows": 0, "distinct": 0})
 
     def getValue(self, ccId, key):
         try:
@@ -66,63 +128,310 @@ class ChemCompSearchIndexUtils(object):
             rowList.append(dd)
         return rowList
 
-    def searchIndexAll(self, key):
-        rD = {}
-        for ccId, d in self.__ccIndx.items():
+    def getAttributeValuePage(self, myIdList, colList, dspList, offset=0, limit=None, sortKey=None, reverse=False):
+        """Return the total length of the input id list and the rows (as in getAttributeValueList()) of the
+        page of at most limit identifiers starting at offset.  With sortKey identifiers are ordered by the
+        numeric (or otherwise string) index value of sortKey.  Only the rows on the page are projected.
+        """
+        offset = max(0, offset or 0)
+        pageIdList = myIdList
+        if sortKey:
+            sortFunc = self.__getSortValueFunc(sortKey)
+            if limit is not None and offset + limit < len(myIdList):
+                selectFunc = heapq.nlargest if reverse else heapq.nsmallest
+                pageIdList = selectFunc(offset + limit, myIdList, key=sortFunc)
+            else:
+                pageIdList = sorted(myIdList, key=sortFunc, reverse=reverse)
+        pageIdList = pageIdList[offset : offset + limit if limit is not None else None]
+        return len(myIdList), self.getAttributeValueList(pageIdList, colList, dspList)
+
+    def __getSortValueFunc(self, sortKey):
+        def sortValue(ccId):
+            v = self.getValue(ccId, sortKey)
+            if v is None:
+                return (2, 0.0, "")
             try:
-                refV = d[key]
-                mL = self.searchIndex(refV, key)
-                if len(mL) > 0:  # THIS WAS > 1 - so seach for single row failed
-                    rD[ccId] = mL
-            except Exception as e:
-                logger.exception("Index search failing for key %r  %r", key, str(e))
+                fV = float(v)
+                if not math.isnan(fV):
+                    return (0, fV, "")
+            except (TypeError, ValueError):
+                pass
+            return (1, 0.0, str(v))
+
+        return sortValue
+
+    def searchIndexAll(self, key, minSize=1):
+        """Return a dictionary of ccId -> [ccId, ...] listing for each component the components sharing
+        a value (or for list-valued keys any list element) of key, including itself.  Only lists with at
+        least minSize members are returned.  Components in the same group share the same list object.
+        """
+        rD = {}
+        try:
+            startTime = time.time()
+            invD = self.__getInvertedIndex(key)
+            rankD = None
+            groupD = {}
+            for ccId, d in self.__ccIndx.items():
+                refV = d.get(key)
+                if isinstance(refV, (list, tuple, set)):
+                    vL = [v for v in refV if v is not None]
+                    if len(vL) == 1:
+                        refV = vL[0]
+                    elif vL:
+                        # Union of the groups of each list element in index order
+                        if rankD is None:
+                            rankD = self.__getRowRank()
+                        mL = sorted(set(tId for v in vL for tId in invD.get(v, [])), key=rankD.get)
+                        if len(mL) >= minSize:
+                            rD[ccId] = mL
+                        continue
+                    else:
+                        continue
+                if refV is None:
+                    continue
+                if refV not in groupD:
+                    groupD[refV] = list(invD.get(refV, []))
+                if len(groupD[refV]) >= minSize:
+                    rD[ccId] = groupD[refV]
+            logger.debug("SearchIndexAll %r result length %d in (%.4f seconds)", key, len(rD), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Index search failing for key %r  %r", key, str(e))
+        return rD
+
+    def searchIndexGroups(self, key, minSize=2):
+        """Return a dictionary of value -> [ccId, ...] for each value (or list element) of key shared by
+        at least minSize components.
+        """
+        rD = {}
+        try:
+            startTime = time.time()
+            rD = {v: list(ccL) for v, ccL in self.__getInvertedIndex(key).items() if len(ccL) >= minSize}
+            logger.debug("SearchIndexGroups %r minSize %d group count %d in (%.4f seconds)", key, minSize, len(rD), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Index group search failing for key %r  %r", key, str(e))
         return rD
 
     def searchIndex(self, target, key):
-        """ """
+        """Return the list of component identifiers with a value (or list element) of key equal to target."""
         idList = []
         try:
             logger.debug("Search index key %r target %r", key, target)
             startTime = time.time()
             #
-            for ccId, d in self.__ccIndx.items():
-                # refV = d.get(key, '')
-                refV = d[key]
-                if isinstance(refV, (list, tuple, set)):
-                    for tt in refV:
-                        if target == tt:
-                            idList.append(ccId)
-                            continue
-                else:
-                    if target == refV:
-                        idList.append(ccId)
+            invD = self.__getInvertedIndex(key)
+            idList = list(invD.get(target, []))
 
             endTime = time.time()
             logger.debug("SearchIndex %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
+        except TypeError:
+            logger.debug("Unhashable search target for key %r target %r", key, target)
         except Exception as e:
             logger.exception("Index search failing for key %r target %r %r", key, target, str(e))
         #
         return idList
 
-    def searchIndexSubstring(self, target, key):
-        """ """
+    def searchIndexMany(self, targets, key, mode="EXACT"):
+        """Return a dictionary of target -> [ccId, ...] answering each input target against key with
+        the search mode EXACT, SUBSTRING, RANGE ('lower upper' targets), PREFIX or SIMILAR.  Repeated targets
+        are answered once and the derived search structure for key is obtained once for the batch.
+        """
+        rD = {}
+        try:
+            startTime = time.time()
+            if mode == "EXACT":
+                invD = self.__getInvertedIndex(key)
+                for target in targets:
+                    if target not in rD:
+                        rD[target] = list(invD.get(target, []))
+            elif mode == "SUBSTRING":
+                tI = self.__getTrigramIndex(key)
+                for target in targets:
+                    if target not in rD:
+                        rD[target] = tI.search(target)
+            elif mode == "RANGE":
+                for target in targets:
+                    if target not in rD:
+                        rD[target] = self.searchIndexRange(target, key)
+            elif mode == "PREFIX":
+                for target in targets:
+                    if target not in rD:
+                        rD[target] = self.searchIndexPrefix(target, key)
+            elif mode == "SIMILAR":
+                for target in targets:
+                    if target not in rD:
+                        rD[target] = self.searchEditDistance(target, key)
+            else:
+                logger.info("Unsupported batch search mode %r", mode)
+            logger.debug("SearchIndexMany %r %r targets %d in (%.4f seconds)", key, mode, len(rD), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Index batch search failing for key %r mode %r %r", key, mode, str(e))
+        #
+        return rD
+
+    def searchComposite(self, predicateList):
+        """Return the list of component identifiers (in index order) satisfying all of the input predicates.
+
+        Each predicate is a tuple (mode, key, target) with mode one of EXACT, SUBSTRING, RANGE ('lower upper'
+        target), PREFIX, SIMILAR, FORMULA_BOUNDED, FORMULA_SUBSET, FORMULA_EXACT or FORMULA_EXACT_SKIPH (formula
+        target, key ignored), SUBCOMPONENT_CONTAINS or SUBCOMPONENT_SUBSET (whitespace separated target),
+        MASS_NEAREST ('mass count' target) or MASS_PPM ('mass ppm' target).
+        Predicates are evaluated in order of increasing estimated result size.  The most selective predicate is searched and the remaining predicates either intersect their own index
+        search results or, when this is estimated to be cheaper, test each remaining candidate.
+        """
         idList = []
         try:
             startTime = time.time()
-            # Upper and lower bounds for element counts in the input formula.
+            planL = []
+            for ii, (mode, key, target) in enumerate(predicateList):
+                planL.append((self.__estimatePredicate(mode, key, target), ii, mode, key, target))
+            planL.sort()
+            logger.debug("Composite search plan %r", [(t[0], t[2], t[3]) for t in planL])
             #
-            for ccId, d in self.__ccIndx.items():
-                # refV = d.get(key, '')
-                refV = d[key]
-                refV = refV if refV is not None else ""
-                if isinstance(refV, (list, tuple, set)):
-                    for tt in refV:
-                        if target in tt:
-                            idList.append(ccId)
-                            continue
+            candS = None
+            for nEst, _, mode, key, target in planL:
+                if candS is None:
+                    candS = set(self.__searchPredicate(mode, key, target))
+                elif mode in ["SUBSTRING", "SIMILAR"] and self.__scanProcs > 1 and len(candS) * self.__scanProcs > len(self.__ccIndx):
+                    # A scan of all rows sharded over the scan processes is shorter than testing the candidates in process
+                    candS.intersection_update(self.searchIndexScan((mode, key, target)))
+                elif mode in ["SUBSTRING", "SIMILAR"] or (mode in ["EXACT", "RANGE", "PREFIX"] and len(candS) < nEst):
+                    # Only row predicates are tested on the candidates
+                    candS = set(ccId for ccId in candS if matchRow((mode, key, target), ccId, self.__ccIndx[ccId]))
                 else:
-                    if target in refV:
-                        idList.append(ccId)
+                    candS.intersection_update(self.__searchPredicate(mode, key, target))
+                if not candS:
+                    break
+            #
+            rankD = self.__getRowRank()
+            idList = sorted(candS or [], key=rankD.get)
+            logger.debug("SearchComposite match list for length %d in (%.4f seconds)", len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Composite search failing for %r %r", predicateList, str(e))
+        #
+        return idList
+
+    def __estimatePredicate(self, mode, key, target):
+        """Return the estimated number of matching components for a composite search predicate."""
+        # Column statistics are used in place of search structures which are not yet built
+        if mode == "EXACT":
+            cS = None if self.__entry.hasDerived("inverted:%s" % key) else self.__getColumnStats(key)
+            if cS is not None:
+                # Mean number of rows per distinct value
+                return -(-cS["rows"] // cS["distinct"]) if cS["distinct"] else 0
+            return len(self.__getInvertedIndex(key).get(target, []))
+        elif mode == "RANGE":
+            bL = target.split()
+            cS = None if self.__entry.hasDerived("numeric:%s" % key) else self.__getColumnStats(key)
+            if cS is not None:
+                return ChemCompIndexStats.estimateRange(cS["histogram"], float(bL[0]), float(bL[1])) if "histogram" in cS else cS["rows"]
+            valueL, _ = self.__getNumericColumn(key)
+            return bisect.bisect_left(valueL, float(bL[1])) - bisect.bisect_left(valueL, float(bL[0]))
+        elif mode == "PREFIX":
+            iBeg, iEnd = self.__getPrefixRange(self.__getSortedColumn(key)[0], target)
+            return iEnd - iBeg
+        elif mode == "SUBSTRING":
+            return self.__getTrigramIndex(key).estimate(target)
+        elif mode.startswith("FORMULA_"):
+            _, eD = self.parseFormulaInput(target)
+            return self.__getFormulaIndex().estimate(eD, excludeH=mode == "FORMULA_EXACT_SKIPH")
+        elif mode.startswith("SUBCOMPONENT_"):
+            return self.__getSubcomponentIndex(key).estimate(target, containsAll=mode == "SUBCOMPONENT_CONTAINS")
+        elif mode == "MASS_NEAREST":
+            return self.__parseMassInput(target, 10)[1]
+        elif mode == "MASS_PPM":
+            return self.__getMassIndex(key).estimatePpm(*self.__parseMassInput(target, 10.0))
+        # Similarity is the most costly and least predictable
+        return len(self.__ccIndx) + 1
+
+    def __searchPredicate(self, mode, key, target):
+        if mode == "EXACT":
+            return self.searchIndex(target, key)
+        elif mode == "RANGE":
+            return self.searchIndexRange(target, key)
+        elif mode == "PREFIX":
+            return self.searchIndexPrefix(target, key)
+        elif mode == "SUBSTRING":
+            return self.searchIndexSubstring(target, key)
+        elif mode == "SIMILAR":
+            return self.searchEditDistance(target, key)
+        elif mode.startswith("FORMULA_"):
+            _, eD = self.parseFormulaInput(target)
+            if mode == "FORMULA_BOUNDED":
+                return self.searchFormulaBounded(elementCounts=eD)
+            elif mode == "FORMULA_SUBSET":
+                return self.searchFormulaSubset(elementCounts=eD)
+            elif mode == "FORMULA_EXACT":
+                return self.searchFormulaExact(elementCounts=eD, excludeH=False)
+            elif mode == "FORMULA_EXACT_SKIPH":
+                return self.searchFormulaExact(elementCounts=eD, excludeH=True)
+        elif mode == "SUBCOMPONENT_CONTAINS":
+            return self.searchSubcomponentContaining(target, key)
+        elif mode == "SUBCOMPONENT_SUBSET":
+            return self.searchSubcomponentSubset(target, key)
+        elif mode == "MASS_NEAREST":
+            mass, numResults = self.__parseMassInput(target, 10)
+            return self.searchMassNearest(mass, int(numResults), key)
+        elif mode == "MASS_PPM":
+            mass, ppm = self.__parseMassInput(target, 10.0)
+            return self.searchMassPpm(mass, ppm, key)
+        logger.info("Unsupported composite search predicate %r %r", mode, key)
+        return []
+
+    def searchIndexScan(self, predicate):
+        """Return the list of component identifiers (in index order) satisfying the input predicate by a full scan.
+
+        The predicate is either a callable predicate(ccId, d) -> bool over the index row dictionary d
+        or a tuple (mode, key, target) with mode one of EXACT, RANGE, PREFIX, SUBSTRING or SIMILAR.  With the
+        site setting SITE_CC_INDEX_SCAN_PROCESSES > 1 the scan is sharded over a persistent pool of
+        worker processes forked after the index is loaded.  searchComposite() uses these scans to filter
+        large candidate sets by SUBSTRING and SIMILAR predicates.
+
+        The pool is forked by the first scan of the process.  A fork copies only the calling thread, so in
+        multi-threaded servers the first scan should run before request threads start (e.g. at process
+        initialization) or the setting left unset.  Scans from concurrent threads are serialized by the pool.
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            numProc = self.__scanProcs
+            pool = self.__entry.getDerived("scanPool:%d" % numProc, lambda ccIndx: ChemCompIndexScanPool(ccIndx, numProc=numProc, verbose=self.__verbose, log=self.__lfh))
+            idList = pool.scan(predicate)
+            logger.debug("SearchIndexScan match list for length %d in (%.4f seconds)", len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Index scan failing for %r %r", predicate, str(e))
+        #
+        return idList
+
+    def __getRowRank(self):
+        return self.__entry.getDerived("rowRank", lambda ccIndx: {ccId: ii for ii, ccId in enumerate(ccIndx)})
+
+    def __getInvertedIndex(self, key):
+        return self.__entry.getDerived("inverted:%s" % key, lambda ccIndx: self.__buildInvertedIndex(ccIndx, key))
+
+    @staticmethod
+    def __buildInvertedIndex(ccIndx, key):
+        """Return a dictionary of value -> [ccId, ...] for the input key.  List-valued fields
+        contribute each list element.  Identifier lists follow index order.
+        """
+        invD = {}
+        for ccId, d in ccIndx.items():
+            refV = d.get(key)
+            vL = refV if isinstance(refV, (list, tuple, set)) else [refV]
+            for v in vL:
+                if v is None:
+                    continue
+                ccL = invD.setdefault(v, [])
+                if not ccL or ccL[-1] != ccId:
+                    ccL.append(ccId)
+        return invD
+
+    def searchIndexSubstring(self, target, key):
+        """Return the list of component identifiers with a value (or list element) of key containing target."""
+        idList = []
+        try:
+            startTime = time.time()
+            #
+            idList = self.__getTrigramIndex(key).search(target)
 
             endTime = time.time()
             logger.debug("SearchIndexSubstring %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
@@ -131,33 +440,141 @@ class ChemCompSearchIndexUtils(object):
         #
         return idList
 
+    def __getTrigramIndex(self, key):
+        return self.__entry.getDerived("trigram:%s" % key, lambda ccIndx: ChemCompTrigramIndex(ccIndx, key))
+
     def searchIndexRange(self, target, key):
-        """ """
+        """Return the list of component identifiers with numeric values of key within the
+        range given as the whitespace separated pair 'lower upper' in target (lower <= v < upper).
+        """
         idList = []
         try:
             logger.debug("Search index range  key %r target range %r", key, target)
-            startTime = time.time()
-            #
             bL = [t.strip() for t in target.split()]
             lowB = float(bL[0])
             upperB = float(bL[1])
-            for ccId, d in self.__ccIndx.items():
-                # refV = d.get(key, '')
-                try:
-                    refV = float(str(d[key]))
-                except:  # noqa: E722 pylint: disable=bare-except
-                    logger.debug("Conversion failure for %r %r %r", key, ccId, d[key])
-                    continue
-                if lowB <= refV and refV < upperB:
-                    idList.append(ccId)
+            idList = self.searchIndexNumericRange(lowB, upperB, key)
+        except Exception as e:
+            logger.exception("Index search failing for key %r target %r %r", key, target, str(e))
+        #
+        return idList
 
+    def searchIndexNumericRange(self, lowerBound, upperBound, key):
+        """Return the list of component identifiers with numeric values of key in the half-open
+        range lowerBound <= v < upperBound ordered by increasing value.
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            valueL, idL = self.__getNumericColumn(key)
+            iBeg = bisect.bisect_left(valueL, lowerBound)
+            iEnd = bisect.bisect_left(valueL, upperBound)
+            idList = idL[iBeg:iEnd]
             endTime = time.time()
-            logger.debug("SearchIndex %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
+            logger.debug("SearchIndex range %r %r %r match list for length %d in (%.4f seconds)", lowerBound, upperBound, key, len(idList), endTime - startTime)
         except Exception as e:
-            logger.exception("Index search failing for key %r target %r %r", key, target, str(e))
+            logger.exception("Index range search failing for key %r range %r %r %r", key, lowerBound, upperBound, str(e))
+        #
+        return idList
+
+    def __getNumericColumn(self, key):
+        return self.__entry.getDerived("numeric:%s" % key, lambda ccIndx: self.__buildNumericColumn(ccIndx, key))
+
+    @staticmethod
+    def __buildNumericColumn(ccIndx, key):
+        """Return parallel lists (valueList, idList) of the numeric values of key sorted by value.
+        Values that cannot be converted to float are skipped.
+        """
+        tL = []
+        for ccId, d in ccIndx.items():
+            try:
+                refV = float(str(d[key]))
+            except:  # noqa: E722 pylint: disable=bare-except
+                logger.debug("Conversion failure for %r %r %r", key, ccId, d.get(key))
+                continue
+            if math.isnan(refV):
+                continue
+            tL.append((refV, ccId))
+        tL.sort(key=itemgetter(0))
+        return [t[0] for t in tL], [t[1] for t in tL]
+
+    def searchIndexPrefix(self, prefix, key):
+        """Return the list of component identifiers with a string value (or list element) of key
+        beginning with prefix ordered by increasing value.
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            valueL, idL = self.__getSortedColumn(key)
+            iBeg, iEnd = self.__getPrefixRange(valueL, prefix)
+            idList = self.__uniqueList(idL[iBeg:iEnd])
+            logger.debug("SearchIndex prefix %r %r match list for length %d in (%.4f seconds)", prefix, key, len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Index prefix search failing for key %r prefix %r %r", key, prefix, str(e))
+        #
+        return idList
+
+    def searchInChIKeyFamily(self, inchiKey, family="SKELETON", key="InChIKey"):
+        """Return the list of component identifiers with an InChIKey in the family of the input key -
+
+        SKELETON              -  same first (connectivity) block (stereoisomers, isotopomers and charge states)
+        SKELETON_PROTONATION  -  same first block and protonation flag
+        CHARGE_STATE          -  same first and second blocks (differing only in protonation)
+        FULL                  -  identical InChIKey
+
+        The input may be a full InChIKey or, for SKELETON, only its first block.
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            iK = str(inchiKey).strip().upper()
+            valueL, idL = self.__getSortedColumn(key)
+            if family == "SKELETON":
+                iBeg, iEnd = self.__getPrefixRange(valueL, iK[:14])
+                idList = self.__uniqueList(idL[iBeg:iEnd])
+            elif family == "SKELETON_PROTONATION" and len(iK) == 27:
+                iBeg, iEnd = self.__getPrefixRange(valueL, iK[:14])
+                idList = self.__uniqueList([idL[ii] for ii in range(iBeg, iEnd) if valueL[ii][26:] == iK[26:]])
+            elif family == "CHARGE_STATE" and len(iK) == 27:
+                iBeg, iEnd = self.__getPrefixRange(valueL, iK[:25])
+                idList = self.__uniqueList(idL[iBeg:iEnd])
+            elif family == "FULL":
+                iBeg = bisect.bisect_left(valueL, iK)
+                iEnd = bisect.bisect_right(valueL, iK)
+                idList = self.__uniqueList(idL[iBeg:iEnd])
+            else:
+                logger.info("Unsupported InChIKey family %r for %r", family, inchiKey)
+            logger.debug("InChIKey family %r %r match list for length %d in (%.4f seconds)", family, iK, len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("InChIKey family search failing for %r %r %r", inchiKey, family, str(e))
         #
         return idList
 
+    @staticmethod
+    def __getPrefixRange(valueL, prefix):
+        """Return the range of positions in the sorted list valueL of the values beginning with prefix."""
+        return bisect.bisect_left(valueL, prefix), bisect.bisect_right(valueL, prefix + chr(sys.maxunicode))
+
+    @staticmethod
+    def __uniqueList(idL):
+        return list(dict.fromkeys(idL)) if len(idL) > 1 else idL
+
+    def __getSortedColumn(self, key):
+        return self.__entry.getDerived("sorted:%s" % key, lambda ccIndx: self.__buildSortedColumn(ccIndx, key))
+
+    @staticmethod
+    def __buildSortedColumn(ccIndx, key):
+        """Return parallel lists (valueList, idList) of the string values (and list elements) of key sorted by value."""
+        tL = []
+        for ccId, d in ccIndx.items():
+            refV = d.get(key)
+            vL = refV if isinstance(refV, (list, tuple, set)) else [refV]
+            for v in vL:
+                if isinstance(v, str) and v and v not in ["?", "."]:
+                    tL.append((v, ccId))
+        tL.sort(key=itemgetter(0))
+        return [t[0] for t in tL], [t[1] for t in tL]
+
     def parseFormulaInput(self, inpTarget):
         """Standardize the input formula target and return a
         formula string - El## El##  and element count dictionary -
@@ -217,29 +634,7 @@ class ChemCompSearchIndexUtils(object):
             startTime = time.time()
             # Upper and lower bounds for element counts in the input formula.
             #
-            offsetU = upperOffset
-            offsetL = lowerOffset
-            #
-            for ccId, d in self.__ccIndx.items():
-                refC = d["typeCounts"]
-                if len(refC) < 1:
-                    continue
-                #
-                mOk = True
-                for etype, cnt in elementCounts.items():
-                    typeU = etype.upper()
-                    if excludeH and typeU in ["H", "D", "T"]:
-                        continue
-                    if typeU in refC:
-                        # test out of bounds -
-                        if (cnt < refC[typeU] - offsetL) or (cnt > refC[typeU] + offsetU):
-                            mOk = False
-                            break
-                    else:
-                        mOk = False
-                        break
-                if mOk:
-                    idList.append(ccId)
+            idList = self.__getFormulaIndex().searchBounded(elementCounts, upperOffset=upperOffset, lowerOffset=lowerOffset, excludeH=excludeH)
 
             endTime = time.time()
             logger.info("FormulaBounded match list for length %d (%.3f seconds)", len(idList), endTime - startTime)
@@ -262,25 +657,7 @@ class ChemCompSearchIndexUtils(object):
         try:
             startTime = time.time()
             #
-            for ccId, d in self.__ccIndx.items():
-                refC = d["typeCounts"]
-                if len(refC) < 1:
-                    continue
-                #
-                mOk = True
-                for etype, cnt in elementCounts.items():
-                    typeU = etype.upper()
-                    if excludeH and typeU in ["H", "D", "T"]:
-                        continue
-                    if typeU in refC:
-                        if cnt != refC[typeU]:
-                            mOk = False
-                            break
-                    else:
-                        mOk = False
-                        break
-                if mOk:
-                    idList.append(ccId)
+            idList = self.__getFormulaIndex().searchSubset(elementCounts, excludeH=excludeH)
 
             endTime = time.time()
             logger.info("Formula match list for length %d (%.3f seconds)", len(idList), endTime - startTime)
@@ -306,37 +683,7 @@ class ChemCompSearchIndexUtils(object):
         try:
             startTime = time.time()
             #
-            for ccId, d in self.__ccIndx.items():
-                refC = d["typeCounts"]
-                if len(refC) < 1:
-                    continue
-                # Exact match case -
-                if not excludeH and len(refC) != len(elementCounts):
-                    continue
-                elif excludeH:
-                    rs = set(refC.keys()) - set(["H", "T", "D"])
-                    ts = set(elementCounts.keys()) - set(["H", "T", "D"])
-                    if rs != ts:
-                        continue
-                    # if len(rs) != len(ts):
-                    #    continue
-                #
-
-                mOk = True
-                for etype, cnt in refC.items():
-                    #
-                    typeU = etype.upper()
-                    if excludeH and typeU in ["H", "D", "T"] and len(refC) > 1:
-                        continue
-                    if typeU in elementCounts:
-                        if cnt != elementCounts[typeU]:
-                            mOk = False
-                            break
-                    else:
-                        mOk = False
-                        break
-                if mOk:
-                    idList.append(ccId)
+            idList = self.__getFormulaIndex().searchExact(elementCounts, excludeH=excludeH)
 
             endTime = time.time()
             logger.info("Formula match list for length %d (%.3f seconds)", len(idList), endTime - startTime)
@@ -346,100 +693,103 @@ class ChemCompSearchIndexUtils(object):
         #
         return idList
 
-    ##
-    ##
+    def __getFormulaIndex(self):
+        return self.__entry.getDerived("formula", ChemCompFormulaIndex)
 
-    def searchEditDistance(self, target, key, DIST_TYPE="JARO_WINKLER"):
-        """ """
-        if DIST_TYPE == "JARO":
-            return self.__searchEditDistanceJaro(target, key, cutOff=0.75)
-        elif DIST_TYPE == "JARO_WINKLER":
-            return self.__searchEditDistanceJaroWinkler(target, key, cutOff=0.75)
-        elif DIST_TYPE == "LEV":
-            return self.__searchEditDistanceDmLev(target, key, cutOff=0.5)
-        else:
-            return []
+    def searchSubcomponentContaining(self, subcomponents, key="subcomponentList"):
+        """Return the list of component identifiers (in index order) with subcomponents including all of the
+        input subcomponents (list or whitespace separated string).
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            idList = self.__getSubcomponentIndex(key).searchContaining(subcomponents)
+            logger.debug("SearchSubcomponentContaining %r match list for length %d in (%.4f seconds)", subcomponents, len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Subcomponent search failing for %r %r", subcomponents, str(e))
+        return idList
 
-    def __searchEditDistanceJaro(self, target, key, cutOff=0.7):
-        """ """
-        cidList = []
+    def searchSubcomponentSubset(self, subcomponents, key="subcomponentList"):
+        """Return the list of component identifiers (in index order) with subcomponents drawn only from the
+        input subcomponents (list or whitespace separated string).
+        """
+        idList = []
         try:
-            logger.debug("Edit distance index search key %r target %r", key, target)
             startTime = time.time()
-            #
-            idList = []
-            for ccId, d in self.__ccIndx.items():
-                refV = d[key]
-                if isinstance(refV, (list, tuple, set)):
-                    for tt in refV:
-                        ed = jellyfish.jaro_similarity(target.decode("unicode-escape"), tt.decode("unicode-escape"))
-                        if ed > cutOff:
-                            idList.append((ccId, ed))
-                            break
-                else:
-                    ed = jellyfish.jaro_similarity(target.decode("unicode-escape"), refV.decode("unicode-escape"))
-                    if ed > cutOff:
-                        idList.append((ccId, ed))
+            idList = self.__getSubcomponentIndex(key).searchSubset(subcomponents)
+            logger.debug("SearchSubcomponentSubset %r match list for length %d in (%.4f seconds)", subcomponents, len(idList), time.time() - startTime)
+        except Exception as e:
+            logger.exception("Subcomponent subset search failing for %r %r", subcomponents, str(e))
+        return idList
 
-            idList = sorted(idList, key=itemgetter(1), reverse=True)
-            cidList = [c for (c, r) in idList]
-            endTime = time.time()
-            logger.debug("Edit distance result %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
+    def __getSubcomponentIndex(self, key):
+        return self.__entry.getDerived("subcomponent:%s" % key, lambda ccIndx: ChemCompSubcomponentIndex(ccIndx, key))
+
+    ##
+    ##
+
+    def searchMassNearest(self, mass, numResults=10, key="monoisotopicMass"):
+        """Return the list of the numResults component identifiers closest to mass ordered by increasing
+        mass difference.  Masses are the monoisotopic masses computed from typeCounts (key 'monoisotopicMass')
+        or the numeric values of key (e.g. 'formulaWeight').
+        """
+        idList = []
+        try:
+            startTime = time.time()
+            idList = [ccId for ccId, _ in self.__getMassIndex(key).searchNearest(float(mass), int(numResults))]
+            logger.debug("SearchMassNearest %r %r %r match list for length %d in (%.4f seconds)", mass, numResults, key, len(idList), time.time() - startTime)
         except Exception as e:
-            logger.exception("Edit distance search failing for key %r target %r %r", key, target, str(e))
+            logger.exception("Nearest mass search failing for key %r mass %r %r", key, mass, str(e))
         #
-        return cidList
+        return idList
 
-    def __searchEditDistanceJaroWinkler(self, target, key, cutOff=0.7):
-        """ """
-        cidList = []
+    def searchMassPpm(self, mass, ppm=10.0, key="monoisotopicMass"):
+        """Return the list of component identifiers with mass within ppm parts per million of mass
+        ordered by increasing mass difference.
+        """
+        idList = []
         try:
-            logger.debug("Edit distance index search key %r target %r", key, target)
             startTime = time.time()
-            #
-            idList = []
-            for ccId, d in self.__ccIndx.items():
-                refV = d[key]
-                if isinstance(refV, (list, tuple, set)):
-                    for tt in refV:
-                        ed = jellyfish.jaro_winkler_similarity(target, tt)
-                        if ed > cutOff:
-                            idList.append((ccId, ed))
-                            break
-                else:
-                    ed = jellyfish.jaro_winkler_similarity(target, refV)
-                    if ed > cutOff:
-                        idList.append((ccId, ed))
-
-            idList = sorted(idList, key=itemgetter(1), reverse=True)
-            cidList = [c for (c, r) in idList]
-            endTime = time.time()
-            logger.debug("Edit distance result %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
+            idList = [ccId for ccId, _ in self.__getMassIndex(key).searchPpm(float(mass), float(ppm))]
+            logger.debug("SearchMassPpm %r %r %r match list for length %d in (%.4f seconds)", mass, ppm, key, len(idList), time.time() - startTime)
         except Exception as e:
-            logger.exception("Edit distance search failing for key %r target %r %r", key, target, str(e))
+            logger.exception("Mass tolerance search failing for key %r mass %r %r", key, mass, str(e))
         #
-        return cidList
+        return idList
+
+    def getMass(self, ccId, key="monoisotopicMass"):
+        """Return the mass of component ccId used by mass searches over key or None."""
+        return self.__getMassIndex(key).getMass(str(ccId).upper())
 
-    def __searchEditDistanceDmLev(self, target, key, cutOff=0.7):
+    @staticmethod
+    def __parseMassInput(target, defaultValue):
+        """Return (mass, value) from the whitespace separated target 'mass [value]'."""
+        tL = str(target).split()
+        return float(tL[0]), float(tL[1]) if len(tL) > 1 else defaultValue
+
+    def __getMassIndex(self, key):
+        return self.__entry.getDerived("mass:%s" % key, lambda ccIndx: ChemCompMassIndex(ccIndx, key))
+
+    def searchEditDistance(self, target, key, DIST_TYPE="JARO_WINKLER", topK=None):
+        """Return component identifiers with a value of key similar to target ordered by decreasing similarity.
+        DIST_TYPE is one of JARO, JARO_WINKLER or LEV (normalized Damerau-Levenshtein).  With topK only the
+        topK most similar components are returned.
+        """
+        if DIST_TYPE in ["JARO", "JARO_WINKLER"]:
+            return self.__searchEditDistance(target, key, DIST_TYPE, cutOff=0.75, topK=topK)
+        elif DIST_TYPE == "LEV":
+            return self.__searchEditDistance(target, key, DIST_TYPE, cutOff=0.5, topK=topK)
+        else:
+            return []
+
+    def __searchEditDistance(self, target, key, method, cutOff=0.7, topK=None):
         """ """
         cidList = []
         try:
-            logger.debug("Edit distance index search key %r target %r", key, target)
+            logger.debug("Edit distance index search key %r target %r method %r", key, target, method)
             startTime = time.time()
             #
-            idList = []
-            for ccId, d in self.__ccIndx.items():
-                refV = d[key]
-                if isinstance(refV, (list, tuple, set)):
-                    for tt in refV:
-                        ed = self.__editDistanceNormJF(target.decode("unicode-escape"), tt.decode("unicode-escape"))
-                        if ed > cutOff:
-                            idList.append((ccId, ed))
-                            break
-                else:
-                    if self.__editDistanceNormJF(target.decode("unicode-escape"), refV.decode("unicode-escape")) > cutOff:
-                        idList.append((ccId, ed))
-            idList = sorted(idList, key=itemgetter(1), reverse=True)
+            idList = self.__getNameSimilarityIndex(key).search(target, method=method, cutOff=cutOff, topK=topK)
             cidList = [c for (c, r) in idList]
             endTime = time.time()
             logger.debug("Edit distance result %r %r  match list for length %d in (%.4f seconds)", target, key, len(idList), endTime - startTime)
@@ -448,20 +798,8 @@ class ChemCompSearchIndexUtils(object):
         #
         return cidList
 
-    def __editDistanceNormJF(self, s1, s2):
-        """
-        Compute the Normalized Damerau-Levenshtein distance between two given
-        strings (s1 and s2)
-        """
-        try:
-            maxLen = max(len(s1), len(s2))
-            ed = jellyfish.damerau_levenshtein_distance(s1, s2)  # pylint: disable=no-member
-            edN = float(maxLen - ed) / float(maxLen)
-            # logging.debug("s1 %r s2 %r maxLen %r ed %f edN %f " % (s1, s2, maxLen, ed, edN))
-            return edN
-        except Exception as e:
-            logger.exception("Edit distance norm s1 %r s2 %r %r", s1, s2, str(e))
-        return 0
+    def __getNameSimilarityIndex(self, key):
+        return self.__entry.getDerived("similarity:%s" % key, lambda ccIndx: ChemCompNameSimilarityIndex(ccIndx, key))
 
     # def __editDistanceNorm(self, s1, s2):
     #     """
@@ -0,0 +1,102 @@
+##
+# File:  ChemCompSubcomponentIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Subcomponent bitset index over the chemical component search index.
+
+Each subcomponent identifier maps to an integer bitset of the ordinals (index order) of the
+components listing it.  Containment and subset searches are evaluated as bitwise operations.
+
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompSubcomponentIndex(object):
+    """Subcomponent -> component bitsets for a whitespace separated (or list-valued) index key."""
+
+    def __init__(self, ccIndx, key="subcomponentList"):
+        self.__key = key
+        self.__idList = []
+        rowD = {}
+        for ccId, d in ccIndx.items():
+            iRow = len(self.__idList)
+            self.__idList.append(ccId)
+            for subId in self.parseValue(d.get(key)):
+                rowD.setdefault(subId, []).append(iRow)
+        self.__bitsD = {subId: self.__makeBits(rowL) for subId, rowL in rowD.items()}
+        self.__anyBits = self.__makeBits(set(iRow for rowL in rowD.values() for iRow in rowL))
+        logger.debug("Subcomponent index for key %r rows %d subcomponents %d", key, len(self.__idList), len(self.__bitsD))
+
+    @staticmethod
+    def parseValue(value):
+        """Return the set of subcomponent identifiers in a whitespace separated string or list value."""
+        if value is None:
+            return set()
+        vL = value.split() if isinstance(value, str) else value
+        return set(str(v).upper() for v in vL if v not in [None, "?", "."])
+
+    def getKey(self):
+        return self.__key
+
+    def estimate(self, subIdList, containsAll=True):
+        """Return an upper bound on the result length of a containment (containsAll) or subset search."""
+        cL = [self.__countBits(self.__bitsD.get(subId, 0)) for subId in self.__normalize(subIdList)]
+        if not cL:
+            return 0
+        return min(cL) if containsAll else sum(cL)
+
+    def searchContaining(self, subIdList):
+        """Return component identifiers listing all of the input subcomponents."""
+        subIdS = self.__normalize(subIdList)
+        if not subIdS:
+            return []
+        bits = self.__anyBits
+        for subId in subIdS:
+            bits &= self.__bitsD.get(subId, 0)
+            if not bits:
+                break
+        return self.__getIdList(bits)
+
+    def searchSubset(self, subIdList):
+        """Return component identifiers with subcomponents all drawn from the input subcomponents."""
+        subIdS = self.__normalize(subIdList)
+        inBits = 0
+        outBits = 0
+        for subId, bits in self.__bitsD.items():
+            if subId in subIdS:
+                inBits |= bits
+            else:
+                outBits |= bits
+        return self.__getIdList(inBits & ~outBits)
+
+    def __normalize(self, subIdList):
+        if isinstance(subIdList, str):
+            subIdList = [subIdList]
+        return self.parseValue([subId for v in subIdList for subId in str(v).split()])
+
+    def __makeBits(self, rowL):
+        bA = bytearray((len(self.__idList) + 7) // 8)
+        for iRow in rowL:
+            bA[iRow >> 3] |= 1 << (iRow & 7)
+        return int.from_bytes(bytes(bA), "little")
+
+    @staticmethod
+    def __countBits(bits):
+        return bin(bits).count("1")
+
+    def __getIdList(self, bits):
+        # Bit string with the bit of row ii at position ii
+        bS = bin(bits)[:1:-1]
+        idList = []
+        iRow = bS.find("1")
+        while iRow >= 0:
+            idList.append(self.__idList[iRow])
+            iRow = bS.find("1", iRow + 1)
+        return idList
@@ -0,0 +1,90 @@
+##
+# File:  ChemCompTrigramIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  add candidate count estimate
+##
+"""
+Trigram posting list index for substring searches over a string-valued chemical component index field.
+
+Each trigram maps to the sorted array of component rows having a value (or list element)
+containing that trigram.  A substring query intersects the postings for the trigrams of the
+target, smallest first, and verifies the surviving candidates against the stored values.
+
+"""
+
+import bisect
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+
+class ChemCompTrigramIndex(object):
+    """Trigram posting lists over the string values of one index key."""
+
+    gramLength = 3
+
+    def __init__(self, ccIndx, key):
+        self.__key = key
+        self.__idList = []
+        self.__valueList = []
+        self.__postingD = {}
+        #
+        nG = self.gramLength
+        for ccId, d in ccIndx.items():
+            refV = d.get(key)
+            vL = refV if isinstance(refV, (list, tuple, set)) else [refV]
+            vL = [v for v in vL if isinstance(v, str) and v]
+            iRow = len(self.__idList)
+            self.__idList.append(ccId)
+            self.__valueList.append(vL)
+            gS = set()
+            for v in vL:
+                gS.update(v[i : i + nG] for i in range(len(v) - nG + 1))
+            for gram in gS:
+                pL = self.__postingD.get(gram)
+                if pL is None:
+                    pL = self.__postingD[gram] = array("i")
+                pL.append(iRow)
+        logger.debug("Trigram index for key %r rows %d trigrams %d", key, len(self.__idList), len(self.__postingD))
+
+    def getKey(self):
+        return self.__key
+
+    def estimate(self, target):
+        """Return an upper bound on the number of components matching target (the shortest posting list)."""
+        nG = self.gramLength
+        if len(target) < nG:
+            return len(self.__idList)
+        return min(len(self.__postingD.get(target[i : i + nG], ())) for i in range(len(target) - nG + 1))
+
+    def search(self, target):
+        """Return the list of component identifiers with a value (or list element) containing target."""
+        if not target:
+            return [ccId for ccId, vL in zip(self.__idList, self.__valueList) if vL]
+        nG = self.gramLength
+        if len(target) < nG:
+            rowL = range(len(self.__idList))
+        else:
+            gS = set(target[i : i + nG] for i in range(len(target) - nG + 1))
+            pLL = []
+            for gram in gS:
+                pL = self.__postingD.get(gram)
+                if pL is None:
+                    return []
+                pLL.append(pL)
+            pLL.sort(key=len)
+            rowL = pLL[0]
+            for pL in pLL[1:]:
+                rowL = [iRow for iRow in rowL if self.__contains(pL, iRow)]
+                if not rowL:
+                    return []
+        #
+        return [self.__idList[iRow] for iRow in rowL if any(target in v for v in self.__valueList[iRow])]
+
+    @staticmethod
+    def __contains(pL, iRow):
+        i = bisect.bisect_left(pL, iRow)
+        return i < len(pL) and pL[i] == iRow
@@ -0,0 +1,135 @@
+##
+# File:  ChemRefAutoCompleteIndex.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+In-memory autocomplete over the distinct values of the rdbms search columns of a reference database resource.
+
+The database loaders (ChemRefDataDbUtils) write the distinct values of each search column of a resource
+after each completed load.  Search processes hold the values of each column sorted by their case folded
+form, answering prefix completions by bisection and infix completions with a scan of the concatenated
+values.  The values are reloaded when the file written by the loaders changes.
+
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+
+logger = logging.getLogger(__name__)
+
+
+def getAutoCompletePath(siteId, resourceName):
+    """Return the path of the autocomplete value file of database resource resourceName."""
+    return os.path.join(ConfigInfoAppCc(siteId).get_site_cc_dict_path(), "autocomplete-%s.json" % str(resourceName).lower())
+
+
+def getAutoCompleteColumnList(searchTypeDict, resourceName):
+    """Return the unique query columns of the search definitions in searchTypeDict for database resource resourceName."""
+    colList = []
+    for sD in searchTypeDict.values():
+        if sD.get("resourceId") == resourceName:
+            colList.extend(qCol for qCol in sD.get("queryColList", []) if qCol not in colList)
+    return colList
+
+
+def writeAutoCompleteValues(siteId, resourceName, valueD):
+    """Write the dictionary of column -> distinct values for database resource resourceName."""
+    outPath = getAutoCompletePath(siteId, resourceName)
+    try:
+        tmpPath = outPath + ".tmp"
+        with open(tmpPath, "w") as ofh:
+            json.dump({"resourceName": resourceName, "columns": valueD}, ofh)
+        os.replace(tmpPath, outPath)
+        logger.info("Wrote autocomplete values for %r columns %d", resourceName, len(valueD))
+        return True
+    except Exception as e:
+        logger.exception("Failing writing autocomplete values %r %r", outPath, str(e))
+    return False
+
+
+class ChemRefAutoCompleteIndex(object):
+    """Sorted distinct values per column answering prefix (EXACT) and infix (LIKE) completions."""
+
+    __indexD = {}
+    __classLock = threading.Lock()
+
+    def __init__(self, valueD):
+        self.__colD = {}
+        for col, vL in valueD.items():
+            # Distinct on the case folded value as in the default database collation
+            uD = {}
+            for v in vL:
+                if v is not None and str(v).strip():
+                    uD.setdefault(self.__getKey(v), str(v))
+            keyList = sorted(uD)
+            offsetList = []
+            offset = 0
+            for ky in keyList:
+                offsetList.append(offset)
+                offset += len(ky) + 1
+            self.__colD[col] = ([uD[ky] for ky in keyList], keyList, "\n".join(keyList), offsetList)
+        logger.debug("Autocomplete index columns %d", len(self.__colD))
+
+    @classmethod
+    def getIndex(cls, siteId, resourceName):
+        """Return the autocomplete index of database resource resourceName (reloaded when its value file changes) or None."""
+        pth = getAutoCompletePath(siteId, resourceName)
+        try:
+            st = os.stat(pth)
+        except OSError:
+            return None
+        generation = (st.st_mtime_ns, st.st_size)
+        with cls.__classLock:
+            tT = cls.__indexD.get((siteId, resourceName))
+            if tT is not None and tT[0] == generation:
+                return tT[1]
+            try:
+                with open(pth, "r") as ifh:
+                    acIndex = cls(json.load(ifh)["columns"])
+            except Exception as e:
+                logger.exception("Failing reading autocomplete values %r %r", pth, str(e))
+                return None
+            cls.__indexD[(siteId, resourceName)] = (generation, acIndex)
+            return acIndex
+
+    def hasColumn(self, col):
+        return col in self.__colD
+
+    def getColumnList(self):
+        return list(self.__colD.keys())
+
+    def search(self, col, target, compareType="EXACT", maxResults=100):
+        """Return at most maxResults values of column col in sorted order starting with (EXACT) or containing (LIKE) target."""
+        if col not in self.__colD or target is None:
+            return []
+        valueList, keyList, blob, offsetList = self.__colD[col]
+        tKey = self.__getKey(target)
+        rL = []
+        if compareType in ["EXACT", "EQUAL"]:
+            ii = bisect.bisect_left(keyList, tKey)
+            while ii < len(keyList) and keyList[ii].startswith(tKey) and len(rL) < maxResults:
+                rL.append(valueList[ii])
+                ii += 1
+        elif compareType == "LIKE":
+            pos = blob.find(tKey)
+            while pos >= 0 and len(rL) < maxResults:
+                ii = bisect.bisect_right(offsetList, pos) - 1
+                rL.append(valueList[ii])
+                if ii + 1 >= len(offsetList):
+                    break
+                pos = blob.find(tKey, offsetList[ii + 1])
+        else:
+            logger.error("compareType %s unknown", compareType)
+        return rL
+
+    @staticmethod
+    def __getKey(value):
+        return " ".join(str(value).split()).upper()
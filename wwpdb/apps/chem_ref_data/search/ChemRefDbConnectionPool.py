@@ -0,0 +1,191 @@
+##
+# File:  ChemRefDbConnectionPool.py
+# Date:  18-Oct-2026
+#
+# Update:
+#  18-Oct-2026     limit the connections checked out per resource to maxSize (waitTimeout)
+##
+"""
+Process-wide pool of database connections for chemical reference searches keyed by resource identifier
+(e.g. CC, PRD, instance databases).
+
+Connections are borrowed for the duration of a search and returned afterwards.  At most maxSize
+connections per resource are checked out at once - a borrower waits up to waitTimeout seconds for a
+connection to be returned and fails otherwise.  At most maxSize idle connections are retained per
+resource (connections returned to a full pool are closed), idle
+connections are closed after idleTimeout seconds, and a connection idle for more than checkInterval
+seconds is checked with ping() before it is handed out again.  The open transaction of a returned
+connection is rolled back so that a reused connection reads the current database content.
+
+"""
+
+import threading
+import time
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ChemRefDbConnectionPool(object):
+    """Connections per resource identifier with at most maxSize checked out and maxSize idle connections each."""
+
+    __poolD = {}
+    __classLock = threading.Lock()
+
+    def __init__(self, maxSize=4, idleTimeout=300, checkInterval=30, waitTimeout=30):
+        self.__maxSize = max(0, int(maxSize))
+        self.__idleTimeout = float(idleTimeout)
+        self.__checkInterval = float(checkInterval)
+        self.__waitTimeout = float(waitTimeout)
+        self.__lock = threading.Lock()
+        self.__available = threading.Condition(self.__lock)
+        # resourceId -> list of (last used time, connection) with the most recently returned last
+        self.__idleD = {}
+        # resourceId -> number of connections checked out
+        self.__checkedOutD = {}
+        self.__opened = 0
+        self.__reused = 0
+        self.__discarded = 0
+
+    @classmethod
+    def getPool(cls, name, maxSize=4, idleTimeout=300, checkInterval=30, waitTimeout=30):
+        """Return the process-wide pool instance 'name' (created with maxSize, idleTimeout, checkInterval and waitTimeout on first use)."""
+        with cls.__classLock:
+            pool = cls.__poolD.get(name)
+            if pool is None:
+                pool = cls.__poolD[name] = cls(maxSize=maxSize, idleTimeout=idleTimeout, checkInterval=checkInterval, waitTimeout=waitTimeout)
+            return pool
+
+    @classmethod
+    def closeAll(cls):
+        with cls.__classLock:
+            for pool in cls.__poolD.values():
+                pool.clear()
+
+    def isEnabled(self):
+        return self.__maxSize > 0
+
+    def borrow(self, resourceId, connectFunc):
+        """Return an idle connection to resourceId or a new connection from connectFunc() (None on failure).
+
+        When maxSize connections to resourceId are checked out, wait up to waitTimeout seconds for one to be returned.
+        """
+        if not self.__checkOut(resourceId):
+            logger.error("Failing to borrow connection to resource %r - %d connections in use after %.1f seconds", resourceId, self.__maxSize, self.__waitTimeout)
+            return None
+        self.evictIdle()
+        while True:
+            with self.__lock:
+                idleL = self.__idleD.get(resourceId)
+                if not idleL:
+                    break
+                lastUsed, dbCon = idleL.pop()
+            if time.time() - lastUsed < self.__checkInterval or self.__isHealthy(dbCon):
+                with self.__lock:
+                    self.__reused += 1
+                return dbCon
+            self.__close(dbCon)
+        #
+        dbCon = None
+        try:
+            dbCon = connectFunc()
+        except Exception as e:
+            logger.error("Failing to open connection to resource %r %r", resourceId, str(e))
+        with self.__lock:
+            if dbCon is not None:
+                self.__opened += 1
+            else:
+                self.__checkIn(resourceId)
+        return dbCon
+
+    def giveBack(self, resourceId, dbCon, healthy=True):
+        """Return a borrowed connection to the pool.  Connections that are not healthy are closed."""
+        if dbCon is None:
+            return False
+        with self.__lock:
+            self.__checkIn(resourceId)
+        if healthy:
+            try:
+                dbCon.rollback()
+            except Exception as e:
+                logger.debug("Discarding connection to resource %r %r", resourceId, str(e))
+                healthy = False
+        if healthy:
+            with self.__lock:
+                idleL = self.__idleD.setdefault(resourceId, [])
+                if len(idleL) < self.__maxSize:
+                    idleL.append((time.time(), dbCon))
+                    return True
+        self.__close(dbCon)
+        return False
+
+    def evictIdle(self):
+        """Close connections idle for longer than the idle timeout."""
+        closeL = []
+        tNow = time.time()
+        with self.__lock:
+            for resourceId, idleL in self.__idleD.items():
+                keepL = [(lastUsed, dbCon) for lastUsed, dbCon in idleL if tNow - lastUsed < self.__idleTimeout]
+                closeL.extend(dbCon for lastUsed, dbCon in idleL if tNow - lastUsed >= self.__idleTimeout)
+                self.__idleD[resourceId] = keepL
+        for dbCon in closeL:
+            self.__close(dbCon)
+        return len(closeL)
+
+    def clear(self):
+        with self.__lock:
+            closeL = [dbCon for idleL in self.__idleD.values() for _, dbCon in idleL]
+            self.__idleD = {}
+        for dbCon in closeL:
+            self.__close(dbCon)
+
+    def getStats(self):
+        """Return a dictionary of the idle and checked out connection counts per resource and the opened, reused and discarded connection counts."""
+        with self.__lock:
+            return {
+                "idle": {resourceId: len(idleL) for resourceId, idleL in self.__idleD.items()},
+                "checkedOut": dict(self.__checkedOutD),
+                "maxSize": self.__maxSize,
+                "idleTimeout": self.__idleTimeout,
+                "opened": self.__opened,
+                "reused": self.__reused,
+                "discarded": self.__discarded,
+            }
+
+    def __checkOut(self, resourceId):
+        """Count a connection to resourceId as checked out, waiting while maxSize connections are in use (False on timeout)."""
+        if self.__maxSize <= 0:
+            return True
+        tEnd = time.time() + self.__waitTimeout
+        with self.__available:
+            while self.__checkedOutD.get(resourceId, 0) >= self.__maxSize:
+                tLeft = tEnd - time.time()
+                if tLeft <= 0:
+                    return False
+                self.__available.wait(tLeft)
+            self.__checkedOutD[resourceId] = self.__checkedOutD.get(resourceId, 0) + 1
+        return True
+
+    def __checkIn(self, resourceId):
+        """Release a checked out connection slot for resourceId and wake a waiting borrower (the lock must be held)."""
+        numOut = self.__checkedOutD.get(resourceId, 0)
+        if numOut > 0:
+            self.__checkedOutD[resourceId] = numOut - 1
+            self.__available.notify()
+
+    def __isHealthy(self, dbCon):
+        try:
+            dbCon.ping()
+            return True
+        except Exception as e:
+            logger.info("Discarding stale connection %r", str(e))
+        return False
+
+    def __close(self, dbCon):
+        with self.__lock:
+            self.__discarded += 1
+        try:
+            dbCon.close()
+        except Exception as e:
+            logger.debug("Failing closing connection %r", str(e))
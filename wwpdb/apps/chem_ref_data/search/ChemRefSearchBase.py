@@ -6,6 +6,19 @@
 #  25-May-2017 jdw allow compareType to have multiple values in concert with searchType -
 #  26-May-2017 jdw change organization returned search
 #  13-Jun-2017 jdw add left join semantics to sql generator -
+#  18-Oct-2026     answer multi-valued index searches with batch index probes (searchIndexMany)
+#  18-Oct-2026     add INDEX_COMPOSITE multi-criteria index searches
+#  18-Oct-2026     add paged index search results (setPage()) projecting only the rows of the requested page
+#  18-Oct-2026     answer subcomponent searches with bitset containment and subset queries
+#  18-Oct-2026     cache search results keyed by index and database load generation (SITE_CC_SEARCH_CACHE_SIZE/TTL)
+#  18-Oct-2026     add INDEX_MATCH_PREFIX searches
+#  18-Oct-2026     add INDEX_MASS_NEAREST and INDEX_MASS_PPM searches
+#  18-Oct-2026     borrow rdbms connections from a process-wide pool (SITE_CC_DB_POOL_SIZE/IDLE_TIMEOUT/WAIT_TIMEOUT)
+#  18-Oct-2026     fold multi-valued EQUAL rdbms searches into IN-list queries (SITE_CC_DB_IN_LIST_SIZE)
+#  18-Oct-2026     compile rdbms searches once into parameterized statements binding the search targets
+#  18-Oct-2026     page rdbms search results with LIMIT/OFFSET and a separate COUNT, fetch rows in batches
+#  18-Oct-2026     page multi-target rdbms searches other than EQUAL in a single UNION ALL statement
+#  18-Oct-2026     answer autocomplete searches from the in-memory autocomplete index (SITE_CC_AUTOCOMPLETE_MAX_RESULTS)
 #
 ##
 """
@@ -19,14 +32,39 @@ import copy
 #
 import logging
 
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.db.MyConnectionBase import MyConnectionBase
 from wwpdb.apps.chem_ref_data.search.ChemCompSearchIndexUtils import ChemCompSearchIndexUtils
+from wwpdb.apps.chem_ref_data.search.ChemRefAutoCompleteIndex import ChemRefAutoCompleteIndex
+from wwpdb.apps.chem_ref_data.search.ChemRefDbConnectionPool import ChemRefDbConnectionPool
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchResultCache import ChemRefSearchResultCache, getDbLoadGeneration
 from wwpdb.utils.oe_util.build.OeDescriptorUtils import OeDescriptorUtils
 
 logger = logging.getLogger(__name__)
 
 
 class ChemRefSearchBase(MyConnectionBase):
+    # (class name, searchType, compareType, target count, sort column, reverse, query columns selected) -> compiled parameterized rdbms statement
+    __statementD = {}
+    # Rows per rdbms fetch
+    _fetchSize = 500
+    # Index query type -> ChemCompSearchIndexUtils search predicate mode
+    _indexModeDict = {
+        "INDEX_MATCH_EXACT": "EXACT",
+        "INDEX_MATCH_SUBSTRING": "SUBSTRING",
+        "INDEX_MATCH_RANGE_VALUE_PAIR": "RANGE",
+        "INDEX_MATCH_PREFIX": "PREFIX",
+        "INDEX_MATCH_SIMILAR": "SIMILAR",
+        "INDEX_FORMULA_BOUNDED": "FORMULA_BOUNDED",
+        "INDEX_FORMULA_SUBSET": "FORMULA_SUBSET",
+        "INDEX_FORMULA_EXACT": "FORMULA_EXACT",
+        "INDEX_FORMULA_EXACT_SKIPH": "FORMULA_EXACT_SKIPH",
+        "INDEX_SUBCOMPONENT_CONTAINS": "SUBCOMPONENT_CONTAINS",
+        "INDEX_SUBCOMPONENT_SUBSET": "SUBCOMPONENT_SUBSET",
+        "INDEX_MASS_NEAREST": "MASS_NEAREST",
+        "INDEX_MASS_PPM": "MASS_PPM",
+    }
+
     def __init__(self, siteId=None, verbose=False, log=sys.stderr):
         super(ChemRefSearchBase, self).__init__(siteId=siteId, verbose=verbose, log=log)
         self.__verbose = verbose
@@ -46,6 +84,34 @@ class ChemRefSearchBase(MyConnectionBase):
         self.__inputTypeInp = None
         self.__compareTypeInp = None
         #
+        self.__pageOffset = 0
+        self.__pageLimit = None
+        self.__pageSortKey = None
+        self.__pageReverse = False
+        #
+        cI = ConfigInfo(siteId)
+        try:
+            cacheSize = int(cI.get("SITE_CC_SEARCH_CACHE_SIZE", 256))
+            cacheTtl = float(cI.get("SITE_CC_SEARCH_CACHE_TTL", 600))
+        except (TypeError, ValueError):
+            cacheSize, cacheTtl = 256, 600
+        self.__resultCache = ChemRefSearchResultCache.getCache(str(siteId), maxSize=cacheSize, ttl=cacheTtl)
+        try:
+            poolSize = int(cI.get("SITE_CC_DB_POOL_SIZE", 4))
+            poolIdleTimeout = float(cI.get("SITE_CC_DB_POOL_IDLE_TIMEOUT", 300))
+            poolWaitTimeout = float(cI.get("SITE_CC_DB_POOL_WAIT_TIMEOUT", 30))
+        except (TypeError, ValueError):
+            poolSize, poolIdleTimeout, poolWaitTimeout = 4, 300, 30
+        self.__connectionPool = ChemRefDbConnectionPool.getPool(str(siteId), maxSize=poolSize, idleTimeout=poolIdleTimeout, waitTimeout=poolWaitTimeout)
+        try:
+            self.__maxInListSize = max(1, int(cI.get("SITE_CC_DB_IN_LIST_SIZE", 200)))
+        except (TypeError, ValueError):
+            self.__maxInListSize = 200
+        try:
+            self.__maxAutoComplete = max(1, int(cI.get("SITE_CC_AUTOCOMPLETE_MAX_RESULTS", 100)))
+        except (TypeError, ValueError):
+            self.__maxAutoComplete = 100
+        #
 
     def set(self, displayTypeDict, keyDict, searchTypeDict, queryTypeDict):
         self._displayTypeDict = displayTypeDict
@@ -65,6 +131,17 @@ class ChemRefSearchBase(MyConnectionBase):
 
         return True
 
+    def setPage(self, offset=0, limit=None, sortKey=None, reverse=False):
+        """Limit search results to the page of limit rows starting at offset, optionally ordered by
+        sortKey (the index key for index searches and the display column for rdbms searches).
+        The total result count is returned with each result set.
+        """
+        self.__pageOffset = max(0, int(offset or 0))
+        self.__pageLimit = int(limit) if limit not in [None, ""] else None
+        self.__pageSortKey = sortKey if sortKey else None
+        self.__pageReverse = reverse
+        return True
+
     def getSearch(self):
         return self.__queryTypeInp, self.__searchTypeInp, self.__searchTargetInp, self.__searchNameInp, self.__inputTypeInp, self.__compareTypeInp
 
@@ -268,6 +345,14 @@ class ChemRefSearchBase(MyConnectionBase):
 
         return None
 
+    def _getSearchDefIndexQueryType(self, searchType):
+        try:
+            return self._searchTypeDict[searchType].get("indexQueryType")
+        except Exception as e:
+            logger.exception("failing %s", str(e))
+
+        return None
+
     def _getSearchDefResourceId(self, searchType):
         try:
             return self._searchTypeDict[searchType]["resourceId"]
@@ -279,11 +364,23 @@ class ChemRefSearchBase(MyConnectionBase):
     # -------------------------------------------------------------------------------------
     ##
 
+    def __borrowConnection(self, resourceId):
+        """Set the current connection to one borrowed from the connection pool for resourceId -"""
+        self._dbCon = self.__connectionPool.borrow(resourceId, lambda: self.__openResourceConnection(resourceId))
+        return self._dbCon is not None
+
+    def __giveBackConnection(self, resourceId, healthy=True):
+        dbCon, self._dbCon = self._dbCon, None
+        self.__connectionPool.giveBack(resourceId, dbCon, healthy=healthy)
+
+    def __openResourceConnection(self, resourceId):
+        self.setResource(resourceName=resourceId)
+        return self.getConnection() if self.openConnection() else None
+
     def __runAutoCompleteRdbmsQuery(self, searchType, searchTarget, compareType="EXACT"):
         """Return an autocomplete list for the current searchType and searchTarget -"""
         #
         _, qCols, _, _, _, _, _ = self._getSearchDefByType(searchType)
-        rList = []
         rD = {}
         logger.debug("searchTarget %r qCols %r", searchTarget, qCols)
         for qCol in qCols:
@@ -295,7 +392,7 @@ class ChemRefSearchBase(MyConnectionBase):
             else:
                 logger.error("compareType %s unknown", compareType)
                 continue
-            queryConditionString = ' WHERE %s LIKE "%s"  ' % (qCol, tId)
+            queryConditionString = " WHERE %s LIKE %%s  " % qCol
 
             tL = qCol.split(".")
             tName = ".".join(tL[:-1])
@@ -305,16 +402,28 @@ class ChemRefSearchBase(MyConnectionBase):
 
             curs = self.getCursor()
             #
-            logger.debug("SQL Id query: %s", queryString)
+            logger.debug("SQL Id query: %s %r", queryString, tId)
 
-            curs.execute(queryString)
+            curs.execute(queryString, (tId,))
             while True:
                 result = curs.fetchone()
                 if result is not None:
                     rD[str(result[0])] = str(result[0])
                 else:
                     break
-        uList = sorted(rD.keys())
+        return self.__getAutoCompleteList(rD.keys())
+
+    def __runAutoCompleteIndexQuery(self, acIndex, searchType, searchTarget, compareType="EXACT"):
+        """Return an autocomplete list for the current searchType and searchTarget from the in-memory autocomplete index -"""
+        rD = {}
+        for qCol in self._getSearchDefQueryColList(searchType):
+            for v in acIndex.search(qCol, searchTarget, compareType=compareType, maxResults=self.__maxAutoComplete):
+                rD[v] = v
+        return self.__getAutoCompleteList(sorted(rD.keys())[: self.__maxAutoComplete])
+
+    def __getAutoCompleteList(self, valueList):
+        rList = []
+        uList = sorted(valueList)
         # this object packaging was expected by the jQuery plugin
         for ky in uList:
             entry = {}
@@ -326,49 +435,245 @@ class ChemRefSearchBase(MyConnectionBase):
         logger.debug("rList %r myKeys %r", rList, uList)
         return rList, uList
 
-    def __getConditionString(self, qCols, searchTarget, compareType, lOp):
-        qS = ""
-        try:
-            qL = []
-            sOp = " %s " % lOp
-            for qCol in qCols:
+    def __getConditionTemplate(self, qCols, compareType, lOp, numTargets=1):
+        """Return the parameterized query condition for the input columns and comparison type -
+
+        EQUAL comparisons of numTargets > 1 targets are expressed as IN-lists.
+        """
+        qL = []
+        sOp = " %s " % lOp
+        for qCol in qCols:
+            if compareType == "LIKE":
+                qL.append(" ( %s LIKE %%s ) " % qCol)
+            elif compareType in ["EQ", "EQUAL", "EXACT"] and numTargets > 1:
+                qL.append(" ( %s IN (%s) ) " % (qCol, ",".join(["%s"] * numTargets)))
+            elif compareType in ["EQ", "EQUAL", "EXACT"]:
+                qL.append(" ( %s = %%s ) " % qCol)
+            elif compareType == "LT":
+                qL.append(" ( %s <  %%s ) " % qCol)
+            elif compareType == "GT":
+                qL.append(" ( %s >  %%s ) " % qCol)
+            elif compareType == "BETWEEN":
+                qL.append(" ( %s BETWEEN  %%s AND %%s ) " % qCol)
+            else:
+                pass
+        if len(qL) > 1:
+            return " ( " + sOp.join(qL) + " ) "
+        return sOp.join(qL)
+
+    def __getConditionParams(self, qCols, searchTargetList, compareType):
+        """Return the parameter values for the condition template of the input targets or None for invalid targets."""
+        pL = []
+        for _ in qCols:
+            for searchTarget in searchTargetList:
                 if compareType == "LIKE":
-                    pc = "%"
-                    tId = pc + searchTarget + pc
-                    qL.append(' ( %s LIKE "%s" ) ' % (qCol, tId))
-                elif compareType in ["EQ", "EQUAL", "EXACT"]:
-                    qL.append(' ( %s = "%s" ) ' % (qCol, searchTarget))
-                elif compareType == "LT":
-                    qL.append(" ( %s <  %s ) " % (qCol, searchTarget))
-                elif compareType == "GT":
-                    qL.append(" ( %s >  %s ) " % (qCol, searchTarget))
+                    pL.append("%" + searchTarget + "%")
+                elif compareType in ["EQ", "EQUAL", "EXACT", "LT", "GT"]:
+                    pL.append(searchTarget)
                 elif compareType == "BETWEEN":
                     stL = searchTarget.split()
-                    qL.append(" ( %s BETWEEN  %s AND %s ) " % (qCol, stL[0], stL[1]))
-                else:
-                    pass
-            if len(qL) > 1:
-                qS = " ( " + sOp.join(qL) + " ) "
-            else:
-                qS = sOp.join(qL)
-        except Exception as e:
-            logger.exception("failing searchTarget %r compareType %r with %s", searchTarget, compareType, str(e))
+                    if len(stL) < 2:
+                        logger.error("failing searchTarget %r compareType %r", searchTarget, compareType)
+                        return None
+                    pL.extend(stL[:2])
+        return pL
 
-        return qS
+    def __getStatement(self, searchType, compareType, numTargets=1, sortKey=None, reverse=False, selectQueryCols=False):
+        """Return the compiled parameterized statement for the search type, comparison type and target count
+        optionally ordered by the display column sortKey and selecting the query columns after the display columns -
 
-    def __runRdbmsQuery(self, searchType, searchTarget, compareType="LIKE"):
-        """Generate SQL, execute query and return results for the input search type."""
-        _, qCols, lOp, extraConditions, orderByList, displayType, _ = self._getSearchDefByType(searchType)
+        Returns (queryString, display column list, display width list).  Statements are compiled once per process.
+        """
+        ky = (self.__class__.__name__, searchType, compareType, numTargets, sortKey, bool(reverse), bool(selectQueryCols))
+        stmt = ChemRefSearchBase.__statementD.get(ky)
+        if stmt is None:
+            _, qCols, lOp, _, _, displayType, _ = self._getSearchDefByType(searchType)
+            _, _, dList, sList, _ = self._getDisplayAsList(displayType)
+            orderByList = [sList[dList.index(sortKey)]] if sortKey in dList else None
+            qS = self.__getConditionTemplate(qCols, compareType, lOp, numTargets=numTargets)
+            stmt = self.__getRdbmsQueryString(
+                searchType, qS, extraSelectList=qCols if selectQueryCols else None, orderByList=orderByList, orderDirection="DESC" if reverse and orderByList else "ASC"
+            )
+            ChemRefSearchBase.__statementD[ky] = stmt
+            logger.debug("Compiled statement %r: %s", ky, stmt[0])
+        return stmt
+
+    def __runRdbmsQuery(self, searchType, searchTarget, compareType="LIKE", paged=False):
+        """Execute the compiled query for the input search type and target and return the results and the total row count.
+
+        With paged=True only the rows of the current page are fetched (LIMIT/OFFSET) and the total is counted separately.
+        """
+        if not paged or self.__pageLimit is None:
+            queryString, dList, wdList = self.__getStatement(searchType, compareType)
+            params = self.__getConditionParams(self._getSearchDefQueryColList(searchType), [searchTarget], compareType)
+            if params is None:
+                return [], dList, wdList, 0
+            rList = [row for row, _ in self.__fetchRdbmsRows(queryString, dList, params=params)]
+            return rList, dList, wdList, len(rList)
         #
+        queryString, dList, wdList = self.__getStatement(searchType, compareType)
+        params = self.__getConditionParams(self._getSearchDefQueryColList(searchType), [searchTarget], compareType)
+        if params is None:
+            return [], dList, wdList, 0
+        curs = self.getCursor()
+        curs.execute("SELECT COUNT(*) FROM ( %s ) AS crs_count" % queryString, params)
+        totalCount = int(curs.fetchone()[0])
+        curs.close()
+        rList = []
+        if self.__pageOffset < totalCount:
+            # Pages require a stable order - sort keys other than display columns are ignored and
+            # the first display column is used if the search defines no ordering
+            sortKey = self.__pageSortKey if self.__pageSortKey in dList else None
+            if sortKey is None and not self._getSearchDefByType(searchType)[4]:
+                sortKey = dList[0]
+            pageString, _, _ = self.__getStatement(searchType, compareType, sortKey=sortKey, reverse=self.__pageReverse)
+            pageString += " LIMIT %s OFFSET %s"
+            rList = [row for row, _ in self.__fetchRdbmsRows(pageString, dList, params=params + [self.__pageLimit, self.__pageOffset])]
+        return rList, dList, wdList, totalCount
+
+    def __getRowPage(self, rList):
+        """Return the rows of the current page of rList ordered by the display column sortKey if set."""
+        if self.__pageSortKey:
+            sortKey = self.__pageSortKey
+            rList = sorted(rList, key=lambda row: (row.get(sortKey) is None, row.get(sortKey) if row.get(sortKey) is not None else ""), reverse=self.__pageReverse)
+        if self.__pageLimit is None:
+            return rList[self.__pageOffset :]
+        return rList[self.__pageOffset : self.__pageOffset + self.__pageLimit]
+
+    def __runRdbmsQueryMany(self, searchType, searchTargetList, compareType="LIKE"):
+        """Return the results for each target in searchTargetList concatenated in target order -
+
+        EQUAL comparisons of multiple targets are folded into IN-list queries of at most self.__maxInListSize
+        targets.  The query columns are added to the selection to assign each row to the targets it matches.
+        Each row is tagged with its target ('searchTarget').
+
+        Returns the rows of the current page (all rows by default), display column and width lists, and the total row count.
+        Single target searches and other than EQUAL comparisons of multiple targets are paged in the database.
+        """
+        if len(searchTargetList) == 1:
+            rList, dList, wdList, totalCount = self.__runRdbmsQuery(searchType, searchTargetList[0], compareType=compareType, paged=True)
+            for row in rList:
+                row["searchTarget"] = searchTargetList[0]
+            return rList, dList, wdList, totalCount
+        if compareType not in ["EQ", "EQUAL", "EXACT"] and self.__pageLimit is not None:
+            return self.__runRdbmsUnionQuery(searchType, searchTargetList, compareType)
+        if compareType not in ["EQ", "EQUAL", "EXACT"]:
+            rList = []
+            dList = wdList = []
+            for searchTarget in searchTargetList:
+                trList, dList, wdList, _ = self.__runRdbmsQuery(searchType, searchTarget, compareType=compareType)
+                for row in trList:
+                    row["searchTarget"] = searchTarget
+                rList.extend(trList)
+            return self.__getRowPage(rList), dList, wdList, len(rList)
         #
-        qS = self.__getConditionString(qCols, searchTarget, compareType, lOp)
+        _, qCols, lOp, _, _, _, _ = self._getSearchDefByType(searchType)
+        targetD = {}
+        for searchTarget in searchTargetList:
+            targetD.setdefault(self.__getCompareKey(searchTarget), []).append(searchTarget)
+        uTargetList = list(dict.fromkeys(searchTargetList))
+        hitD = {searchTarget: [] for searchTarget in uTargetList}
+        seenD = {searchTarget: set() for searchTarget in uTargetList}
+        dList = wdList = []
+        for ii in range(0, len(uTargetList), self.__maxInListSize):
+            tL = uTargetList[ii : ii + self.__maxInListSize]
+            queryString, dList, wdList = self.__getStatement(searchType, compareType, numTargets=len(tL), selectQueryCols=True)
+            params = self.__getConditionParams(qCols, tL, compareType)
+            for row, qValueList in self.__fetchRdbmsRows(queryString, dList, numExtra=len(qCols), params=params):
+                kL = [self.__getCompareKey(v) for v in qValueList]
+                matchS = set(kL) if lOp.upper() != "AND" else (set(kL[:1]) if len(set(kL)) == 1 else set())
+                rowKey = tuple(row[col] for col in dList)
+                for ky in matchS:
+                    for searchTarget in targetD.get(ky, []):
+                        if rowKey not in seenD[searchTarget]:
+                            seenD[searchTarget].add(rowKey)
+                            tRow = dict(row)
+                            tRow["searchTarget"] = searchTarget
+                            hitD[searchTarget].append(tRow)
+        logger.info("IN-list search %r targets %d chunks %d", searchType, len(uTargetList), (len(uTargetList) + self.__maxInListSize - 1) // self.__maxInListSize)
+        rList = []
+        for searchTarget in searchTargetList:
+            rList.extend(hitD[searchTarget])
+        return self.__getRowPage(rList), dList, wdList, len(rList)
+
+    def __runRdbmsUnionQuery(self, searchType, searchTargetList, compareType):
+        """Return the rows of the current page of the concatenated results of each target in searchTargetList,
+        the display column and width lists, and the total row count -
+
+        The queries of the targets are combined in a UNION ALL statement tagging each row with its target
+        position, so that the total is counted and the page is ordered and limited in the database.
+        """
+        qCols = self._getSearchDefQueryColList(searchType)
+        tL = []
+        params = []
+        for searchTarget in searchTargetList:
+            pL = self.__getConditionParams(qCols, [searchTarget], compareType)
+            if pL is not None:
+                tL.append(searchTarget)
+                params.extend(pL)
+        _, dList, wdList = self.__getStatement(searchType, compareType)
+        if not tL:
+            return [], dList, wdList, 0
+        unionString, orderString = self.__getUnionStatement(searchType, compareType, len(tL), self.__pageSortKey, self.__pageReverse)
+        curs = self.getCursor()
+        curs.execute("SELECT COUNT(*) FROM ( %s ) AS crs_count" % unionString, params)
+        totalCount = int(curs.fetchone()[0])
+        curs.close()
+        rList = []
+        if self.__pageOffset < totalCount:
+            pageString = unionString + orderString + " LIMIT %s OFFSET %s"
+            for row, extraList in self.__fetchRdbmsRows(pageString, dList, numExtra=1, params=params + [self.__pageLimit, self.__pageOffset]):
+                row["searchTarget"] = tL[int(extraList[0])]
+                rList.append(row)
+        return rList, dList, wdList, totalCount
+
+    def __getUnionStatement(self, searchType, compareType, numTargets, sortKey=None, reverse=False):
+        """Return the compiled UNION ALL statement of numTargets single target queries and its ORDER BY clause -
+
+        Rows are ordered by the display column sortKey and target position or, by default, by target position and
+        the search definition ordering (the first display column if the search defines no ordering).
+        """
+        ky = (self.__class__.__name__, searchType, compareType, numTargets, sortKey, bool(reverse), "UNION")
+        stmt = ChemRefSearchBase.__statementD.get(ky)
+        if stmt is None:
+            _, qCols, lOp, _, defOrderByList, displayType, _ = self._getSearchDefByType(searchType)
+            _, _, dList, sList, _ = self._getDisplayAsList(displayType)
+            qS = self.__getConditionTemplate(qCols, compareType, lOp)
+            memberList = []
+            for ii in range(numTargets):
+                queryString, _, _ = self.__getRdbmsQueryString(searchType, qS, extraSelectList=["%d AS crs_target" % ii], orderByList=[], useDefaultOrder=False)
+                memberList.append("( %s )" % queryString)
+            # Union results are ordered by column position - the target position follows the display columns
+            tPos = len(sList) + 1
+            if sortKey in dList:
+                orderString = " ORDER BY %d %s, %d ASC" % (dList.index(sortKey) + 1, "DESC" if reverse else "ASC", tPos)
+            else:
+                posList = [sList.index(col) + 1 for col in defOrderByList if col in sList] or [1]
+                orderString = " ORDER BY %d ASC, " % tPos + ", ".join(["%d ASC" % pos for pos in posList])
+            stmt = ChemRefSearchBase.__statementD[ky] = (" UNION ALL ".join(memberList), orderString)
+            logger.debug("Compiled statement %r: %s", ky, stmt[0] + stmt[1])
+        return stmt
+
+    @staticmethod
+    def __getCompareKey(value):
+        # MySQL default collations compare case insensitive ignoring trailing spaces
+        return str(value).rstrip().upper() if value is not None else None
+
+    def __getRdbmsQueryString(self, searchType, queryConditionString, extraSelectList=None, orderByList=None, orderDirection="ASC", useDefaultOrder=True):
+        """Return the SQL query for the input search type and condition, the display column and width lists -
+
+        The search definition ordering is used unless orderByList is provided or useDefaultOrder is False.
+        """
+        _, _, _, extraConditions, defOrderByList, displayType, _ = self._getSearchDefByType(searchType)
+        orderByList = orderByList if orderByList or not useDefaultOrder else defOrderByList
         #
-        queryConditionString = qS
         if extraConditions is not None and (len(extraConditions) > 0):
-            queryConditionString += " AND " + extraConditions
+            # Literal percent signs are escaped in parameterized statements
+            queryConditionString += " AND " + extraConditions.replace("%", "%%")
 
         tList, _cList, dList, sList, wdList = self._getDisplayAsList(displayType)
         tList = list(set(tList))
+        sList = list(sList) + list(extraSelectList or [])
         #
         logger.info("Table list %r", tList)
         #
@@ -417,51 +722,56 @@ class ChemRefSearchBase(MyConnectionBase):
             queryString = "SELECT DISTINCT " + ",".join(sList) + " FROM " + ",".join(tList) + " WHERE ( " + queryConditionString + joinConditionString + " )"
 
         if orderByList is not None and len(orderByList) > 0:
-            queryString += " ORDER BY " + ",".join(orderByList) + " ASC "
+            queryString += " ORDER BY " + ",".join(orderByList) + " %s " % orderDirection
 
+        return queryString, dList, wdList
+
+    def __fetchRdbmsRows(self, queryString, dList, numExtra=0, params=None):
+        """Execute queryString binding params and return the list of (row dictionary, list of numExtra trailing column values) -"""
         curs = self.getCursor()
         #
-        logger.info("SQL query: %s", queryString)
+        logger.info("SQL query: %s %r", queryString, params)
         rList = []
-        curs.execute(queryString)
+        nD = len(dList)
+        curs.execute(queryString, params)
         while True:
-            result = curs.fetchone()
-            if result is not None:
+            resultList = curs.fetchmany(self._fetchSize)
+            if not resultList:
+                break
+            for result in resultList:
                 entry = {}
                 for ii, col in enumerate(dList):
                     entry[col] = result[ii]
-                rList.append(entry)
-            else:
-                break
+                rList.append((entry, list(result[nD : nD + numExtra])))
+        curs.close()
         if self.__debug:
-            logger.debug("rList %r", rList)
             logger.debug("rList length %r", len(rList))
             logger.debug("dList %r", dList)
 
-        return rList, dList, wdList
+        return rList
 
     ###
-    def __runIndexQuery(self, queryType, searchType, searchTarget):
-        """
+    def __runIndexQuery(self, queryType, searchType, searchTarget, ccsi):
+        """Return the list of matching component identifiers and the comparison description -
+
         'INDEX_MATCH_SUBSTRING': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
         'INDEX_MATCH_EXACT': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
+        'INDEX_MATCH_PREFIX': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
         'INDEX_FORMULA_SUBSET': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
         'INDEX_FORMULA_EXACT': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
         'INDEX_FORMULA_EXACT_SKIPH': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
         'INDEX_FORMULA_BOUNDED': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
+        'INDEX_MASS_NEAREST': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
+        'INDEX_MASS_PPM': {'autocomplete': False, 'service': 'index', 'class': 'entity'},
 
         """
         #
-        _, qCols, _, _, _, displayType, _ = self._getSearchDefByType(searchType)
-
-        _tList, cList, dList, _sList, wdList = self._getDisplayAsList(displayType)
+        qCols = self._getSearchDefQueryColList(searchType)
         #
         logger.debug("qCols %r", qCols)
         logger.debug("queryType %r", queryType)
         logger.debug("searchTarget %r", searchTarget)
 
-        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-
         if queryType.startswith("INDEX_FORMULA_"):
             idList = []
             tf, eD = ccsi.parseFormulaInput(searchTarget)
@@ -492,6 +802,10 @@ class ChemRefSearchBase(MyConnectionBase):
                     logger.debug("Searching field %r target range %r", qCol, searchTarget)
                     tidList = ccsi.searchIndexRange(searchTarget, qCol)
                     searchCompOp = "Range match"
+                elif queryType == "INDEX_MATCH_PREFIX":
+                    logger.debug("Searching field %r target prefix %r", qCol, searchTarget)
+                    tidList = ccsi.searchIndexPrefix(searchTarget, qCol)
+                    searchCompOp = "Prefix match"
                 elif queryType == "INDEX_MATCH_SIMILAR":
                     logger.debug("Searching similar field %r target %r", qCol, searchTarget)
                     tidList = ccsi.searchEditDistance(searchTarget, qCol)
@@ -499,16 +813,102 @@ class ChemRefSearchBase(MyConnectionBase):
                 else:
                     logger.info("Unsupported index matching search")
                 idList.extend(tidList)
+        elif queryType.startswith("INDEX_MASS_"):
+            # Targets 'mass [count]' or 'mass [ppm]'
+            idList = []
+            searchCompOp = "Nearest mass" if queryType == "INDEX_MASS_NEAREST" else "Mass within ppm"
+            try:
+                tL = str(searchTarget).split()
+                if queryType == "INDEX_MASS_NEAREST":
+                    idList = ccsi.searchMassNearest(float(tL[0]), int(float(tL[1])) if len(tL) > 1 else 10, qCols[0])
+                else:
+                    idList = ccsi.searchMassPpm(float(tL[0]), float(tL[1]) if len(tL) > 1 else 10.0, qCols[0])
+            except (IndexError, ValueError):
+                logger.info("Unsupported mass search target %r", searchTarget)
+        elif queryType == "INDEX_COMPOSITE":
+            idList = ccsi.searchComposite(self.__getCompositePredicateList(searchTarget))
+            searchCompOp = "Composite match"
         else:
             idList = []
             searchCompOp = "unknown"
             logger.info("Unsupported index search")
 
         logger.debug("idList length %r", len(idList))
-        logger.debug("cList %r", cList)
-        rList = ccsi.getAttributeValueList(idList, cList, dList)
         #
-        return rList, dList, wdList, searchCompOp
+        return idList, searchCompOp
+
+    def __runIndexQueryMany(self, queryType, searchType, searchTargetList, ccsi):
+        """Run the index query for each target in searchTargetList returning the result rows of the current
+        page (all rows by default) of the concatenated hits in target order, and the total hit count.
+        INDEX_MATCH_* query types are answered with batch index searches.
+        """
+        _, qCols, _, _, _, displayType, _ = self._getSearchDefByType(searchType)
+        _tList, cList, dList, _sList, wdList = self._getDisplayAsList(displayType)
+        #
+        idList = []
+        sqType = self._getSearchDefIndexQueryType(searchType)
+        if sqType and sqType.startswith("INDEX_SUBCOMPONENT_"):
+            # All targets together form the subcomponent set of the query
+            if sqType == "INDEX_SUBCOMPONENT_CONTAINS":
+                idList = ccsi.searchSubcomponentContaining(searchTargetList, qCols[0])
+            else:
+                idList = ccsi.searchSubcomponentSubset(searchTargetList, qCols[0])
+        elif not queryType.startswith("INDEX_MATCH_") or queryType not in self._indexModeDict:
+            for searchTarget in searchTargetList:
+                tidList, _ = self.__runIndexQuery(queryType, searchType, searchTarget, ccsi)
+                idList.extend(tidList)
+        else:
+            colHitD = {}
+            for qCol in qCols:
+                colHitD[qCol] = ccsi.searchIndexMany(searchTargetList, qCol, mode=self._indexModeDict[queryType])
+            for searchTarget in searchTargetList:
+                for qCol in qCols:
+                    idList.extend(colHitD[qCol].get(searchTarget, []))
+        logger.debug("Index search %r targets %d idList length %r", queryType, len(searchTargetList), len(idList))
+        logger.debug("cList %r", cList)
+        # Display column sort keys (bootstrap table sort field) are mapped to index keys
+        sortKey = cList[dList.index(self.__pageSortKey)] if self.__pageSortKey in dList else self.__pageSortKey
+        totalCount, rList = ccsi.getAttributeValuePage(idList, cList, dList, offset=self.__pageOffset, limit=self.__pageLimit, sortKey=sortKey, reverse=self.__pageReverse)
+        return rList, dList, wdList, totalCount
+
+    def __getCompositePredicateList(self, searchTarget):
+        """Return the composite search predicates (mode, key, target) for an input target of the form -
+
+        CCDIDX_FORMULA_BOUNDED: C10 N5 O13 P3 ; CCDIDX_SIMILAR_NAME: adenosine triphosphate
+
+        Each clause names a CCDIDX search type having an index query type and its target value.
+        """
+        pL = []
+        for clause in str(searchTarget).split(";"):
+            if not clause.strip():
+                continue
+            sType, _, value = clause.partition(":")
+            sType = sType.strip()
+            value = self.__standardizedSearchTarget(value.strip(), sType)
+            mode = self._indexModeDict.get(self._getSearchDefIndexQueryType(sType))
+            if mode is None or not value:
+                logger.info("Skipping unsupported composite search clause %r", clause)
+                continue
+            qCols = self._getSearchDefQueryColList(sType)
+            pL.append((mode, qCols[0] if qCols and not mode.startswith("FORMULA_") else None, value))
+        logger.debug("Composite predicate list %r", pL)
+        return pL
+
+    def __getResultCacheKey(self, searchServiceType, queryType, searchType, compareType, searchTargetList, ccsi):
+        """Return the result cache key for the search including the generation of the data searched.
+
+        None is returned for database searches when the load generation of the resource is unknown.
+        """
+        if searchServiceType == "index":
+            generation = ccsi.getGeneration()
+        else:
+            generation = getDbLoadGeneration(self.__siteId, self._getSearchDefResourceId(searchType))
+            if generation is None:
+                # Without a load stamp a reload could not be detected - such results are not cached
+                return None
+        pageT = (self.__pageOffset, self.__pageLimit, self.__pageSortKey, bool(self.__pageReverse))
+        targetT = tuple(str(t).strip() for t in searchTargetList)
+        return (searchServiceType, queryType, searchType, compareType, targetT, pageT, generation)
 
     def __standardizedSearchTarget(self, searchTargetInp, searchType):
         searchTargetOut = searchTargetInp
@@ -545,7 +945,7 @@ class ChemRefSearchBase(MyConnectionBase):
             logger.debug("compareTypeInp              = %s", compareType)
             logger.debug("searchNameInp               = %s", searchName)
         #
-        if inputType == "MULTI_VALUE_WS":
+        if inputType == "MULTI_VALUE_WS" and queryType != "INDEX_COMPOSITE":
             searchTargetList = str(searchTarget).split()
         else:
             searchTargetList = [searchTarget]
@@ -556,6 +956,7 @@ class ChemRefSearchBase(MyConnectionBase):
             compareTypeList = compareTypeList * len(searchTypeList)
 
         searchServiceType = self._getQueryServiceType(queryType)
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh) if searchServiceType == "index" else None
         count = 0
         sD = {}
         #
@@ -565,27 +966,36 @@ class ChemRefSearchBase(MyConnectionBase):
             sD[rId] = {}
             # ----
             rList = []
-            stdSearchTargetList = []
-            trList = []
             cList = []
             wdList = []
-            for sTargInp in searchTargetList:
-                sTarg = self.__standardizedSearchTarget(sTargInp, sType)
-                stdSearchTargetList.append(sTarg)
-                if searchServiceType == "rdbms":
-                    resourceId = self._getSearchDefResourceId(sType)
-                    self.setResource(resourceName=resourceId)
-                    ok = self.openConnection()
-                    if ok:
-                        trList, cList, wdList = self.__runRdbmsQuery(sType, sTarg, compareType=cType)
-                    self.closeConnection()
-                elif searchServiceType == "index":
-                    trList, cList, wdList, _ = self.__runIndexQuery(queryType, sType, sTarg)
+            totalCount = None
+            stdSearchTargetList = [self.__standardizedSearchTarget(sTargInp, sType) for sTargInp in searchTargetList]
+            cacheKey = self.__getResultCacheKey(searchServiceType, queryType, sType, cType, stdSearchTargetList, ccsi)
+            cachedT = self.__resultCache.get(cacheKey) if cacheKey is not None else None
+            cacheable = cachedT is None and cacheKey is not None
+            if cachedT is not None:
+                rList, cList, wdList, totalCount = cachedT
+                logger.debug("Using cached result for %r length %d", cacheKey, len(rList))
+            elif searchServiceType == "rdbms":
+                resourceId = self._getSearchDefResourceId(sType)
+                if self.__borrowConnection(resourceId):
+                    healthy = False
+                    try:
+                        rList, cList, wdList, totalCount = self.__runRdbmsQueryMany(sType, stdSearchTargetList, compareType=cType)
+                        healthy = True
+                    finally:
+                        self.__giveBackConnection(resourceId, healthy=healthy)
                 else:
-                    trList = []
-                    cList = []
-                    wdList = []
-                rList.extend(trList)
+                    cacheable = False
+            elif searchServiceType == "index":
+                # All targets are answered in a single batch of index probes
+                rList, cList, wdList, totalCount = self.__runIndexQueryMany(queryType, sType, stdSearchTargetList, ccsi)
+            if totalCount is None:
+                totalCount = len(rList)
+            if cacheable:
+                self.__resultCache.set(cacheKey, (rList, cList, wdList, totalCount))
+            # Copies returned so that callers may modify result rows
+            rList, cList, wdList = [dict(row) for row in rList], list(cList), list(wdList)
             #
             if cType in ["EQ", "EXACT", "EQUAL"]:
                 cTypeD = "equal to"
@@ -602,7 +1012,7 @@ class ChemRefSearchBase(MyConnectionBase):
             else:
                 searchNameD = searchName
             #
-            displayTitle = "Results for: %s <i>%s</i> <span class='stdSearchTargetList'>%s</span> &nbsp;&nbsp; (%d)" % (searchNameD, cTypeD, ",".join(stdSearchTargetList), len(rList))
+            displayTitle = "Results for: %s <i>%s</i> <span class='stdSearchTargetList'>%s</span> &nbsp;&nbsp; (%d)" % (searchNameD, cTypeD, ",".join(stdSearchTargetList), totalCount)
             # oL = []
             sD[rId]["resultlist"] = rList
             sD[rId]["columnList"] = cList
@@ -610,7 +1020,9 @@ class ChemRefSearchBase(MyConnectionBase):
             sD[rId]["searchType"] = sType
             sD[rId]["compareType"] = cType
             sD[rId]["displayTitle"] = displayTitle
-            count += len(rList)
+            sD[rId]["totalCount"] = totalCount
+            sD[rId]["offset"] = self.__pageOffset
+            count += totalCount
             rId += 1
 
         # JDW  = legacy searchOp returned for now as compareType
@@ -660,17 +1072,27 @@ class ChemRefSearchBase(MyConnectionBase):
             uList = []
             for sType, cType in zip(searchTypeList, compareTypeList):
                 resourceId = self._getSearchDefResourceId(sType)
-                self.setResource(resourceName=resourceId)
                 if self.__verbose:
                     logger.debug("Query target                   = %s", searchTarget)
                     logger.debug("Query type                     = %s", sType)
                     logger.debug("Query resource id              = %s", resourceId)
 
-                self.openConnection()
-                trList, tuList = self.__runAutoCompleteRdbmsQuery(sType, sTarget, cType)
-                rList.extend(trList)
-                uList.extend(tuList)
-                self.closeConnection()
+                acIndex = ChemRefAutoCompleteIndex.getIndex(self.__siteId, resourceId)
+                if acIndex is not None and all(acIndex.hasColumn(qCol) for qCol in self._getSearchDefQueryColList(sType)):
+                    trList, tuList = self.__runAutoCompleteIndexQuery(acIndex, sType, sTarget, cType)
+                    rList.extend(trList)
+                    uList.extend(tuList)
+                    continue
+                if not self.__borrowConnection(resourceId):
+                    continue
+                healthy = False
+                try:
+                    trList, tuList = self.__runAutoCompleteRdbmsQuery(sType, sTarget, cType)
+                    rList.extend(trList)
+                    uList.extend(tuList)
+                    healthy = True
+                finally:
+                    self.__giveBackConnection(resourceId, healthy=healthy)
         else:
             pass
         uList = list(set(uList))
@@ -4,6 +4,10 @@
 #
 # Update:
 #  13-Jun-2017 jdw add left join semantics to query definitions
+#  18-Oct-2026     add INDEX_COMPOSITE query type, CCDIDX_COMPOSITE search and the index query type of CCDIDX searches
+#  18-Oct-2026     add INDEX_SUBCOMPONENT_CONTAINS and INDEX_SUBCOMPONENT_SUBSET query types
+#  18-Oct-2026     add INDEX_MATCH_PREFIX query type and CCDIDX_INCHIKEY_PREFIX search
+#  18-Oct-2026     add INDEX_MASS_NEAREST and INDEX_MASS_PPM query types and nearest mass searches
 ##
 """
 Chemical reference search definition data  -
@@ -22,10 +26,16 @@ class ChemRefSearchDef(object):
         "INDEX_MATCH_EXACT": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_MATCH_RANGE_VALUE_PAIR": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_MATCH_SIMILAR": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_MATCH_PREFIX": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_FORMULA_SUBSET": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_FORMULA_EXACT": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_FORMULA_EXACT_SKIPH": {"autocomplete": False, "service": "index", "class": "entity"},
         "INDEX_FORMULA_BOUNDED": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_MASS_NEAREST": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_MASS_PPM": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_SUBCOMPONENT_CONTAINS": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_SUBCOMPONENT_SUBSET": {"autocomplete": False, "service": "index", "class": "entity"},
+        "INDEX_COMPOSITE": {"autocomplete": False, "service": "index", "class": "entity"},
         "RANGE_VALUE_PAIR": {"autocomplete": False, "service": "rdbms", "class": "entity"},
     }
     _displayTypeDict = {
@@ -457,6 +467,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_FORMULA_BOUNDED",
         },
         "CCDIDX_FORMULA_SUBSET": {
             "queryColList": ["formula"],
@@ -466,6 +477,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_FORMULA_SUBSET",
         },
         "CCDIDX_FORMULA_HEAVY_ATOM_EXACT": {
             "queryColList": ["formula"],
@@ -475,6 +487,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_FORMULA_EXACT_SKIPH",
         },
         "CCDIDX_FORMULA_EXACT": {
             "queryColList": ["formula"],
@@ -484,6 +497,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_FORMULA_EXACT",
         },
         "CCDIDX_FORMULA_WEIGHT_RANGE": {
             "queryColList": ["formulaWeight"],
@@ -493,6 +507,37 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_RANGE_VALUE_PAIR",
+        },
+        "CCDIDX_FORMULA_WEIGHT_NEAREST": {
+            "queryColList": ["formulaWeight"],
+            "logicalOp": "AND",
+            "extraConditions": "",
+            "orderByList": [],
+            "resourceId": None,
+            "displayType": "ccdIndexResults",
+            "displayTitle": "",
+            "indexQueryType": "INDEX_MASS_NEAREST",
+        },
+        "CCDIDX_MONOISOTOPIC_MASS_NEAREST": {
+            "queryColList": ["monoisotopicMass"],
+            "logicalOp": "AND",
+            "extraConditions": "",
+            "orderByList": [],
+            "resourceId": None,
+            "displayType": "ccdIndexResults",
+            "displayTitle": "",
+            "indexQueryType": "INDEX_MASS_NEAREST",
+        },
+        "CCDIDX_MONOISOTOPIC_MASS_PPM": {
+            "queryColList": ["monoisotopicMass"],
+            "logicalOp": "AND",
+            "extraConditions": "",
+            "orderByList": [],
+            "resourceId": None,
+            "displayType": "ccdIndexResults",
+            "displayTitle": "",
+            "indexQueryType": "INDEX_MASS_PPM",
         },
         "CCDIDX_INCHI": {
             "queryColList": ["InChI"],
@@ -502,6 +547,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_EXACT",
         },
         "CCDIDX_INCHIKEY": {
             "queryColList": ["InChIKey"],
@@ -511,6 +557,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_EXACT",
         },
         "CCDIDX_INCHIKEY14": {
             "queryColList": ["InChIKey14"],
@@ -520,6 +567,17 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_EXACT",
+        },
+        "CCDIDX_INCHIKEY_PREFIX": {
+            "queryColList": ["InChIKey"],
+            "logicalOp": "AND",
+            "extraConditions": "",
+            "orderByList": [],
+            "resourceId": None,
+            "displayType": "ccdIndexResults",
+            "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_PREFIX",
         },
         "CCDIDX_SUBCOMPONENTS": {
             "queryColList": ["subcomponentList"],
@@ -529,6 +587,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_SUBCOMPONENT_CONTAINS",
         },
         "CCDIDX_SUBCOMPONENT_SUBSET": {
             "queryColList": ["subcomponentList"],
@@ -538,6 +597,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_SUBCOMPONENT_SUBSET",
         },
         "CCDIDX_SMILES": {
             "queryColList": ["smilesList"],
@@ -547,6 +607,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_EXACT",
         },
         "CCDIDX_SMILES_STEREO": {
             "queryColList": ["smilesList"],
@@ -557,6 +618,7 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_EXACT",
         },
         "CCDIDX_SIMILAR_NAME": {
             "queryColList": ["nameList"],
@@ -566,5 +628,15 @@ class ChemRefSearchDef(object):
             "resourceId": None,
             "displayType": "ccdIndexResults",
             "displayTitle": "",
+            "indexQueryType": "INDEX_MATCH_SIMILAR",
+        },
+        "CCDIDX_COMPOSITE": {
+            "queryColList": [],
+            "logicalOp": "AND",
+            "extraConditions": "",
+            "orderByList": [],
+            "resourceId": None,
+            "displayType": "ccdIndexResults",
+            "displayTitle": "",
         },
     }
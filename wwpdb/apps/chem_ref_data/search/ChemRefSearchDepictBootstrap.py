@@ -4,6 +4,7 @@
 #
 # Updates:
 #    28-Apr-2017  Replace server generated tables wioth BootstrapTable rendering -
+#    18-Oct-2026  Add server side pagination of result tables (pageUrl) and doBsTablePage()
 #
 ##
 """
@@ -178,14 +179,19 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
         tableId="chemref-bst-result-table-1",
         divId="chemref-bst-result-div-1",
         pFunc="pagerFunc",
+        pageUrl=None,
     ):
         """
         Create table template for BootstrapTable parameters --
 
         colNameTupList = [(colkey,colDisplayName), ... ]
         pagerFunc = <name of JS pager method >
+        pageUrl = <URL of the result page service for server side pagination>
 
         """
+        serverH = ""
+        if pageUrl:
+            serverH = '\n           data-side-pagination="server"\n           data-url="%s"' % pageUrl.replace("&", "&amp;").replace('"', "&quot;")
         tableH = """<div id="%s" class="row">
            <table id="%s" data-classes="table  table-bordered table-condensed table-striped"
            data-sort-name="my_data_count"
@@ -201,11 +207,12 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
            data-show-export="true"
            data-export-types="['csv','excel']"
            data-show-refresh="true"
-           data-striped="true"
+           data-striped="true"%s
                      data-show-toggle="true">""" % (
             divId,
             tableId,
             pFunc,
+            serverH,
         )
         # omit
         #            data-height="600"
@@ -223,8 +230,11 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
 
         return oL
 
-    def doBsTableRenderCollapsable(self, d=None, searchName="Search results", compareType=None, searchTarget=None):
-        """Render in collapsable section using Bootstrap table style --"""
+    def doBsTableRenderCollapsable(self, d=None, searchName="Search results", compareType=None, searchTarget=None, pageUrl=None):
+        """Render in collapsable section using Bootstrap table style --
+
+        With pageUrl the result tables are paged server side from pageUrl and hold only the current page.
+        """
         oL = []
         if d is None:
             d = {}
@@ -243,13 +253,13 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
         logger.info("myTitle is %r", myTitle)
         tableDataD = {}
         try:
-            tableDataD = self.doBsTableRenderResults(d, title=panelTitle)
+            tableDataD = self.doBsTableRenderResults(d, title=panelTitle, pageUrl=pageUrl)
         except Exception as e:
             logger.exception("Failing %s", str(e))
 
         return tableDataD
 
-    def doBsTableRenderResults(self, d=None, title="Search Results Summary"):
+    def doBsTableRenderResults(self, d=None, title="Search Results Summary", pageUrl=None):
         """ """
         if d is None:
             d = {}
@@ -276,13 +286,19 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
             tD["resultSetContainerId"] = "chemref-bst-result-div-%s" % idSuffix
             tD["resultSetTableId"] = "chemref-bst-result-table-%s" % idSuffix
             #
+            tPageUrl = "%s&resultSetId=%d" % (pageUrl, resultSetId) if pageUrl else None
             oL.extend(
-                self.__bootstrapTableTemplate(colNameTupList, rD["columnWidthList"], title=t, tableId=tD["resultSetTableId"], divId=tD["resultSetContainerId"], pFunc="pagerFunc")
+                self.__bootstrapTableTemplate(
+                    colNameTupList, rD["columnWidthList"], title=t, tableId=tD["resultSetTableId"], divId=tD["resultSetContainerId"], pFunc="pagerFunc", pageUrl=tPageUrl
+                )
             )
             #
             rD = self.__filterResultSet(rD)
             tD["resultSetTableData"] = rD["resultlist"]
             tD["resultSetId"] = resultSetId
+            tD["resultSetTotal"] = rD.get("totalCount", len(rD["resultlist"]))
+            if tPageUrl:
+                tD["resultSetPageUrl"] = tPageUrl
             #
             # rD['resultlist']  [{rowdict},{rowdict},...]
             # rD['columnList']  display column = col key
@@ -294,6 +310,16 @@ class ChemRefSearchDepictBootstrap(ChemRefDataDepictBootstrap):
 
         return tableDataD
 
+    def doBsTablePage(self, d=None, resultSetId=1):
+        """Return the rows of a result set page in the bootstrap table server side pagination format -
+
+        {'total': <result set count>, 'rows': [{rowdict}, ...]}
+        """
+        if d is None or resultSetId not in d.get("resultDictionary", {}):
+            return {"total": 0, "rows": []}
+        rD = self.__filterResultSet(d["resultDictionary"][resultSetId])
+        return {"total": rD.get("totalCount", len(rD["resultlist"])), "rows": rD["resultlist"]}
+
     def doAltRenderResults(self, d=None, title="Search Results Summary"):
         """Render in HTML"""
         #
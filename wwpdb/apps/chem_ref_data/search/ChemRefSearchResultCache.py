@@ -0,0 +1,124 @@
+##
+# File:  ChemRefSearchResultCache.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Process-wide LRU cache of chemical reference search results.
+
+Results are keyed by the search parameters and the generation of the data searched -
+the load generation of the chemical component index (see ChemCompIndexCache) for index
+searches and the database load stamp for rdbms searches.  Entries for a prior generation
+are never matched again and age out of the cache.  Entries also expire after a fixed
+time to live so that database loads that do not update the load stamp are picked up.
+
+The database load stamp is a file touched by the database loaders (ChemRefDataDbUtils)
+after each completed load of a resource.
+
+"""
+
+import os
+import threading
+import time
+
+import logging
+from collections import OrderedDict
+
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+
+logger = logging.getLogger(__name__)
+
+
+def getDbLoadStampPath(siteId, resourceName):
+    """Return the path of the load stamp file of database resource resourceName."""
+    return os.path.join(ConfigInfoAppCc(siteId).get_site_cc_dict_path(), "db-load-%s.stamp" % str(resourceName).lower())
+
+
+def touchDbLoadStamp(siteId, resourceName):
+    """Record a completed load of database resource resourceName."""
+    try:
+        pth = getDbLoadStampPath(siteId, resourceName)
+        with open(pth, "w") as ofh:
+            ofh.write("%s\n" % time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()))
+        return True
+    except Exception as e:
+        logger.warning("Failing to update load stamp for resource %r %r", resourceName, str(e))
+    return False
+
+
+def getDbLoadGeneration(siteId, resourceName):
+    """Return the current load stamp (modification time, size) of database resource resourceName or None."""
+    try:
+        st = os.stat(getDbLoadStampPath(siteId, resourceName))
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class ChemRefSearchResultCache(object):
+    """LRU cache of search results with maxSize entries and an entry time to live of ttl seconds."""
+
+    __cacheD = {}
+    __classLock = threading.Lock()
+
+    def __init__(self, maxSize=256, ttl=600):
+        self.__maxSize = max(0, int(maxSize))
+        self.__ttl = float(ttl)
+        self.__lock = threading.Lock()
+        self.__cD = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @classmethod
+    def getCache(cls, name, maxSize=256, ttl=600):
+        """Return the process-wide cache instance 'name'  (created with maxSize and ttl on first use)."""
+        with cls.__classLock:
+            cache = cls.__cacheD.get(name)
+            if cache is None:
+                cache = cls.__cacheD[name] = cls(maxSize=maxSize, ttl=ttl)
+            return cache
+
+    @classmethod
+    def clearAll(cls):
+        with cls.__classLock:
+            for cache in cls.__cacheD.values():
+                cache.clear()
+
+    def isEnabled(self):
+        return self.__maxSize > 0 and self.__ttl > 0
+
+    def get(self, key):
+        """Return the value cached for key or None if absent or expired."""
+        if not self.isEnabled():
+            return None
+        with self.__lock:
+            tV = self.__cD.get(key)
+            if tV is not None and time.time() - tV[0] < self.__ttl:
+                self.__cD.move_to_end(key)
+                self.__hits += 1
+                return tV[1]
+            if tV is not None:
+                del self.__cD[key]
+            self.__misses += 1
+        return None
+
+    def set(self, key, value):
+        if not self.isEnabled():
+            return False
+        with self.__lock:
+            self.__cD[key] = (time.time(), value)
+            self.__cD.move_to_end(key)
+            while len(self.__cD) > self.__maxSize:
+                self.__cD.popitem(last=False)
+        return True
+
+    def clear(self):
+        with self.__lock:
+            self.__cD.clear()
+
+    def getStats(self):
+        """Return a dictionary of the cache size, hit and miss counts."""
+        with self.__lock:
+            return {"size": len(self.__cD), "maxSize": self.__maxSize, "ttl": self.__ttl, "hits": self.__hits, "misses": self.__misses}
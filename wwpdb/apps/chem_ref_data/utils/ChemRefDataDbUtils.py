@@ -7,6 +7,8 @@
 # 14-Aug-2013  jdw misc updates
 # 11-Nov-2014  jdw add multiprocessing loader for chemical component data -
 #  1-Feb-2017  jdw change base class
+# 18-Oct-2026      touch the database load stamp after each load (search result cache invalidation)
+# 18-Oct-2026      write the distinct search column values after each load (in-memory autocomplete)
 #
 """
 Wrapper for utilities for database loading of chemical reference data content from
@@ -56,6 +58,9 @@ from mmcif.io.IoAdapterCore import IoAdapterCore
 from wwpdb.utils.db.MyConnectionBase import MyConnectionBase
 
 from wwpdb.apps.chem_ref_data.utils.OSVersion import OSVersion
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchResultCache import touchDbLoadStamp
+from wwpdb.apps.chem_ref_data.search.ChemRefAutoCompleteIndex import getAutoCompleteColumnList, writeAutoCompleteValues
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchDef import ChemRefSearchDef
 
 logger = logging.getLogger(__name__)
 
@@ -159,8 +164,11 @@ class ChemRefDataDbUtils(MyConnectionBase):
                     schemaDefObj=sd, ioObj=self.__ioObj, dbCon=self._dbCon, workPath=self.__sessionPath, cleanUp=False, warnings="error", verbose=self.__verbose, log=self.__lfh
                 )
                 ok = sdl.load(containerList=containerList, loadType="batch-file", deleteOpt="truncate")
+                if ok:
+                    self.__makeAutoCompleteValues("PRD")
 
                 self.closeConnection()
+                touchDbLoadStamp(self.__siteId, "PRD")
             else:
                 if self.__verbose:
                     logger.info("+ChemRefDataLoad(loadBird) database connection failed")
@@ -206,7 +214,10 @@ class ChemRefDataDbUtils(MyConnectionBase):
                     schemaDefObj=sd, ioObj=self.__ioObj, dbCon=self._dbCon, workPath=self.__sessionPath, cleanUp=False, warnings="error", verbose=self.__verbose, log=self.__lfh
                 )
                 ok = sdl.load(containerList=containerList, loadType="batch-file", deleteOpt="truncate")
+                if ok:
+                    self.__makeAutoCompleteValues("CC")
                 self.closeConnection()
+                touchDbLoadStamp(self.__siteId, "CC")
             else:
                 if self.__verbose:
                     logger.info("+ChemRefDataDbUtils(loadChemComp) database connection failed")
@@ -220,6 +231,24 @@ class ChemRefDataDbUtils(MyConnectionBase):
         logger.info("+ChemRefDataDbUtils(loadChemComp) Completed at %s (%.4f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
         return ok
 
+    def __makeAutoCompleteValues(self, resourceName):
+        """Write the distinct values of the search columns of resourceName for in-memory autocomplete searches."""
+        try:
+            myQ = MyDbQuery(dbcon=self._dbCon, verbose=self.__verbose, log=self.__lfh)
+            valueD = {}
+            for qCol in getAutoCompleteColumnList(ChemRefSearchDef._searchTypeDict, resourceName):
+                tName = ".".join(qCol.split(".")[:-1])
+                rowList = myQ.selectRows(queryString="SELECT DISTINCT %s FROM %s" % (qCol, tName))
+                if rowList is None:
+                    # Searches on this column continue to autocomplete from the database
+                    logger.warning("Failing reading autocomplete values for %r", qCol)
+                    continue
+                valueD[qCol] = [str(row[0]) for row in rowList if row[0] is not None]
+            return writeAutoCompleteValues(self.__siteId, resourceName, valueD)
+        except Exception as e:
+            logger.exception("Failing writing autocomplete values for %r %r", resourceName, str(e))
+        return False
+
     def __schemaCreate(self, schemaDefObj):
         """Create and load table schema using schema definition"""
         startTime = time.time()
@@ -360,7 +389,10 @@ class ChemRefDataDbUtils(MyConnectionBase):
             )
 
             ok = sdl.loadBatchFiles(loadList=tList, containerNameList=None, deleteOpt=None)
+            if ok:
+                self.__makeAutoCompleteValues("CC")
             self.closeConnection()
+            touchDbLoadStamp(self.__siteId, "CC")
 
             # --------------------------------------------------
             endTime2 = time.time()
@@ -5,6 +5,10 @@
 # Updated:
 #  18-Mar-2016  jdw adjust mode on data products to g+rw
 #  18-Mar-2016  jdw add extra newline between concatenated components
+#  18-Oct-2026      write the memory-mapped column store alongside the chemical component index
+#  18-Oct-2026      add publishChemCompIndexSharedMemory()
+#  18-Oct-2026      add updateChemCompPySupportFilesIncremental() for lists of added, changed and removed components
+#  18-Oct-2026      write index column statistics alongside the column store
 #
 """
 Wrapper for utilities for creating and maintaining various resource files containing
@@ -25,7 +29,9 @@ import time
 import scandir
 import filecmp
 import fnmatch
+import glob
 import logging
+import pickle
 
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
@@ -44,6 +50,10 @@ from wwpdb.io.file.DataFile import DataFile
 from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictUtil import PdbxChemCompDictUtil
 from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
 
+from wwpdb.apps.chem_ref_data.io.ChemCompIndexColumnStore import ChemCompIndexColumnStore, ChemCompIndexColumnWriter, getColumnStorePath
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexStats import ChemCompIndexStats, getStatsPath
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexSharedMemory import ChemCompIndexSharedMemory
+
 logger = logging.getLogger(__name__)
 
 
@@ -254,6 +264,9 @@ class ChemRefDataMiscUtils(object):
                 dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
                 dIndx.makeIndex(storePath=self.__pathCCDb, indexPath=self.__pathCCIndex)
                 _pD, _cD = dIndx.makeParentComponentIndex(storePath=self.__pathCCDb, indexPath=self.__pathCCParentIndex)
+                self.__makeIndexColumnStore()
+                if str(self.__cI.get("SITE_CC_INDEX_SHARED_MEMORY", "")).lower() in ["1", "y", "yes", "true"]:
+                    self.publishChemCompIndexSharedMemory()
                 ok = True
             else:
                 ok = False
@@ -265,6 +278,157 @@ class ChemRefDataMiscUtils(object):
         logger.info("Completed at %s (%d seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
         return ok
 
+    def updateChemCompPySupportFilesIncremental(self, addedIdList=None, changedIdList=None, removedIdList=None):
+        """Update the BSD DB, index and parent index pickle files for the input lists of added, changed and removed
+        chemical component identifiers only.  Index entries are derived from the current definition files in the
+        CVS sandbox.  Components removed from the dictionary are dropped from the index files but are retained in
+        the BSD DB until the next full update.  Performs a full update if there is no current index.
+        """
+        if not os.access(self.__pathCCIndex, os.R_OK) or not os.access(self.__pathCCParentIndex, os.R_OK):
+            logger.info("No current index - performing a full update")
+            return self.updateChemCompPySupportFiles()
+        ok = False
+        startTime = time.time()
+        tmpStorePath = self.__makeTempPath(self.__pathCCDb) + "-incr"
+        try:
+            removedS = set(ccId.upper() for ccId in removedIdList or [])
+            pathList = []
+            cc = PdbxChemCompIo(verbose=self.__verbose, log=self.__lfh)
+            cc.setCachePath(self.__cIConfigInfoCc.get_site_cc_cvs_path())
+            for ccId in list(addedIdList or []) + list(changedIdList or []):
+                if ccId.upper() in removedS:
+                    continue
+                if cc.setCompId(ccId):
+                    pathList.append(cc.getFilePath())
+                else:
+                    logger.info("No definition file for %r - removing from index", ccId)
+                    removedS.add(ccId.upper())
+            logger.info("Incremental update of %d definitions and %d removals", len(pathList), len(removedS))
+            #
+            dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
+            updD = {}
+            updParentD, updChildD = {}, {}
+            if pathList:
+                dU = PdbxChemCompDictUtil(verbose=self.__verbose, log=self.__lfh)
+                if not dU.makeStoreFromPathList(pathList, storePath=tmpStorePath):
+                    logger.error("Failing to create store for updated definitions")
+                    return False
+                updD = dIndx.makeIndex(storePath=tmpStorePath, indexPath=tmpStorePath + ".pic")
+                updParentD, updChildD = dIndx.makeParentComponentIndex(storePath=tmpStorePath, indexPath=tmpStorePath + "-parent.pic")
+                if len(updD) < len(pathList):
+                    logger.error("Failing to index updated definitions (%d of %d)", len(updD), len(pathList))
+                    return False
+                # The index must not list definitions missing from the store
+                if not dU.updateStoreByFile(pathList=pathList, storePath=self.__pathCCDb):
+                    logger.error("Failing to update store %r - index files are unchanged", self.__pathCCDb)
+                    return False
+            #
+            ccIndx = dIndx.readIndex(indexPath=self.__pathCCIndex)
+            parentD, childD = dIndx.readParentComponentIndex(indexPath=self.__pathCCParentIndex)
+            ccIndx, parentD, childD = self.__mergeIndex(ccIndx, parentD, childD, updD, updParentD, updChildD, removedS)
+            #
+            ok = self.__writePickleAtomic([ccIndx], self.__pathCCIndex) and self.__writePickleAtomic([parentD, childD], self.__pathCCParentIndex)
+            if ok:
+                self.__makeIndexColumnStore()
+                if str(self.__cI.get("SITE_CC_INDEX_SHARED_MEMORY", "")).lower() in ["1", "y", "yes", "true"]:
+                    self.publishChemCompIndexSharedMemory()
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("In updateChemCompPySupportFilesIncremental")
+            ok = False
+        finally:
+            for pth in glob.glob(tmpStorePath + "*"):
+                os.remove(pth)
+
+        endTime = time.time()
+        logger.info("Completed at %s (%.2f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
+        return ok
+
+    @staticmethod
+    def __mergeIndex(ccIndx, parentD, childD, updD, updParentD, updChildD, removedS):
+        """Return the index and parent/child indices with the entries of removed and updated components replaced
+        by the updated entries.  Index order is preserved and added components are appended.
+        """
+        dropS = set(removedS) | set(updD)
+        newIndx = {}
+        for ccId, d in ccIndx.items():
+            if ccId in updD:
+                newIndx[ccId] = updD[ccId]
+            elif ccId not in dropS:
+                newIndx[ccId] = d
+        for ccId, d in updD.items():
+            if ccId not in newIndx:
+                newIndx[ccId] = d
+        #
+        newChildD = {ccId: pL for ccId, pL in childD.items() if ccId not in dropS}
+        newChildD.update(updChildD)
+        newParentD = {}
+        for pId, cL in parentD.items():
+            tL = [ccId for ccId in cL if ccId not in dropS]
+            if tL:
+                newParentD[pId] = tL
+        for pId, cL in updParentD.items():
+            newParentD.setdefault(pId, []).extend(cL)
+        return newIndx, newParentD, newChildD
+
+    def __writePickleAtomic(self, objList, outPath):
+        """Write the input objects to the pickle file outPath (protocol 2 as PdbxChemCompDictIndex) replacing it atomically."""
+        outPathTmp = self.__makeTempPath(outPath)
+        try:
+            with open(outPathTmp, "wb") as ofh:
+                for obj in objList:
+                    pickle.dump(obj, ofh, 2)
+            self.__atomicRename(outPathTmp, outPath)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Failing writing %r", outPath)
+            if os.path.exists(outPathTmp):
+                os.remove(outPathTmp)
+        return False
+
+    def __makeIndexColumnStore(self):
+        """Write the memory-mapped column store companion of the chemical component index file."""
+        ok = False
+        try:
+            dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
+            ccIndx = dIndx.readIndex(indexPath=self.__pathCCIndex)
+            colPath = getColumnStorePath(self.__pathCCIndex)
+            outPathTmp = self.__makeTempPath(colPath)
+            ok = ChemCompIndexColumnWriter(verbose=self.__verbose, log=self.__lfh).write(ccIndx, outPathTmp)
+            if ok:
+                self.__atomicRename(outPathTmp, colPath)
+                self.__makeIndexStats(colPath)
+            elif os.path.exists(outPathTmp):
+                os.remove(outPathTmp)
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("In __makeIndexColumnStore")
+            ok = False
+        return ok
+
+    def __makeIndexStats(self, colPath):
+        """Write the column statistics companion of the chemical component index file."""
+        ok = False
+        try:
+            store = ChemCompIndexColumnStore(colPath)
+            statsD = ChemCompIndexStats(verbose=self.__verbose, log=self.__lfh).build(store)
+            store.close()
+            statsPath = getStatsPath(self.__pathCCIndex)
+            outPathTmp = self.__makeTempPath(statsPath)
+            ok = ChemCompIndexStats(verbose=self.__verbose, log=self.__lfh).write(statsD, outPathTmp)
+            if ok:
+                self.__atomicRename(outPathTmp, statsPath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("In __makeIndexStats")
+            ok = False
+        return ok
+
+    def publishChemCompIndexSharedMemory(self):
+        """Publish the current chemical component index in shared memory for the search services on this host."""
+        if not ChemCompIndexSharedMemory.isSupported():
+            logger.info("Shared memory is not supported by this Python version")
+            return False
+        generation = ChemCompIndexSharedMemory(self.__pathCCIndex, verbose=self.__verbose, log=self.__lfh).publish()
+        return generation is not None
+
     def __getPathList(self, topPath, pattern="*", excludeDirs=None, recurse=True):
         """Return a list of file paths in the input topPath which satisfy the input search criteria.
 
@@ -20,6 +20,8 @@
 #  *-Feb-2013 jdw Much refactoring for Bootstrap framework.
 # 20-Feb-2013 jdw Use common WebRequest module.
 # 23-May-2017 jdw Overhaul - strip all old methods
+# 18-Oct-2026     pass the optional result page (offset, limit, sort, order) to index searches
+# 18-Oct-2026     add server side paged search results (sidePagination=server) and /service/chemref/search/page
 #
 ##
 """
@@ -46,6 +48,8 @@ import shutil
 import types
 import ntpath
 
+from urllib.parse import urlencode
+
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 from wwpdb.utils.session.WebRequest import InputRequest, ResponseContent
 
@@ -179,6 +183,8 @@ class ChemRefDataWebAppWorker(object):
 
         #
         self.__siteId = self.__reqObj.getValue("WWPDB_SITE_ID")
+        # Rows per page of server side paged search results (the result table data-page-size)
+        self.__defaultPageSize = 20
         self.__cI = ConfigInfo(self.__siteId)
         # self.__cICommon = ConfigInfoAppCommon(self.__siteId)
         self.__crPI = ChemRefPathInfo(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
@@ -195,6 +201,7 @@ class ChemRefDataWebAppWorker(object):
             # -------------------
             "/service/chemref/search": "_chemRefFullSearchOp",
             "/service/chemref/search/autocomplete": "_chemRefFullSearchAutoCompeteOp",
+            "/service/chemref/search/page": "_chemRefSearchPageOp",
             # -------------------
             "/service/chemref/newsession": "_newSessionOp",
             # '/service/chemref/getsessioninfo':                    '_getSessionInfoOp',
@@ -706,15 +713,24 @@ class ChemRefDataWebAppWorker(object):
         #
         searchTypeInput = self.__reqObj.getValue("searchType")
         searchType, queryType, inputType, compareType = self.__getSearchType(searchTypeInput)
+        # Optional result page - (bootstrap table server side pagination parameters)
+        pageOffset = self.__reqObj.getValue("offset")
+        pageLimit = self.__reqObj.getValue("limit")
+        pageSortKey = self.__reqObj.getValue("sort")
+        pageReverse = self.__reqObj.getValue("order") == "desc"
+        # With sidePagination=server only the first page of each result set is returned and further pages are
+        # requested from /service/chemref/search/page
+        serverPaging = self.__reqObj.getValue("sidePagination") == "server"
+        if serverPaging and not pageLimit.isdigit():
+            pageLimit = str(self.__defaultPageSize)
         #
         logger.info(
             "searchType %r queryType %r searchTarget %r inputType %r compareType %r appsHtdocsPath %r", searchType, queryType, searchTarget, inputType, compareType, appsHtdocsPath
         )
-        # enable comma-separated lists or hyphen-separated ranges in search box
-        if searchType.startswith("CCD_CC_ID") or searchType.startswith("BIRD_PRD_ID"):
-            searchTarget = searchTarget.replace(",", " ")
-        elif searchType == "CCD_FORMULA_WEIGHT" or searchType == "CCDIDX_FORMULA_WEIGHT_RANGE":
-            searchTarget = searchTarget.replace("-", " ")
+        pageUrl = None
+        if serverPaging:
+            pageUrl = "/service/chemref/search/page?" + urlencode({"searchType": searchTypeInput, "searchTarget": searchTarget, "searchName": searchName})
+        searchTarget = self.__getSearchTarget(searchType, searchTarget)
         #
         self.__getSession()
         self.__reqObj.setReturnFormat(return_format="json")
@@ -725,6 +741,8 @@ class ChemRefDataWebAppWorker(object):
         try:
             crs = ChemRefSearch(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
             crs.setSearch(queryType, searchType, searchTarget, searchName, inputType, compareType)
+            if pageOffset.isdigit() or pageLimit.isdigit():
+                crs.setPage(offset=int(pageOffset) if pageOffset.isdigit() else 0, limit=int(pageLimit) if pageLimit.isdigit() else None, sortKey=pageSortKey, reverse=pageReverse)
             rD = crs.doSearch()
         except Exception as e:
             logger.exception("Failing with %r", str(e))
@@ -737,7 +755,7 @@ class ChemRefDataWebAppWorker(object):
                 logger.debug("Rendering bootstrap table style with object length %r", len(rD))
                 includePath = os.path.join(appsHtdocsPath, "includes")
                 crsdp = ChemRefSearchDepictBootstrap(includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                tableDataD = crsdp.doBsTableRenderCollapsable(rD, searchName=searchName)
+                tableDataD = crsdp.doBsTableRenderCollapsable(rD, searchName=searchName, pageUrl=pageUrl)
                 if len(tableDataD) > 0:
                     # Handle the JSON conversion under the hood -
                     # rC.set('resultSetTableData', json.dumps(tableDataD))
@@ -765,6 +783,61 @@ class ChemRefDataWebAppWorker(object):
 
         return rC
 
+    def _chemRefSearchPageOp(self):
+        """Return a page of one result set of a full search in the bootstrap table server side pagination
+        format {'total': <count>, 'rows': [...]}.
+
+        Request parameters are those of the full search, resultSetId (default 1) and the bootstrap table
+        pagination parameters offset, limit, sort and order.
+        """
+        self.__reqObj.setReturnFormat(return_format="jsonData")
+        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        searchTarget = self.__reqObj.getValue("searchTarget")
+        searchName = self.__reqObj.getValue("searchName")
+        searchTypeInput = self.__reqObj.getValue("searchType")
+        resultSetId = self.__reqObj.getValue("resultSetId")
+        pageOffset = self.__reqObj.getValue("offset")
+        pageLimit = self.__reqObj.getValue("limit")
+        pageSortKey = self.__reqObj.getValue("sort")
+        pageReverse = self.__reqObj.getValue("order") == "desc"
+        searchType, queryType, inputType, compareType = self.__getSearchType(searchTypeInput)
+        logger.info("searchType %r queryType %r searchTarget %r resultSetId %r offset %r limit %r", searchType, queryType, searchTarget, resultSetId, pageOffset, pageLimit)
+        #
+        pD = {"total": 0, "rows": []}
+        try:
+            searchTarget = self.__getSearchTarget(searchType, searchTarget)
+            # Search only the search type of the requested result set
+            iSet = int(resultSetId) if resultSetId.isdigit() else 1
+            searchTypeList = searchType.split(",")
+            compareTypeList = compareType.split(",")
+            if len(compareTypeList) < len(searchTypeList):
+                compareTypeList = compareTypeList * len(searchTypeList)
+            crs = ChemRefSearch(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            crs.setSearch(queryType, searchTypeList[iSet - 1], searchTarget, searchName, inputType, compareTypeList[iSet - 1])
+            crs.setPage(
+                offset=int(pageOffset) if pageOffset.isdigit() else 0,
+                limit=int(pageLimit) if pageLimit.isdigit() else self.__defaultPageSize,
+                sortKey=pageSortKey,
+                reverse=pageReverse,
+            )
+            rD = crs.doSearch()
+            if len(rD) > 0:
+                crsdp = ChemRefSearchDepictBootstrap(verbose=self.__verbose, log=self.__lfh)
+                pD = crsdp.doBsTablePage(rD, resultSetId=1)
+        except Exception as e:
+            logger.exception("Failing with %r", str(e))
+
+        rC.setData(pD)
+        return rC
+
+    def __getSearchTarget(self, searchType, searchTarget):
+        """Return the search target with comma-separated lists or hyphen-separated ranges in the search box as whitespace separated values."""
+        if searchType.startswith("CCD_CC_ID") or searchType.startswith("BIRD_PRD_ID"):
+            return searchTarget.replace(",", " ")
+        elif searchType == "CCD_FORMULA_WEIGHT" or searchType == "CCDIDX_FORMULA_WEIGHT_RANGE":
+            return searchTarget.replace("-", " ")
+        return searchTarget
+
     def __makeIdListReportResponse(self, idCodeList):
         """Prepare response for a report request for the input Id code list."""
         self.__getSession()
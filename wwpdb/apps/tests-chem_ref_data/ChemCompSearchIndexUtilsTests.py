@@ -6,7 +6,8 @@
 # Version: 0.001
 #
 # Updates:
-#
+#   18-Oct-2026  add tests of the index cache, column store, shared memory, scan pool and the batch, composite,
+#                formula, subcomponent, prefix, mass and statistics index searches
 ##
 """
 Test cases for ChemCompSearchIndexUtils demonstrating formula searchs.
@@ -22,7 +23,11 @@ import sys
 import unittest
 import time
 import os
+import shutil
 import logging
+from unittest import mock
+
+import jellyfish
 
 if __package__ is None or __package__ == "":
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -35,6 +40,15 @@ from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
 from wwpdb.utils.config.ConfigInfo import ConfigInfo, getSiteId
 from wwpdb.apps.chem_ref_data.utils.ChemRefDataMiscUtils import ChemRefDataMiscUtils
 from wwpdb.utils.session.WebRequest import InputRequest
+from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
+from wwpdb.apps.chem_ref_data.io.ChemCompIndexColumnStore import ChemCompIndexColumnStore, ChemCompIndexColumnWriter, getColumnStorePath
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexCache import ChemCompIndexCache
+from wwpdb.apps.chem_ref_data.search.ChemCompNameSimilarityIndex import ChemCompNameSimilarityIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexSharedMemory import ChemCompIndexSharedMemory
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexScanPool import ChemCompIndexScanPool
+from wwpdb.apps.chem_ref_data.search.ChemCompSubcomponentIndex import ChemCompSubcomponentIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompFormulaIndex import ChemCompFormulaIndex
+from wwpdb.apps.chem_ref_data.search.ChemCompIndexStats import ChemCompIndexStats, getStatsPath
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger()
@@ -90,6 +104,20 @@ class ChemCompSearchIndexUtilsTests(unittest.TestCase):
         endTime = time.time()
         logger.info("Completed at %s (%.3f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
 
+    def testIndexSearchNumericRange(self):
+        """Test case -  numeric range search boundaries (lower inclusive, upper exclusive)"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        ky = "formulaWeight"
+        fw = float(ccsi.getValue("ATP", ky))
+        self.assertIn("ATP", ccsi.searchIndexNumericRange(fw, fw + 0.001, ky))
+        self.assertNotIn("ATP", ccsi.searchIndexNumericRange(fw - 1.0, fw, ky))
+        rL = ccsi.searchIndexNumericRange(0.0, 1.0e6, ky)
+        self.assertEqual(len(rL), len(set(rL)))
+        self.assertEqual(sorted(rL), sorted(ccsi.searchIndexRange("0 1000000", ky)))
+
     def testIndexSearchAll(self):
         if not os.path.exists(self.__cc_index):
             self.testCreateIndex()
@@ -106,6 +134,344 @@ class ChemCompSearchIndexUtilsTests(unittest.TestCase):
         endTime = time.time()
         logger.info("Completed at %s (%.3f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
 
+    def testIndexSearchMany(self):
+        """Test case -  batch search of multiple targets"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        ky = "InChIKey"
+        targetL = [ccsi.getValue(ccId, ky) for ccId in ["ATP", "HOH", "CCC"]] + ["NOT-AN-INCHIKEY"]
+        targetL.append(targetL[0])
+        rD = ccsi.searchIndexMany(targetL, ky, mode="EXACT")
+        self.assertEqual(len(rD), len(set(targetL)))
+        for target in targetL:
+            self.assertEqual(rD[target], ccsi.searchIndex(target, ky))
+        self.assertIn("ATP", rD[targetL[0]])
+        #
+        rD = ccsi.searchIndexMany(["ADENOSINE", "WATER"], "name", mode="SUBSTRING")
+        self.assertEqual(rD["WATER"], ccsi.searchIndexSubstring("WATER", "name"))
+        rD = ccsi.searchIndexMany(["100 200", "500 600"], "formulaWeight", mode="RANGE")
+        self.assertEqual(rD["500 600"], ccsi.searchIndexRange("500 600", "formulaWeight"))
+
+    def testCompositeSearch(self):
+        """Test case -  multi-criteria search"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        pL = [("SIMILAR", "nameList", "ADENOSINE TRIPHOSPHATE"), ("RANGE", "formulaWeight", "500 510"), ("FORMULA_BOUNDED", None, "C10 H16 N5 O13 P3")]
+        idList = ccsi.searchComposite(pL)
+        logger.info("Composite search result %r", idList)
+        self.assertIn("ATP", idList)
+        tS = set(ccsi.searchEditDistance(pL[0][2], pL[0][1]))
+        tS &= set(ccsi.searchIndexRange(pL[1][2], pL[1][1]))
+        tS &= set(ccsi.searchFormulaBounded(elementCounts=ccsi.parseFormulaInput(pL[2][2])[1]))
+        self.assertEqual(set(idList), tS)
+        #
+        self.assertEqual(ccsi.searchComposite([("EXACT", "InChIKey", ccsi.getValue("ATP", "InChIKey")), ("SUBSTRING", "name", "WATER")]), [])
+        self.assertEqual(ccsi.searchComposite([("EXACT", "InChIKey", ccsi.getValue("HOH", "InChIKey")), ("FORMULA_EXACT", None, "H2 O")]), ["HOH"])
+        # Large candidate sets are filtered by an index scan when scan processes are configured
+        pL = [("RANGE", "formulaWeight", "0 100000"), ("SIMILAR", "nameList", "ADENOSINE TRIPHOSPHATE")]
+        idList = ccsi.searchComposite(pL)
+        self.assertIn("ATP", idList)
+        ccsi._ChemCompSearchIndexUtils__scanProcs = 2
+        self.assertEqual(ccsi.searchComposite(pL), idList)
+        self.assertTrue(ChemCompIndexCache.getEntry(self.__cc_index).hasDerived("scanPool:2"))
+        ChemCompIndexCache.getEntry(self.__cc_index).getDerived("scanPool:2", None).close()
+
+    def testIndexScan(self):
+        """Test case -  sharded index scans in worker processes"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        ccIndx = ChemCompIndexCache.getEntry(self.__cc_index).getIndex()
+        pool = ChemCompIndexScanPool(ccIndx, numProc=2, minShardRows=1)
+        try:
+            logger.info("Scan pool parallel %r shards %d", pool.isParallel(), pool.getShardCount())
+            self.assertTrue(pool.getShardCount() > 1)
+            self.assertEqual(pool.scan(("SUBSTRING", "name", "PHOSPHATE")), ccsi.searchIndexSubstring("PHOSPHATE", "name"))
+            self.assertEqual(sorted(pool.scan(("RANGE", "formulaWeight", "100 600"))), sorted(ccsi.searchIndexRange("100 600", "formulaWeight")))
+            idList = pool.scan(lambda ccId, d: d.get("type") == ccsi.getValue("ATP", "type"))
+            self.assertIn("ATP", idList)
+            self.assertEqual(idList, ccsi.searchIndex(ccsi.getValue("ATP", "type"), "type"))
+        finally:
+            pool.close()
+        self.assertFalse(pool.isParallel())
+        self.assertEqual(pool.scan(("EXACT", "ccId", "HOH")), ["HOH"])
+        self.assertEqual(ccsi.searchIndexScan(("SUBSTRING", "name", "PHOSPHATE")), ccsi.searchIndexSubstring("PHOSPHATE", "name"))
+
+    def testAttributeValuePage(self):
+        """Test case -  paged and sorted result projection"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        idList = ccsi.searchIndexRange("0 100000", "formulaWeight")
+        cList = ["ccId", "formulaWeight"]
+        allRowL = ccsi.getAttributeValueList(idList, cList, cList)
+        total, rowL = ccsi.getAttributeValuePage(idList, cList, cList)
+        self.assertEqual((total, rowL), (len(idList), allRowL))
+        total, rowL = ccsi.getAttributeValuePage(idList, cList, cList, offset=2, limit=3)
+        self.assertEqual((total, rowL), (len(idList), allRowL[2:5]))
+        self.assertEqual(ccsi.getAttributeValuePage(idList, cList, cList, offset=len(idList), limit=3), (len(idList), []))
+        #
+        sortedRowL = sorted(allRowL, key=lambda d: float(d["formulaWeight"]), reverse=True)
+        total, rowL = ccsi.getAttributeValuePage(idList[::-1], cList, cList, offset=1, limit=4, sortKey="formulaWeight", reverse=True)
+        self.assertEqual([float(d["formulaWeight"]) for d in rowL], [float(d["formulaWeight"]) for d in sortedRowL[1:5]])
+        total, rowL = ccsi.getAttributeValuePage(idList, cList, cList, sortKey="formulaWeight")
+        self.assertEqual([float(d["formulaWeight"]) for d in rowL], [float(d["formulaWeight"]) for d in sortedRowL[::-1]])
+
+    def testSubcomponentSearch(self):
+        """Test case -  subcomponent containment and subset searches"""
+        ccIndx = {
+            "PRD1": {"subcomponentList": "ACE LEU PHQ"},
+            "PRD2": {"subcomponentList": "LEU ACE"},
+            "PRD3": {"subcomponentList": "?"},
+            "PRD4": {"subcomponentList": None},
+            "PRD5": {"subcomponentList": "LEU"},
+            "PRD6": {"subcomponentList": "GLY LEU LEU"},
+        }
+        sci = ChemCompSubcomponentIndex(ccIndx)
+        self.assertEqual(sci.searchContaining("LEU ace"), ["PRD1", "PRD2"])
+        self.assertEqual(sci.searchContaining(["LEU"]), ["PRD1", "PRD2", "PRD5", "PRD6"])
+        self.assertEqual(sci.searchContaining(["ACE", "GLY"]), [])
+        self.assertEqual(sci.searchContaining([]), [])
+        self.assertEqual(sci.searchSubset(["ACE", "LEU"]), ["PRD2", "PRD5"])
+        self.assertEqual(sci.searchSubset("ACE LEU PHQ GLY"), ["PRD1", "PRD2", "PRD5", "PRD6"])
+        self.assertEqual(sci.searchSubset("XYZ"), [])
+        self.assertTrue(sci.estimate("ACE LEU") >= 2 and sci.estimate("ACE LEU", containsAll=False) >= 2)
+        #
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        idList = [ccId for ccId in ccsi.searchIndexRange("0 100000", "formulaWeight") if ChemCompSubcomponentIndex.parseValue(ccsi.getValue(ccId, "subcomponentList"))]
+        for ccId in idList:
+            subIdL = ccsi.getValue(ccId, "subcomponentList").split()
+            self.assertIn(ccId, ccsi.searchSubcomponentContaining(subIdL))
+            self.assertIn(ccId, ccsi.searchSubcomponentSubset(subIdL))
+        self.assertEqual(ccsi.searchSubcomponentContaining("NOT-A-SUBCOMPONENT"), [])
+
+    def testInChIKeyPrefixSearch(self):
+        """Test case -  InChIKey prefix and block family searches"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
+        ccIndx = dIndx.readIndex(indexPath=self.__cc_index)
+        for prefix in ["", "C", "X", "XL", "ZKHQWZAMYRWXGA", "ZKHQWZAMYRWXGA-KQYNXXCUSA-N", "ZZ"]:
+            rL = sorted(ccId for ccId, d in ccIndx.items() if d["InChIKey"] and d["InChIKey"].startswith(prefix))
+            self.assertEqual(sorted(ccsi.searchIndexPrefix(prefix, "InChIKey")), rL)
+        self.assertEqual(ccsi.searchIndexMany(["XLYOFNOQVPJJNP", "ZZ"], "InChIKey", mode="PREFIX"), {"XLYOFNOQVPJJNP": ["HOH"], "ZZ": []})
+        self.assertEqual(ccsi.searchComposite([("PREFIX", "InChIKey", "X"), ("FORMULA_EXACT", None, "H2 O")]), ["HOH"])
+        #
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-UHFFFAOYSA-N", family="SKELETON"), ["ATP"])
+        self.assertEqual(ccsi.searchInChIKeyFamily("zkhqwzamyrwxga", family="SKELETON"), ["ATP"])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-UHFFFAOYSA-N", family="SKELETON_PROTONATION"), ["ATP"])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-UHFFFAOYSA-M", family="SKELETON_PROTONATION"), [])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-KQYNXXCUSA-M", family="CHARGE_STATE"), ["ATP"])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-UHFFFAOYSA-N", family="CHARGE_STATE"), [])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-KQYNXXCUSA-N", family="FULL"), ["ATP"])
+        self.assertEqual(ccsi.searchInChIKeyFamily("ZKHQWZAMYRWXGA-KQYNXXCUSA-M", family="FULL"), [])
+
+    def testMassSearch(self):
+        """Test case -  nearest mass and mass tolerance searches"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.assertAlmostEqual(ccsi.getMass("ATP"), 506.99575, places=4)
+        self.assertAlmostEqual(ccsi.getMass("HOH"), 18.01056, places=4)
+        self.assertEqual(ccsi.searchMassNearest(507.0, 1), ["ATP"])
+        self.assertEqual(ccsi.searchMassNearest(18.5, 2), ["HOH", "F"])
+        self.assertEqual(ccsi.searchMassNearest(380.5, 3), ["C31", "C43", "CG1"])
+        self.assertEqual(len(ccsi.searchMassNearest(300.0, 100)), 18)
+        self.assertEqual(ccsi.searchMassPpm(506.9960, 5.0), ["ATP"])
+        self.assertEqual(ccsi.searchMassPpm(506.9960, 0.1), [])
+        self.assertEqual(ccsi.searchMassNearest(507.2, 1, key="formulaWeight"), ["ATP"])
+        self.assertEqual(ccsi.searchComposite([("MASS_NEAREST", "monoisotopicMass", "380.5 3"), ("SUBSTRING", "InChIKey", "XQY")]), ["C43"])
+
+    def testIndexStats(self):
+        """Test case -  index column statistics and persisted statistics"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+        statsPath = getStatsPath(self.__cc_index)
+        if os.path.exists(statsPath):
+            os.remove(statsPath)
+        ChemCompIndexCache.clear()
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        sD = ccsi.stats()
+        self.assertEqual(sD["rows"], 18)
+        self.assertEqual(sD["generation"], ccsi.getGeneration())
+        cD = sD["columns"]
+        self.assertEqual(cD["ccId"]["distinct"], 18)
+        self.assertEqual(cD["formulaWeight"]["rows"], 18)
+        self.assertEqual(sum(cD["formulaWeight"]["histogram"]["counts"]), 18)
+        self.assertNotIn("histogram", cD["name"])
+        self.assertEqual(sum(cD["smilesList"]["listLengths"].values()), cD["smilesList"]["rows"])
+        self.assertGreater(cD["smilesList"]["bytes"], cD["formulaWeight"]["bytes"])
+        nEst = ChemCompIndexStats.estimateRange(cD["formulaWeight"]["histogram"], 300.0, 400.0)
+        self.assertGreaterEqual(nEst, len(ccsi.searchIndexNumericRange(300.0, 400.0, "formulaWeight")) - 2)
+        #
+        ok = ChemCompIndexStats().write(sD, statsPath)
+        self.assertTrue(ok)
+        # Other test cases may advance the index file modification time
+        st = os.stat(self.__cc_index)
+        os.utime(statsPath, (st.st_atime, st.st_mtime + 1))
+        self.assertEqual(ChemCompIndexStats().read(self.__cc_index)["columns"], cD)
+        ChemCompIndexCache.clear()
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        pL = [("RANGE", "formulaWeight", "500 510"), ("EXACT", "InChIKey", ccsi.getValue("ATP", "InChIKey"))]
+        self.assertEqual(ccsi.searchComposite(pL), ["ATP"])
+        os.remove(statsPath)
+
+    def testIndexSearchGroups(self):
+        """Test case -  group components sharing index values"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        for ky in ["InChIKey14", "type", "smilesList"]:
+            rD = ccsi.searchIndexAll(ky)
+            for ccId, mL in rD.items():
+                self.assertIn(ccId, mL)
+                if not isinstance(ccsi.getValue(ccId, ky), list):
+                    self.assertEqual(mL, ccsi.searchIndex(ccsi.getValue(ccId, ky), ky))
+            gD = ccsi.searchIndexGroups(ky, minSize=2)
+            logger.info("Key %r groups %r", ky, len(gD))
+            for v, gL in gD.items():
+                self.assertTrue(len(gL) >= 2)
+                self.assertEqual(gL, ccsi.searchIndex(v, ky))
+            self.assertEqual(set(ccsi.searchIndexAll(ky, minSize=2)), set(ccId for ccId, mL in rD.items() if len(mL) > 1))
+
+    def testIndexColumnStore(self):
+        """Test case -  write the index column store and read it back through the index cache"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh).readIndex(indexPath=self.__cc_index)
+        testIndexPath = os.path.join(os.path.dirname(self.__cc_index), "chemcomp-index-coltest.pic")
+        shutil.copyfile(self.__cc_index, testIndexPath)
+        colPath = getColumnStorePath(testIndexPath)
+        ok = ChemCompIndexColumnWriter(verbose=self.__verbose, log=self.__lfh).write(ccIndx, colPath)
+        self.assertTrue(ok)
+        #
+        store = ChemCompIndexCache.getEntry(testIndexPath, verbose=self.__verbose, log=self.__lfh).getIndex()
+        self.assertTrue(isinstance(store, ChemCompIndexColumnStore))
+        self.assertEqual(list(store), list(ccIndx))
+        for ccId, d in ccIndx.items():
+            self.assertEqual(dict(store[ccId]), d)
+        self.assertNotIn("NOT-A-CCID", store)
+        #
+        # A newer index pickle file takes precedence over the column store
+        st = os.stat(colPath)
+        os.utime(testIndexPath, (st.st_atime, st.st_mtime + 10))
+        self.assertFalse(isinstance(ChemCompIndexCache.getEntry(testIndexPath).getIndex(), ChemCompIndexColumnStore))
+
+    def testIndexColumnStoreColumns(self):
+        """Test case -  column store columns are stored and read independently"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh).readIndex(indexPath=self.__cc_index)
+        colPath = os.path.join(os.path.dirname(self.__cc_index), "chemcomp-index-coltest-columns.col")
+        ok = ChemCompIndexColumnWriter(verbose=self.__verbose, log=self.__lfh).write(ccIndx, colPath)
+        self.assertTrue(ok)
+
+        class RecordingColumnStore(ChemCompIndexColumnStore):
+            def __init__(self, storePath):
+                super(RecordingColumnStore, self).__init__(storePath)
+                self.keySet = set()
+
+            def getValue(self, iRow, ky):
+                self.keySet.add(ky)
+                return super(RecordingColumnStore, self).getValue(iRow, ky)
+
+        store = RecordingColumnStore(colPath)
+        fI = ChemCompFormulaIndex(store)
+        self.assertEqual(fI.searchExact({"H": 2, "O": 1}), ["HOH"])
+        self.assertEqual(store.keySet, set(["typeCounts"]))
+        self.assertEqual(store["ATP"]["formulaWeight"], ccIndx["ATP"]["formulaWeight"])
+        self.assertEqual(store["ATP"]["smilesList"], ccIndx["ATP"]["smilesList"])
+        colSize = sum(store.getColumnSize(ky) for ky in store.getColumnNames())
+        self.assertLess(store.getColumnSize("typeCounts") + store.getColumnSize("formulaWeight"), colSize / 4)
+        self.assertLess(colSize, os.path.getsize(colPath))
+        store.close()
+
+    @unittest.skipUnless(ChemCompIndexSharedMemory.isSupported(), "Requires multiprocessing.shared_memory")
+    def testIndexSharedMemory(self):
+        """Test case -  publish the index in shared memory and attach through the index cache"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh).readIndex(indexPath=self.__cc_index)
+        testIndexPath = os.path.join(os.path.dirname(self.__cc_index), "chemcomp-index-shmtest.pic")
+        shutil.copyfile(self.__cc_index, testIndexPath)
+        shm = ChemCompIndexSharedMemory(testIndexPath, verbose=self.__verbose, log=self.__lfh)
+        try:
+            g1 = shm.publish()
+            self.assertTrue(g1 is not None)
+            e1 = ChemCompIndexCache.getEntry(testIndexPath, useSharedMemory=True)
+            self.assertEqual(e1.getSignature()[:2], ("shm", g1))
+            self.assertEqual(dict(e1.getIndex()["ATP"]), ccIndx["ATP"])
+            self.assertTrue(ChemCompIndexCache.getEntry(testIndexPath, useSharedMemory=True) is e1)
+            #
+            g2 = shm.publish()
+            self.assertEqual(g2, g1 + 1)
+            e2 = ChemCompIndexCache.getEntry(testIndexPath, useSharedMemory=True)
+            self.assertTrue(e2.getGeneration() > e1.getGeneration())
+            self.assertEqual(len(e2.getIndex()), len(ccIndx))
+            # The superseded mapping remains readable
+            self.assertEqual(dict(e1.getIndex()["ATP"]), ccIndx["ATP"])
+        finally:
+            shm.unpublish()
+        self.assertTrue(ChemCompIndexCache.getEntry(testIndexPath, useSharedMemory=True).getSignature()[0] != "shm")
+
+    def testIndexCacheReload(self):
+        """Test case -  index is shared between instances and reloaded when the index file changes"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi1 = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        ccsi2 = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.assertEqual(ccsi1.getGeneration(), ccsi2.getGeneration())
+        #
+        st = os.stat(self.__cc_index)
+        os.utime(self.__cc_index, (st.st_atime, st.st_mtime + 10))
+        ccsi3 = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.assertGreater(ccsi3.getGeneration(), ccsi1.getGeneration())
+        self.assertEqual(ccsi3.getValue("ATP", "ccId"), ccsi1.getValue("ATP", "ccId"))
+        #
+        # An index file that reads empty is retried at most every _retryInterval seconds and
+        # the previous entry is retained for at most _maxStaleTime seconds
+        testIndexPath = os.path.join(os.path.dirname(self.__cc_index), "chemcomp-index-retrytest.pic")
+        shutil.copyfile(self.__cc_index, testIndexPath)
+        entry = ChemCompIndexCache.getEntry(testIndexPath)
+        self.assertTrue(entry.getIndex())
+        try:
+            with open(testIndexPath, "wb"):
+                pass
+            self.assertIs(ChemCompIndexCache.getEntry(testIndexPath), entry)
+            failedD = ChemCompIndexCache._ChemCompIndexCache__failedD
+            self.assertEqual(failedD[testIndexPath][0][0], testIndexPath)
+            signature, firstTime, retryTime = failedD[testIndexPath]
+            self.assertIs(ChemCompIndexCache.getEntry(testIndexPath), entry)
+            self.assertEqual(failedD[testIndexPath], (signature, firstTime, retryTime))
+            # Retry due - read again and retained
+            failedD[testIndexPath] = (signature, firstTime, 0.0)
+            self.assertIs(ChemCompIndexCache.getEntry(testIndexPath), entry)
+            self.assertGreater(failedD[testIndexPath][2], retryTime)
+            # Retained for too long - the index is used as read
+            failedD[testIndexPath] = (signature, firstTime - ChemCompIndexCache._maxStaleTime, 0.0)
+            tEntry = ChemCompIndexCache.getEntry(testIndexPath)
+            self.assertGreater(tEntry.getGeneration(), entry.getGeneration())
+            self.assertFalse(tEntry.getIndex())
+            self.assertNotIn(testIndexPath, failedD)
+        finally:
+            os.remove(testIndexPath)
+        ChemCompIndexCache.clear()
+        self.assertEqual(ChemCompIndexCache._ChemCompIndexCache__sharedD, {})
+
     def testTautomerSearch(self):
         if not os.path.exists(self.__cc_index):
             self.testCreateIndex()
@@ -144,6 +510,71 @@ class ChemCompSearchIndexUtilsTests(unittest.TestCase):
         endTime = time.time()
         logger.info("Completed at %s (%.3f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
 
+    def testListValueSearch(self):
+        """Test case -  exact match search on list-valued index keys"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        for ccId in ["ATP", "HOH"]:
+            smiL = ccsi.getValue(ccId, "smilesList")
+            if smiL:
+                for smi in smiL:
+                    mL = ccsi.searchIndex(smi, "smilesList")
+                    self.assertIn(ccId, mL)
+                    self.assertEqual(len(mL), len(set(mL)))
+        self.assertEqual(ccsi.searchIndex("NOT-A-SMILES", "smilesList"), [])
+
+    def testSubstringSearch(self):
+        """Test case -  substring search on scalar and list-valued index keys"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        name = ccsi.getValue("ATP", "name")
+        for target in [name, name[2:9], name[:2]]:
+            mL = ccsi.searchIndexSubstring(target, "name")
+            logger.info("Substring %r result length %r", target, len(mL))
+            self.assertIn("ATP", mL)
+            self.assertEqual(len(mL), len(set(mL)))
+        smi = ccsi.getValue("ATP", "smilesList")[0]
+        self.assertIn("ATP", ccsi.searchIndexSubstring(smi[1:12], "smilesList"))
+        self.assertEqual(ccsi.searchIndexSubstring("NO-SUCH-NAME-FRAGMENT", "name"), [])
+
+    def testEditDistanceSearch(self):
+        """Test case -  approximate name search with each distance type and top-K selection"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        name = ccsi.getValue("ATP", "name")
+        target = name[:-1] + "X"
+        for distType in ["JARO", "JARO_WINKLER", "LEV"]:
+            mL = ccsi.searchEditDistance(target, "nameList", DIST_TYPE=distType)
+            logger.info("Similar %s %r result length %r", distType, target, len(mL))
+            self.assertEqual(mL[0], "ATP")
+            self.assertEqual(len(mL), len(set(mL)))
+            self.assertEqual(ccsi.searchEditDistance(target, "nameList", DIST_TYPE=distType, topK=1), ["ATP"])
+        self.assertEqual(ccsi.searchEditDistance(target, "nameList", DIST_TYPE="UNKNOWN"), [])
+
+    def testNameSimilarityPruning(self):
+        """Test case -  similarity search scores only names whose achievable similarity exceeds the cutoff"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccIndx = ChemCompIndexCache.getEntry(self.__cc_index).getIndex()
+        nsi = ChemCompNameSimilarityIndex(ccIndx, "nameList")
+        target = ccIndx["ATP"]["name"][:-1] + "X"
+        for method, scoreFunc in [("JARO", jellyfish.jaro_similarity), ("JARO_WINKLER", jellyfish.jaro_winkler_similarity)]:
+            tL = [(ccId, max([scoreFunc(target, v) for v in d.get("nameList") or [] if v] or [0.0])) for ccId, d in ccIndx.items()]
+            expL = [ccId for ccId, score in sorted(tL, key=lambda t: -t[1]) if score > 0.75]
+            with mock.patch("jellyfish.%s" % scoreFunc.__name__, wraps=scoreFunc) as scoreMock:
+                rL = nsi.search(target, method=method, cutOff=0.75)
+            logger.info("%s names %d scored %d", method, nsi.getNameCount(), scoreMock.call_count)
+            self.assertEqual([ccId for ccId, _ in rL], expL)
+            self.assertEqual(scoreMock.call_count, nsi.getCandidateCount(target, method=method, cutOff=0.75))
+            self.assertLess(scoreMock.call_count, nsi.getNameCount() // 2)
+
     def testBoundedFormulaSearch1(self):
         """Test case -  bounded formula search of index file with element count dictionary input"""
         if not os.path.exists(self.__cc_index):
@@ -183,25 +614,61 @@ class ChemCompSearchIndexUtilsTests(unittest.TestCase):
         endTime = time.time()
         logger.info("Completed at %s (%.3f seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
 
+    def testExactFormulaSearch(self):
+        """Test case -  exact and subset formula search using the element counts of a reference component"""
+        if not os.path.exists(self.__cc_index):
+            self.testCreateIndex()
+
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        eD = dict(ccsi.getValue("ATP", "typeCounts"))
+        self.assertIn("ATP", ccsi.searchFormulaExact(elementCounts=eD, excludeH=False))
+        self.assertIn("ATP", ccsi.searchFormulaSubset(elementCounts=eD))
+        self.assertIn("ATP", ccsi.searchFormulaBounded(elementCounts=eD))
+        #
+        hD = dict(eD)
+        hD["H"] = hD.get("H", 0) + 3
+        self.assertNotIn("ATP", ccsi.searchFormulaExact(elementCounts=hD, excludeH=False))
+        self.assertIn("ATP", ccsi.searchFormulaExact(elementCounts=hD, excludeH=True))
+        self.assertEqual(ccsi.searchFormulaSubset(elementCounts={"C": 10, "XX": 1}), [])
+
 
 def suiteChemCompSearchIndexAll():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSearchAll"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSearchGroups"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSearchMany"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testCompositeSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexScan"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testAttributeValuePage"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testSubcomponentSearch"))
     return suiteSelect
 
 
 def suiteChemCompSearchIndexRange():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSearchRange"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSearchNumericRange"))
     return suiteSelect
 
 
 def suiteChemCompSearchIndex():
     suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexCacheReload"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testInChIKeyPrefixSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testMassSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexStats"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexColumnStore"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexColumnStoreColumns"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIndexSharedMemory"))
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testBoundedFormulaSearch1"))
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testBoundedFormulaSearch2"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testExactFormulaSearch"))
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testTautomerSearch"))
     suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testIsomerSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testListValueSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testSubstringSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testEditDistanceSearch"))
+    suiteSelect.addTest(ChemCompSearchIndexUtilsTests("testNameSimilarityPruning"))
     return suiteSelect
 
 
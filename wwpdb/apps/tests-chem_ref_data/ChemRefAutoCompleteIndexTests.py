@@ -0,0 +1,82 @@
+##
+#
+# File:    ChemRefAutoCompleteIndexTests.py
+# Date:    18-Oct-2026
+# Version: 0.001
+#
+# Updates:
+#
+##
+"""
+Test cases for the in-memory autocomplete index of the rdbms search columns.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import unittest
+import os
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+from wwpdb.apps.chem_ref_data.search.ChemRefAutoCompleteIndex import ChemRefAutoCompleteIndex, getAutoCompleteColumnList, writeAutoCompleteValues
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchDef import ChemRefSearchDef
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger()
+logger.setLevel(logging.ERROR)
+
+
+class ChemRefAutoCompleteIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.__siteId = getSiteId(defaultSiteId="WWPDB_DEPLOY_TEST_RU")
+
+    def tearDown(self):
+        pass
+
+    def testAutoCompleteIndex(self):
+        """Test case -  in-memory prefix and infix autocomplete and reload of the autocomplete values"""
+        colList = getAutoCompleteColumnList(ChemRefSearchDef._searchTypeDict, "CC")
+        self.assertIn("chem_comp.name", colList)
+        self.assertEqual(len(colList), len(set(colList)))
+        self.assertNotIn("da_internal_combine.chem_comp.id", colList)
+        #
+        valueD = {"chem_comp.name": ["ADENOSINE-5'-TRIPHOSPHATE", "adenosine", "ADENOSINE", "GUANOSINE-5'-TRIPHOSPHATE", "WATER", None]}
+        acIndex = ChemRefAutoCompleteIndex(valueD)
+        self.assertEqual(acIndex.search("chem_comp.name", "adeno"), ["adenosine", "ADENOSINE-5'-TRIPHOSPHATE"])
+        self.assertEqual(acIndex.search("chem_comp.name", "triphos", compareType="LIKE"), ["ADENOSINE-5'-TRIPHOSPHATE", "GUANOSINE-5'-TRIPHOSPHATE"])
+        self.assertEqual(acIndex.search("chem_comp.name", "OSINE", compareType="LIKE", maxResults=2), ["adenosine", "ADENOSINE-5'-TRIPHOSPHATE"])
+        self.assertEqual(acIndex.search("chem_comp.name", "triphos"), [])
+        self.assertEqual(acIndex.search("chem_comp.formula", "C"), [])
+        #
+        if not os.path.exists(ConfigInfoAppCc(self.__siteId).get_site_cc_dict_path()):
+            os.makedirs(ConfigInfoAppCc(self.__siteId).get_site_cc_dict_path())
+        self.assertTrue(writeAutoCompleteValues(self.__siteId, "TEST", valueD))
+        acIndex = ChemRefAutoCompleteIndex.getIndex(self.__siteId, "TEST")
+        self.assertIs(ChemRefAutoCompleteIndex.getIndex(self.__siteId, "TEST"), acIndex)
+        self.assertTrue(acIndex.hasColumn("chem_comp.name"))
+        writeAutoCompleteValues(self.__siteId, "TEST", {"chem_comp.name": ["WATER", "HEAVY WATER"]})
+        self.assertEqual(ChemRefAutoCompleteIndex.getIndex(self.__siteId, "TEST").search("chem_comp.name", "water", compareType="LIKE"), ["HEAVY WATER", "WATER"])
+        self.assertIsNone(ChemRefAutoCompleteIndex.getIndex(self.__siteId, "MISSING"))
+
+
+def suiteAutoCompleteIndex():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemRefAutoCompleteIndexTests("testAutoCompleteIndex"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteAutoCompleteIndex()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -6,6 +6,7 @@
 # Version: 0.001
 #
 # Updates:
+#   18-Oct-2026  add incremental index update test
 ##
 """
 A collection of tests for the ChemRefDataMiscUtils and related classes.   Requires access to
@@ -32,7 +33,17 @@ else:
 
 from wwpdb.utils.session.WebRequest import InputRequest
 from wwpdb.utils.config.ConfigInfo import ConfigInfo, getSiteId
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+from wwpdb.utils.cc_dict_util.persist.PdbxChemCompDictIndex import PdbxChemCompDictIndex
 from wwpdb.apps.chem_ref_data.utils.ChemRefDataMiscUtils import ChemRefDataMiscUtils
+from wwpdb.apps.chem_ref_data.search.ChemCompSearchIndexUtils import ChemCompSearchIndexUtils
+
+try:
+    import dbm.gnu  # noqa: F401 pylint: disable=unused-import
+
+    haveGdbm = True
+except ImportError:
+    haveGdbm = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
@@ -59,6 +70,7 @@ class ChemRefDataMiscUtilsTests(unittest.TestCase):
         self.__reqObj.setValue("TopPath", self.__topPath)
         self.__reqObj.setDefaultReturnFormat(return_format="html")
         #
+        self.__ccIndexPath = ConfigInfoAppCc(self.__siteId).get_cc_index()
 
     def tearDown(self):
         pass
@@ -99,6 +111,32 @@ class ChemRefDataMiscUtilsTests(unittest.TestCase):
             logger.exception("In testUpdateChemRefDataFiles")
             self.fail()
 
+    @unittest.skipUnless(haveGdbm, "Persistent store requires dbm.gnu")
+    def testIncrementalIndexUpdate(self):
+        """Test case -  incremental index update for changed, removed and added components"""
+        logger.info("Starting")
+        mu = ChemRefDataMiscUtils(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not os.path.exists(self.__ccIndexPath):
+            self.assertTrue(mu.updateChemCompSupportFiles(skipIndex=True))
+            self.assertTrue(mu.updateChemCompPySupportFiles())
+        #
+        dIndx = PdbxChemCompDictIndex(verbose=self.__verbose, log=self.__lfh)
+        ccIndx = dIndx.readIndex(indexPath=self.__ccIndexPath)
+        ok = mu.updateChemCompPySupportFilesIncremental(changedIdList=["ATP"], removedIdList=["HOH"])
+        self.assertTrue(ok)
+        tIndx = dIndx.readIndex(indexPath=self.__ccIndexPath)
+        self.assertNotIn("HOH", tIndx)
+        self.assertEqual(tIndx["ATP"], ccIndx["ATP"])
+        self.assertEqual(len(tIndx), len(ccIndx) - 1)
+        ccsi = ChemCompSearchIndexUtils(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        self.assertIsNone(ccsi.getValue("HOH", "ccId"))
+        #
+        ok = mu.updateChemCompPySupportFilesIncremental(addedIdList=["HOH"])
+        self.assertTrue(ok)
+        tIndx = dIndx.readIndex(indexPath=self.__ccIndexPath)
+        self.assertEqual(tIndx["HOH"], ccIndx["HOH"])
+        self.assertEqual(len(tIndx), len(ccIndx))
+
 
 def suitePathList():
     suiteSelect = unittest.TestSuite()
@@ -113,6 +151,12 @@ def suiteUpdateReferenceFiles():
     return suiteSelect
 
 
+def suiteIncrementalUpdate():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemRefDataMiscUtilsTests("testIncrementalIndexUpdate"))
+    return suiteSelect
+
+
 if __name__ == "__main__":
     #
     if True:  # pylint: disable=using-constant-test
@@ -121,3 +165,6 @@ if __name__ == "__main__":
 
         mySuite = suiteUpdateReferenceFiles()
         unittest.TextTestRunner(verbosity=2).run(mySuite)
+
+        mySuite = suiteIncrementalUpdate()
+        unittest.TextTestRunner(verbosity=2).run(mySuite)
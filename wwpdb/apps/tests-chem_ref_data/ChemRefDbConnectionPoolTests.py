@@ -0,0 +1,161 @@
+##
+#
+# File:    ChemRefDbConnectionPoolTests.py
+# Date:    18-Oct-2026
+# Version: 0.001
+#
+# Updates:
+#  18-Oct-2026     add checked out connection limit tests
+##
+"""
+Test cases for the process-wide database connection pool using stand-in connections.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import unittest
+import threading
+import time
+import os
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.chem_ref_data.search.ChemRefDbConnectionPool import ChemRefDbConnectionPool
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger()
+logger.setLevel(logging.ERROR)
+
+
+class ChemRefDbConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    class TestConnection(object):
+        def __init__(self):
+            self.alive = True
+            self.closed = False
+
+        def ping(self):
+            if not self.alive:
+                raise RuntimeError("gone away")
+
+        def rollback(self):
+            self.ping()
+
+        def close(self):
+            self.closed = True
+
+    def testDbConnectionPool(self):
+        """Test case -  connection pool reuse, maximum size, health checks and idle eviction"""
+        TestConnection = self.TestConnection
+        pool = ChemRefDbConnectionPool(maxSize=1, idleTimeout=600, checkInterval=0, waitTimeout=0.05)
+        c1 = pool.borrow("CC", TestConnection)
+        # The single connection to CC is checked out
+        self.assertIsNone(pool.borrow("CC", TestConnection))
+        self.assertTrue(pool.giveBack("CC", c1))
+        # Pool is full - an extra connection is closed
+        c2 = TestConnection()
+        self.assertFalse(pool.giveBack("CC", c2))
+        self.assertTrue(c2.closed)
+        self.assertIs(pool.borrow("CC", TestConnection), c1)
+        self.assertIsNot(pool.borrow("PRD", TestConnection), c1)
+        # Stale connections are discarded on borrow
+        pool.giveBack("CC", c1)
+        c1.alive = False
+        c3 = pool.borrow("CC", TestConnection)
+        self.assertIsNot(c3, c1)
+        self.assertTrue(c1.closed)
+        self.assertFalse(pool.giveBack("CC", c3, healthy=False))
+        self.assertIsNone(pool.borrow("CC", lambda: None))
+        self.assertEqual(pool.getStats()["checkedOut"], {"CC": 0, "PRD": 1})
+        #
+        pool = ChemRefDbConnectionPool(maxSize=2, idleTimeout=0.05)
+        c1 = pool.borrow("CC", TestConnection)
+        pool.giveBack("CC", c1)
+        self.assertEqual(pool.getStats()["idle"]["CC"], 1)
+        time.sleep(0.1)
+        self.assertEqual(pool.evictIdle(), 1)
+        self.assertTrue(c1.closed)
+        self.assertFalse(ChemRefDbConnectionPool(maxSize=0).giveBack("CC", TestConnection()))
+        self.assertIs(ChemRefDbConnectionPool.getPool("test"), ChemRefDbConnectionPool.getPool("test"))
+
+    def __borrowConcurrently(self, pool, numBorrowers):
+        """Start numBorrowers threads each borrowing a connection to CC - return the threads and the shared result list."""
+        rL = []
+        rLock = threading.Lock()
+
+        def borrowOne():
+            dbCon = pool.borrow("CC", self.TestConnection)
+            with rLock:
+                rL.append(dbCon)
+
+        tL = [threading.Thread(target=borrowOne) for _ in range(numBorrowers)]
+        for thr in tL:
+            thr.start()
+        return tL, rL
+
+    def testDbConnectionPoolLimit(self):
+        """Test case -  at most maxSize connections are checked out at once - an extra borrower waits or fails"""
+        maxSize = 3
+        # The extra borrower waits until a connection is returned and then reuses it
+        pool = ChemRefDbConnectionPool(maxSize=maxSize, waitTimeout=10)
+        tL, rL = self.__borrowConcurrently(pool, maxSize + 1)
+        tEnd = time.time() + 5
+        while len(rL) < maxSize and time.time() < tEnd:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.assertEqual(len(rL), maxSize)
+        self.assertEqual(pool.getStats()["checkedOut"], {"CC": maxSize})
+        self.assertEqual(sum(1 for thr in tL if thr.is_alive()), 1)
+        returned = rL[0]
+        self.assertTrue(pool.giveBack("CC", returned))
+        for thr in tL:
+            thr.join(5)
+        self.assertEqual(len(rL), maxSize + 1)
+        self.assertIs(rL[-1], returned)
+        self.assertEqual(pool.getStats()["opened"], maxSize)
+        self.assertEqual(pool.getStats()["checkedOut"], {"CC": maxSize})
+        for dbCon in rL[1:]:
+            pool.giveBack("CC", dbCon)
+        self.assertEqual(pool.getStats()["checkedOut"], {"CC": 0})
+        #
+        # The extra borrower fails after the wait timeout
+        pool = ChemRefDbConnectionPool(maxSize=maxSize, waitTimeout=0.2)
+        tL, rL = self.__borrowConcurrently(pool, maxSize + 1)
+        for thr in tL:
+            thr.join(5)
+        self.assertEqual(len(rL), maxSize + 1)
+        self.assertEqual(sum(1 for dbCon in rL if dbCon is None), 1)
+        self.assertEqual(pool.getStats()["checkedOut"], {"CC": maxSize})
+        self.assertEqual(pool.getStats()["opened"], maxSize)
+        #
+        # Pooling disabled - no limit
+        pool = ChemRefDbConnectionPool(maxSize=0, waitTimeout=0.05)
+        self.assertNotIn(None, [pool.borrow("CC", self.TestConnection) for _ in range(maxSize + 1)])
+        self.assertEqual(pool.getStats()["checkedOut"], {})
+
+
+def suiteDbConnectionPool():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemRefDbConnectionPoolTests("testDbConnectionPool"))
+    suiteSelect.addTest(ChemRefDbConnectionPoolTests("testDbConnectionPoolLimit"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteDbConnectionPool()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,89 @@
+##
+#
+# File:    ChemRefSearchResultCacheTests.py
+# Date:    18-Oct-2026
+# Version: 0.001
+#
+# Updates:
+#
+##
+"""
+Test cases for the search result cache and the database load generation stamps.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import unittest
+import time
+import os
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCc
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchResultCache import ChemRefSearchResultCache, getDbLoadGeneration, touchDbLoadStamp
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger()
+logger.setLevel(logging.ERROR)
+
+
+class ChemRefSearchResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__siteId = getSiteId(defaultSiteId="WWPDB_DEPLOY_TEST_RU")
+
+    def tearDown(self):
+        pass
+
+    def testSearchResultCache(self):
+        """Test case -  search result cache LRU eviction, expiry and load generation keys"""
+        cache = ChemRefSearchResultCache(maxSize=2, ttl=600)
+        cache.set(("EXACT", "ATP", 1), ["ATP"])
+        cache.set(("EXACT", "GTP", 1), ["GTP"])
+        self.assertEqual(cache.get(("EXACT", "ATP", 1)), ["ATP"])
+        cache.set(("EXACT", "HOH", 1), ["HOH"])
+        # Least recently used entry is evicted
+        self.assertIsNone(cache.get(("EXACT", "GTP", 1)))
+        self.assertEqual(cache.get(("EXACT", "ATP", 1)), ["ATP"])
+        self.assertIsNone(cache.get(("EXACT", "ATP", 2)))
+        self.assertEqual(cache.getStats()["size"], 2)
+        #
+        cache = ChemRefSearchResultCache(maxSize=2, ttl=0.05)
+        cache.set("ATP", ["ATP"])
+        self.assertEqual(cache.get("ATP"), ["ATP"])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("ATP"))
+        self.assertFalse(ChemRefSearchResultCache(maxSize=0).set("ATP", ["ATP"]))
+        #
+        self.assertIs(ChemRefSearchResultCache.getCache("test"), ChemRefSearchResultCache.getCache("test"))
+        if not os.path.exists(ConfigInfoAppCc(self.__siteId).get_site_cc_dict_path()):
+            os.makedirs(ConfigInfoAppCc(self.__siteId).get_site_cc_dict_path())
+        self.assertTrue(touchDbLoadStamp(self.__siteId, "TEST"))
+        gen = getDbLoadGeneration(self.__siteId, "TEST")
+        self.assertIsNotNone(gen)
+        time.sleep(0.01)
+        touchDbLoadStamp(self.__siteId, "TEST")
+        self.assertNotEqual(getDbLoadGeneration(self.__siteId, "TEST"), gen)
+        # Resources without a load stamp have no generation (their results are not cached)
+        self.assertIsNone(getDbLoadGeneration(self.__siteId, "MISSING"))
+
+
+def suiteSearchResultCache():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemRefSearchResultCacheTests("testSearchResultCache"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteSearchResultCache()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,361 @@
+##
+#
+# File:    ChemRefSearchTests.py
+# Date:    18-Oct-2026
+# Version: 0.001
+#
+# Updates:
+#
+##
+"""
+Test cases for the rdbms searches of ChemRefSearch run against an in-memory stand-in database connection.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "John Westbrook"
+__email__ = "jwest@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import unittest
+import os
+import re
+import logging
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.apps.chem_ref_data.search.ChemRefDbConnectionPool import ChemRefDbConnectionPool
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchResultCache import ChemRefSearchResultCache
+from wwpdb.apps.chem_ref_data.search.ChemRefSearchDepictBootstrap import ChemRefSearchDepictBootstrap
+
+try:
+    from wwpdb.apps.chem_ref_data.search.ChemRefSearch import ChemRefSearch
+
+    haveSearch = True
+except ImportError:
+    haveSearch = False
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger()
+logger.setLevel(logging.ERROR)
+
+
+class StubDatabase(object):
+    """Evaluates the single column statements generated for the chem_comp searches over a list of rows -
+
+    Comparisons ignore case and trailing spaces as in the default MySQL collations.  Executed statements
+    and their parameters are recorded in queryList.
+    """
+
+    def __init__(self, rowList):
+        self.rowList = rowList
+        self.queryList = []
+
+    def select(self, query, params):
+        mc = re.match(r"SELECT COUNT\(\*\) FROM \( (.*) \) AS crs_count$", query, re.S)
+        if mc:
+            return [(len(self.select(mc.group(1), params)),)]
+        limitOffset = None
+        if query.endswith(" LIMIT %s OFFSET %s"):
+            query, limitOffset, params = query[: -len(" LIMIT %s OFFSET %s")], params[-2:], params[:-2]
+        if " UNION ALL " in query:
+            rL = self.__selectUnion(query, params)
+        else:
+            selectList = re.match(r"SELECT DISTINCT (.+?) FROM", query).group(1).split(",")
+            col, op = re.search(r"\( (\S+) (LIKE|IN|=|<|>|BETWEEN) ", query).groups()
+            rL = [tuple(self.__getValue(row, sCol) for sCol in selectList) for row in self.rowList if self.__isMatch(row[col], op, params)]
+            mo = re.search(r" ORDER BY (\S+) (ASC|DESC)", query)
+            if mo:
+                ii = selectList.index(mo.group(1))
+                rL.sort(key=lambda tup: tup[ii], reverse=mo.group(2) == "DESC")
+        if limitOffset:
+            rL = rL[limitOffset[1] : limitOffset[1] + limitOffset[0]]
+        return rL
+
+    def __selectUnion(self, query, params):
+        """Concatenate the rows of the parenthesized members and apply the ORDER BY clause of column positions."""
+        unionString, _, orderString = query.partition(" ORDER BY ")
+        rL = []
+        for member in unionString.split(" UNION ALL "):
+            member = member.strip()[1:-1].strip()
+            nParams = member.count("%s")
+            rL.extend(self.select(member, params[:nParams]))
+            params = params[nParams:]
+        for pos, direction in reversed(re.findall(r"(\d+) (ASC|DESC)", orderString)):
+            rL.sort(key=lambda tup, ii=int(pos) - 1: tup[ii], reverse=direction == "DESC")
+        return rL
+
+    @staticmethod
+    def __getValue(row, sCol):
+        ml = re.match(r"(\d+) AS \S+$", sCol)
+        return int(ml.group(1)) if ml else row[sCol]
+
+    def __isMatch(self, value, op, params):
+        if op == "LIKE":
+            return self.__getKey(params[0].strip("%")) in self.__getKey(value)
+        if op in ["IN", "="]:
+            return self.__getKey(value) in [self.__getKey(p) for p in params]
+        if op == "<":
+            return float(value) < float(params[0])
+        if op == ">":
+            return float(value) > float(params[0])
+        return float(params[0]) <= float(value) <= float(params[1])
+
+    @staticmethod
+    def __getKey(value):
+        return str(value).rstrip().upper()
+
+
+class StubCursor(object):
+    def __init__(self, db):
+        self.__db = db
+        self.__rows = []
+
+    def execute(self, query, params=None):
+        self.__db.queryList.append((query, list(params or [])))
+        self.__rows = self.__db.select(query, list(params or []))
+
+    def fetchone(self):
+        return self.__rows.pop(0) if self.__rows else None
+
+    def fetchmany(self, size):
+        rows, self.__rows = self.__rows[:size], self.__rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class StubConnection(object):
+    def __init__(self, db):
+        self.__db = db
+
+    def cursor(self):
+        return StubCursor(self.__db)
+
+    def ping(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@unittest.skipUnless(haveSearch, "Search requires the database and OpenEye utilities")
+class ChemRefSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.__siteId = getSiteId(defaultSiteId="WWPDB_DEPLOY_TEST_RU")
+        rowList = []
+        for ccId, name, formulaWeight in [
+            ("ATP", "ADENOSINE-5'-TRIPHOSPHATE", "507.181"),
+            ("GTP", "GUANOSINE-5'-TRIPHOSPHATE", "523.180"),
+            ("ADP", "ADENOSINE-5'-DIPHOSPHATE", "427.201"),
+            ("HOH", "WATER", "18.015"),
+            ("DOD", "DEUTERATED WATER", "20.028"),
+        ]:
+            rowList.append(
+                {
+                    "chem_comp.id": ccId,
+                    "chem_comp.Component_id": ccId,
+                    "chem_comp.name": name,
+                    "chem_comp.type": "NON-POLYMER",
+                    "chem_comp.formula": "",
+                    "chem_comp.formula_weight": formulaWeight,
+                    "chem_comp.pdbx_synonyms": "",
+                    "chem_comp.pdbx_subcomponent_list": "",
+                    "chem_comp.pdbx_release_status": "REL",
+                }
+            )
+        self.__db = StubDatabase(rowList)
+        # Connections and results of other tests are not reused
+        ChemRefDbConnectionPool.closeAll()
+        ChemRefSearchResultCache.clearAll()
+
+    def tearDown(self):
+        ChemRefDbConnectionPool.closeAll()
+
+    def __getSearch(self):
+        crs = ChemRefSearch(siteId=self.__siteId)
+        crs.setResource = lambda resourceName=None: True
+        crs.openConnection = lambda: setattr(crs, "_dbCon", StubConnection(self.__db)) or True
+        crs.getConnection = lambda: crs._dbCon
+        return crs
+
+    def __search(self, crs, searchType, searchTarget, compareType, inputType="MULTI_VALUE_WS"):
+        crs.setSearch("CCD_ENTITY", searchType, searchTarget, "ID", inputType, compareType)
+        return crs.doSearch()["resultDictionary"][1]
+
+    def testRdbmsInListSearch(self):
+        """Test case -  multi-valued EQUAL searches folded into chunked IN-list queries"""
+        crs = self.__getSearch()
+        crs._ChemRefSearchBase__maxInListSize = 2
+        rD = self.__search(crs, "CCD_CC_ID", "atp HOH xxx ATP gtp adp", "EQUAL")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("atp", "ATP"), ("HOH", "HOH"), ("ATP", "ATP"), ("gtp", "GTP"), ("adp", "ADP")])
+        self.assertEqual(rD["totalCount"], 5)
+        self.assertEqual(rD["displayTitle"], "Results for: ID <i>equal to</i> <span class='stdSearchTargetList'>atp,HOH,xxx,ATP,gtp,adp</span> &nbsp;&nbsp; (5)")
+        inList = [(query, params) for query, params in self.__db.queryList if " IN (" in query]
+        self.assertEqual(len(inList), 3)
+        self.assertTrue(all(len(params) == 2 for _, params in inList))
+        # Same rows as separate searches for each target
+        sL = []
+        for searchTarget in ["atp", "HOH", "xxx", "ATP", "gtp", "adp"]:
+            sL.extend(self.__search(crs, "CCD_CC_ID", searchTarget, "EQUAL")["resultlist"])
+        self.assertEqual(sL, rD["resultlist"])
+        #
+        # Repeated targets and a final chunk of a single target
+        self.__db.queryList = []
+        rD = self.__search(crs, "CCD_CC_ID", "ATP ATP", "EQUAL")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("ATP", "ATP"), ("ATP", "ATP")])
+        self.assertEqual([params for _, params in self.__db.queryList], [["ATP"]])
+        rD = self.__search(crs, "CCD_CC_ID", "HOH gtp dod", "EQUAL")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("HOH", "HOH"), ("gtp", "GTP"), ("dod", "DOD")])
+        self.assertEqual(rD["totalCount"], 3)
+
+    def testRdbmsStatements(self):
+        """Test case -  parameterized condition templates, parameters and the compiled statement cache"""
+        crs = self.__getSearch()
+        getTemplate = crs._ChemRefSearchBase__getConditionTemplate
+        getParams = crs._ChemRefSearchBase__getConditionParams
+        self.assertEqual(getTemplate(["chem_comp.name"], "LIKE", "AND"), " ( chem_comp.name LIKE %s ) ")
+        self.assertEqual(getTemplate(["chem_comp.id"], "EQUAL", "AND"), " ( chem_comp.id = %s ) ")
+        self.assertEqual(getTemplate(["chem_comp.id"], "EQUAL", "AND", numTargets=3), " ( chem_comp.id IN (%s,%s,%s) ) ")
+        self.assertEqual(getTemplate(["chem_comp.formula_weight"], "LT", "AND"), " ( chem_comp.formula_weight <  %s ) ")
+        self.assertEqual(getTemplate(["chem_comp.formula_weight"], "GT", "AND"), " ( chem_comp.formula_weight >  %s ) ")
+        self.assertEqual(getTemplate(["chem_comp.formula_weight"], "BETWEEN", "AND"), " ( chem_comp.formula_weight BETWEEN  %s AND %s ) ")
+        self.assertEqual(getTemplate(["chem_comp.name", "chem_comp.pdbx_synonyms"], "LIKE", "OR"), " (  ( chem_comp.name LIKE %s )  OR  ( chem_comp.pdbx_synonyms LIKE %s )  ) ")
+        #
+        self.assertEqual(getParams(["chem_comp.name"], ["adeno"], "LIKE"), ["%adeno%"])
+        self.assertEqual(getParams(["chem_comp.name", "chem_comp.pdbx_synonyms"], ["adeno"], "LIKE"), ["%adeno%", "%adeno%"])
+        self.assertEqual(getParams(["chem_comp.id"], ["ATP", "GTP"], "EQUAL"), ["ATP", "GTP"])
+        self.assertEqual(getParams(["chem_comp.formula_weight"], ["500"], "LT"), ["500"])
+        self.assertEqual(getParams(["chem_comp.formula_weight"], ["500"], "GT"), ["500"])
+        self.assertEqual(getParams(["chem_comp.formula_weight"], ["500 510"], "BETWEEN"), ["500", "510"])
+        self.assertIsNone(getParams(["chem_comp.formula_weight"], ["500"], "BETWEEN"))
+        # Malformed range targets return no rows without a query
+        rD = self.__search(crs, "CCD_FORMULA_WEIGHT", "500", "BETWEEN", inputType="SINGLE_VALUE")
+        self.assertEqual((rD["resultlist"], rD["totalCount"]), ([], 0))
+        self.assertEqual(self.__db.queryList, [])
+        rD = self.__search(crs, "CCD_FORMULA_WEIGHT", "500 510", "BETWEEN", inputType="SINGLE_VALUE")
+        self.assertEqual([row["ID"] for row in rD["resultlist"]], ["ATP"])
+        self.assertEqual(self.__db.queryList[-1][1], ["500", "510"])
+        #
+        getStatement = crs._ChemRefSearchBase__getStatement
+        queryString, dList, _ = getStatement("CCD_CC_ID", "EQUAL")
+        self.assertIn(" ( chem_comp.Component_id = %s ) ", queryString)
+        self.assertEqual(dList[0], "ID")
+        self.assertIs(getStatement("CCD_CC_ID", "EQUAL"), getStatement("CCD_CC_ID", "EQUAL"))
+        # Statements are compiled per target count and sort column
+        self.assertIn("IN (%s,%s)", getStatement("CCD_CC_ID", "EQUAL", numTargets=2)[0])
+        self.assertIn("IN (%s,%s,%s)", getStatement("CCD_CC_ID", "EQUAL", numTargets=3)[0])
+        self.assertNotIn("ORDER BY", queryString)
+        self.assertTrue(getStatement("CCD_CC_ID", "EQUAL", sortKey="Name")[0].endswith(" ORDER BY chem_comp.name ASC "))
+        self.assertTrue(getStatement("CCD_CC_ID", "EQUAL", sortKey="Name", reverse=True)[0].endswith(" ORDER BY chem_comp.name DESC "))
+        statementD = crs._ChemRefSearchBase__statementD
+        for numTargets, sortKey, reverse in [(1, None, False), (2, None, False), (3, None, False), (1, "Name", False), (1, "Name", True)]:
+            self.assertIn(("ChemRefSearch", "CCD_CC_ID", "EQUAL", numTargets, sortKey, reverse, False), statementD)
+
+    def testRdbmsPagedSearch(self):
+        """Test case -  database paged searches with a separate total count and paging of multi-target results"""
+        crs = self.__getSearch()
+        crs.setPage(offset=1, limit=2)
+        rD = self.__search(crs, "CCD_NAME", "osine", "LIKE", inputType="SINGLE_VALUE")
+        self.assertEqual([row["ID"] for row in rD["resultlist"]], ["ATP", "GTP"])
+        self.assertEqual((rD["totalCount"], rD["offset"]), (3, 1))
+        self.assertIn("(3)", rD["displayTitle"])
+        (countQuery, countParams), (pageQuery, pageParams) = self.__db.queryList
+        self.assertTrue(countQuery.startswith("SELECT COUNT(*) FROM ( "))
+        self.assertEqual(countParams, ["%osine%"])
+        # Searches without an ordering are paged on the first display column
+        self.assertTrue(pageQuery.endswith(" ORDER BY chem_comp.id ASC  LIMIT %s OFFSET %s"))
+        self.assertEqual(pageParams, ["%osine%", 2, 1])
+        #
+        self.__db.queryList = []
+        crs.setPage(offset=0, limit=2, sortKey="Name", reverse=True)
+        rD = self.__search(crs, "CCD_NAME", "osine", "LIKE", inputType="SINGLE_VALUE")
+        self.assertEqual([row["ID"] for row in rD["resultlist"]], ["GTP", "ATP"])
+        self.assertIn(" ORDER BY chem_comp.name DESC ", self.__db.queryList[-1][0])
+        # Sort keys other than display columns keep the default order
+        crs.setPage(offset=0, limit=2, sortKey="chem_comp.name; DROP TABLE chem_comp")
+        rD = self.__search(crs, "CCD_NAME", "osine", "LIKE", inputType="SINGLE_VALUE")
+        self.assertEqual([row["ID"] for row in rD["resultlist"]], ["ADP", "ATP"])
+        self.assertTrue(self.__db.queryList[-1][0].endswith(" ORDER BY chem_comp.id ASC  LIMIT %s OFFSET %s"))
+        # Pages past the end are not fetched
+        self.__db.queryList = []
+        crs.setPage(offset=10, limit=2)
+        rD = self.__search(crs, "CCD_NAME", "osine", "LIKE", inputType="SINGLE_VALUE")
+        self.assertEqual((rD["resultlist"], rD["totalCount"]), ([], 3))
+        self.assertEqual(len(self.__db.queryList), 1)
+        #
+        # Multi-target EQUAL results are paged after the fetch in target order or the order of sortKey
+        crs.setPage(offset=1, limit=1)
+        rD = self.__search(crs, "CCD_CC_ID", "HOH atp GTP", "EQUAL")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("atp", "ATP")])
+        self.assertEqual(rD["totalCount"], 3)
+        crs.setPage(offset=1, limit=2, sortKey="Name", reverse=True)
+        rD = self.__search(crs, "CCD_CC_ID", "HOH atp GTP", "EQUAL")
+        self.assertEqual([row["ID"] for row in rD["resultlist"]], ["GTP", "ATP"])
+        #
+        # Multi-target LIKE searches are counted, ordered and paged in the database
+        self.__db.queryList = []
+        crs.setPage(offset=1, limit=2)
+        rD = self.__search(crs, "CCD_NAME", "water adeno", "LIKE")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("water", "HOH"), ("adeno", "ADP")])
+        self.assertEqual(rD["totalCount"], 4)
+        (countQuery, countParams), (pageQuery, pageParams) = self.__db.queryList
+        self.assertTrue(countQuery.startswith("SELECT COUNT(*) FROM ( ( SELECT DISTINCT "))
+        self.assertIn(" UNION ALL ", countQuery)
+        self.assertEqual(countParams, ["%water%", "%adeno%"])
+        self.assertTrue(pageQuery.endswith(" ORDER BY 9 ASC, 1 ASC LIMIT %s OFFSET %s"))
+        self.assertEqual(pageParams, ["%water%", "%adeno%", 2, 1])
+        crs.setPage(offset=1, limit=2, sortKey="Name")
+        rD = self.__search(crs, "CCD_NAME", "water adeno", "LIKE")
+        self.assertEqual([(row["searchTarget"], row["ID"]) for row in rD["resultlist"]], [("adeno", "ATP"), ("water", "DOD")])
+        self.assertTrue(self.__db.queryList[-1][0].endswith(" ORDER BY 2 ASC, 9 ASC LIMIT %s OFFSET %s"))
+        self.__db.queryList = []
+        crs.setPage(offset=4, limit=2)
+        rD = self.__search(crs, "CCD_NAME", "water adeno", "LIKE")
+        self.assertEqual((rD["resultlist"], rD["totalCount"]), ([], 4))
+        self.assertEqual(len(self.__db.queryList), 1)
+        # Malformed range targets (here each bound of a whitespace separated range) are skipped
+        self.__db.queryList = []
+        crs.setPage(offset=0, limit=5)
+        rD = self.__search(crs, "CCD_FORMULA_WEIGHT", "500 510", "BETWEEN")
+        self.assertEqual((rD["resultlist"], rD["totalCount"]), ([], 0))
+        self.assertEqual(self.__db.queryList, [])
+
+    def testBsTablePage(self):
+        """Test case -  result page in the bootstrap table server side pagination format"""
+        crs = self.__getSearch()
+        crs.setPage(offset=2, limit=2)
+        crs.setSearch("CCD_ENTITY", "CCD_NAME", "a", "Name", "SINGLE_VALUE", "LIKE")
+        rD = crs.doSearch()
+        crsdp = ChemRefSearchDepictBootstrap(verbose=False)
+        pD = crsdp.doBsTablePage(rD, resultSetId=1)
+        self.assertEqual(sorted(pD.keys()), ["rows", "total"])
+        self.assertEqual(pD["total"], 5)
+        self.assertEqual([row["Name"] for row in pD["rows"]], ["DEUTERATED WATER", "GUANOSINE-5'-TRIPHOSPHATE"])
+        self.assertTrue(all(row["ID"].startswith('<a class="app-ref-report"') for row in pD["rows"]))
+        self.assertEqual(crsdp.doBsTablePage(rD, resultSetId=2), {"total": 0, "rows": []})
+        self.assertEqual(crsdp.doBsTablePage(None), {"total": 0, "rows": []})
+
+
+def suiteRdbmsSearch():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ChemRefSearchTests("testRdbmsInListSearch"))
+    suiteSelect.addTest(ChemRefSearchTests("testRdbmsStatements"))
+    suiteSelect.addTest(ChemRefSearchTests("testRdbmsPagedSearch"))
+    suiteSelect.addTest(ChemRefSearchTests("testBsTablePage"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteRdbmsSearch()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)